@@ -0,0 +1,94 @@
+"""Microbenchmark of the text and JSON log formatters.
+
+Formats the same records with the text format used for the log file and with
+`JsonFormatter`, which `LOG_FORMAT=json` selects for both outputs.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_logging
+"""
+
+import logging
+import sys
+import timeit
+from typing import Any
+
+from src.unmonitorr.jsonlog import JsonFormatter
+
+# matches `file_format_string` in `unmonitorr.log`
+TEXT_FORMAT = "%(asctime)s | %(module)s | %(levelname)s | trace=%(trace_id)s | %(message)s"
+
+
+def make_record(msg: str, args: tuple[Any, ...], **fields: Any) -> logging.LogRecord:  # noqa: ANN401
+    record = logging.LogRecord(
+        "unmonitorr.server", logging.INFO, "/app/unmonitorr/server.py", 1, msg, args, None
+    )
+    record.trace_id = "1af6a93782093a1a"
+    record.__dict__.update(fields)
+    return record
+
+
+def make_error_record() -> logging.LogRecord:
+    try:
+        raise ValueError("series not found")  # noqa: TRY301
+    except ValueError:
+        exc_info = sys.exc_info()
+    record = make_record("Failed to fetch series: %s", (874,), series_id=874)
+    record.exc_info = exc_info
+    return record
+
+
+def bench(fn: Any, number: int) -> float:  # noqa: ANN401
+    """Return the best time per call in microseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    cases: list[tuple[str, logging.LogRecord]] = [
+        ("plain message", make_record("Finished processing request.", ())),
+        (
+            "message with args",
+            make_record(
+                "Received '%s' event payload from %s",
+                ("Download", "Sonarr"),
+                instance_name="Sonarr",
+                series_id=874,
+            ),
+        ),
+        (
+            "arr response",
+            make_record(
+                "Response received: URL=%s, status=%s",
+                ("http://sonarr:8989/api/v3/series/874", 200),
+                instance_name="Sonarr",
+                series_id=874,
+                duration=0.001733,
+            ),
+        ),
+        ("exception", make_error_record()),
+    ]
+
+    text = logging.Formatter(TEXT_FORMAT)
+    json = JsonFormatter()
+
+    number = 20000
+    sys.stdout.write(f"{'record':<20} {'text (us)':>10} {'json (us)':>10} {'ratio':>7}\n")
+    for name, record in cases:
+        # formatting an exception caches its text on the record, so reset it per call
+        def run_text(record: logging.LogRecord = record) -> str:
+            record.exc_text = None
+            return text.format(record)
+
+        def run_json(record: logging.LogRecord = record) -> str:
+            record.exc_text = None
+            return json.format(record)
+
+        text_us = bench(run_text, number)
+        json_us = bench(run_json, number)
+        sys.stdout.write(
+            f"{name:<20} {text_us:>10.2f} {json_us:>10.2f} {json_us / text_us:>6.2f}x\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
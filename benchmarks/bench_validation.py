@@ -0,0 +1,162 @@
+"""Microbenchmark of webhook payload validation per payload type.
+
+Compares the previous strategy, decoding the body with `json.loads` and then trying
+`RadarrWebhookPayload` before `SonarrWebhookPayload`, with the route-aware validation of
+the raw body done by `WebhookHandler.validate_payload`.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_validation
+"""
+
+import json
+import logging
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from pydantic import ValidationError
+
+from src.unmonitorr.types_ import RadarrWebhookPayload, SonarrWebhookPayload
+
+PayloadT = RadarrWebhookPayload | SonarrWebhookPayload
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+def radarr_download(movie_id: int = 2936) -> dict[str, Any]:
+    return {
+        "movie": {
+            "id": movie_id,
+            "title": "Bill Burr: I'm Sorry You Feel That Way",
+            "year": 2014,
+            "releaseDate": "2014-12-05",
+            "folderPath": "/media/Comedy/Bill Burr - I'm Sorry You Feel That Way (2014)",
+            "tmdbId": 308571,
+            "imdbId": "tt3823690",
+            "overview": "Fresh, unflinching and devastatingly honest comedy special.",
+            "tags": [],
+        },
+        "remoteMovie": {
+            "tmdbId": 308571,
+            "imdbId": "tt3823690",
+            "title": "Bill Burr",
+            "year": 2014,
+        },
+        "movieFile": {
+            "id": 4532,
+            "relativePath": "Bill Burr I'm Sorry You Feel That Way (2014).mkv",
+            "path": "/media/Comedy/Bill Burr - I'm Sorry You Feel That Way (2014)/movie.mkv",
+            "quality": "WEBDL-1080p",
+            "qualityVersion": 1,
+            "size": 1311268683,
+        },
+        "isUpgrade": False,
+        "downloadClient": "qBittorrent",
+        "downloadId": "0123456789ABCDEF",
+        "eventType": "Download",
+        "instanceName": "Radarr",
+        "applicationUrl": "",
+    }
+
+
+def sonarr_download(episodes: int = 1, series_id: int = 874) -> dict[str, Any]:
+    return {
+        "series": {
+            "id": series_id,
+            "title": "Agatha All Along",
+            "path": "/media/TV/Agatha All Along",
+            "tvdbId": 424536,
+            "tvMazeId": 62120,
+            "tmdbId": 138501,
+            "imdbId": "tt15571732",
+            "type": "standard",
+            "year": 2024,
+            "tags": [],
+        },
+        "episodes": [
+            {
+                "id": 10000 + n,
+                "episodeNumber": n + 1,
+                "seasonNumber": 1,
+                "title": f"Episode {n + 1}",
+                "airDate": "2024-09-18",
+                "airDateUtc": "2024-09-19T01:00:00Z",
+                "seriesId": series_id,
+                "tvdbId": 20000 + n,
+            }
+            for n in range(episodes)
+        ],
+        "episodeFile": {
+            "id": 5000,
+            "relativePath": "Season 01/Agatha All Along - S01E01.mkv",
+            "path": "/media/TV/Agatha All Along/Season 01/Agatha All Along - S01E01.mkv",
+            "quality": "WEBDL-1080p",
+            "qualityVersion": 1,
+            "size": 1589302312,
+        },
+        "isUpgrade": False,
+        "downloadClient": "qBittorrent",
+        "downloadId": "FEDCBA9876543210",
+        "eventType": "Download",
+        "instanceName": "Sonarr",
+        "applicationUrl": "",
+    }
+
+
+def validate_before(body: bytes) -> PayloadT | None:
+    """The previous strategy: decode to a dict, then try each model in turn."""
+    payload = json.loads(body)
+    for model in (RadarrWebhookPayload, SonarrWebhookPayload):
+        try:
+            return model.model_validate(payload)
+        except ValidationError:
+            continue
+    return None
+
+
+def payload_validator() -> Callable[[bytes, type[PayloadT]], PayloadT | None]:
+    """Return `validate_payload` of a `WebhookHandler` built with the default config.
+
+    The server imports the package as `unmonitorr`, so `src` is put on the import path.
+    Its warning about misrouted payloads is silenced, so only validation is timed.
+    """
+    if str(SRC) not in sys.path:
+        sys.path.insert(0, str(SRC))
+    from unmonitorr.config import Config
+    from unmonitorr.server import WebhookHandler
+
+    logging.getLogger("unmonitorr.server").setLevel(logging.ERROR)
+    return WebhookHandler(Config()).validate_payload
+
+
+def bench(fn: Any, number: int) -> float:  # noqa: ANN401
+    """Return the best time per call in microseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    cases: list[tuple[str, bytes, type[PayloadT]]] = [
+        ("radarr download", json.dumps(radarr_download()).encode(), RadarrWebhookPayload),
+        ("sonarr episode", json.dumps(sonarr_download()).encode(), SonarrWebhookPayload),
+        ("sonarr season (10)", json.dumps(sonarr_download(10)).encode(), SonarrWebhookPayload),
+        ("sonarr season (24)", json.dumps(sonarr_download(24)).encode(), SonarrWebhookPayload),
+    ]
+
+    validate_payload = payload_validator()
+    number = 2000
+    sys.stdout.write(
+        f"{'payload':<20} {'bytes':>7} {'before (us)':>12} {'after (us)':>11} {'speedup':>8}\n"
+    )
+    for name, body, model in cases:
+        before = bench(lambda body=body: validate_before(body), number)
+        after = bench(lambda body=body, model=model: validate_payload(body, model), number)
+        sys.stdout.write(
+            f"{name:<20} {len(body):>7} {before:>12.2f} {after:>11.2f} {before / after:>7.2f}x\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
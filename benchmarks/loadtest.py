@@ -0,0 +1,365 @@
+"""Load test of the webhook server against in-process fake Radarr and Sonarr servers.
+
+The app built by `init_web_application` is pointed at local aiohttp stand-ins for the
+Radarr and Sonarr endpoints it uses, with configurable latency and error rates, and is
+sent bursts of realistic webhooks. Throughput, p50/p99 latency and the number of upstream
+calls made per webhook are reported per scenario.
+
+Scenarios:
+
+* ``season-pack``: one webhook per episode of a full season, for a single series, all at
+  once, as Sonarr sends when a season pack is imported.
+* ``library-import``: webhooks for many different movies and series, as sent when an
+  existing library is imported.
+* ``duplicates``: the same episode and movie webhooks sent repeatedly.
+
+Run from the repository root::
+
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --scenario season-pack --latency 0.05 --error-rate 0.01
+    python -m benchmarks.loadtest --set episode_batch_window=0.2 --set arr_cache_ttl=30
+
+Use ``--max-p99-ms`` and ``--max-calls-per-webhook`` to exit non-zero on a regression.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from benchmarks.bench_validation import radarr_download, sonarr_download
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+class FakeArr:
+    """An in-process stand-in for the Radarr and Sonarr v3 API.
+
+    Parameters
+    ----------
+    latency : float
+        Mean seconds to wait before answering each request.
+    error_rate : float
+        Fraction of requests answered with a 500 error.
+    seasons : int
+        Number of seasons in every series.
+    episodes : int
+        Number of episodes in every season.
+    """
+
+    def __init__(self, latency: float, error_rate: float, seasons: int, episodes: int) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seasons = seasons
+        self.episodes = episodes
+        self.calls: Counter[str] = Counter()
+
+    def series(self, series_id: int) -> dict[str, Any]:
+        statistics = {
+            "episodeCount": self.episodes,
+            "episodeFileCount": self.episodes,
+            "totalEpisodeCount": self.episodes,
+            "sizeOnDisk": 1589302312 * self.episodes,
+            "percentOfEpisodes": 100.0,
+        }
+        return {
+            "id": series_id,
+            "title": f"Series {series_id}",
+            "status": "ended",
+            "ended": True,
+            "year": 2024,
+            "path": f"/media/TV/Series {series_id}",
+            "monitored": True,
+            "monitorNewItems": "all",
+            "seasons": [
+                {"seasonNumber": n, "monitored": True, "statistics": statistics}
+                for n in range(1, self.seasons + 1)
+            ],
+            "statistics": {
+                "seasonCount": self.seasons,
+                "episodeCount": self.seasons * self.episodes,
+                "totalEpisodeCount": self.seasons * self.episodes,
+                "sizeOnDisk": statistics["sizeOnDisk"] * self.seasons,
+                "percentOfEpisodes": 100.0,
+            },
+        }
+
+    @staticmethod
+    def movie(movie_id: int) -> dict[str, Any]:
+        return {
+            "id": movie_id,
+            "title": f"Movie {movie_id}",
+            "status": "released",
+            "year": 2014,
+            "path": f"/media/Movies/Movie {movie_id}",
+            "sizeOnDisk": 1311268683,
+            "hasFile": True,
+            "monitored": True,
+        }
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.middleware])
+        app.add_routes(
+            [
+                web.get("/api/v3/movie/{id:\\d+}", self.get_movie),
+                web.put("/api/v3/movie/{id:\\d+}", self.echo),
+                web.delete("/api/v3/movie/{id:\\d+}", self.no_content),
+                web.put("/api/v3/movie/editor", self.echo),
+                web.delete("/api/v3/movie/editor", self.no_content),
+                web.get("/api/v3/series/{id:\\d+}", self.get_series),
+                web.put("/api/v3/series/{id:\\d+}", self.echo),
+                web.delete("/api/v3/series/{id:\\d+}", self.no_content),
+                web.put("/api/v3/series/editor", self.echo),
+                web.delete("/api/v3/series/editor", self.no_content),
+                web.put("/api/v3/episode/monitor", self.echo),
+                web.get("/api", self.ping),
+            ]
+        )
+        return app
+
+    @web.middleware
+    async def middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Any],
+    ) -> web.StreamResponse:
+        resource = request.match_info.route.resource
+        self.calls[f"{request.method} {resource.canonical if resource else request.path}"] += 1
+        if self.latency:
+            # exponential delays give the long tail real servers have
+            await asyncio.sleep(random.expovariate(1 / self.latency))
+        if self.error_rate and random.random() < self.error_rate:
+            return web.json_response({"message": "Injected failure"}, status=500)
+        return await handler(request)
+
+    async def get_movie(self, request: web.Request) -> web.Response:
+        return web.json_response(self.movie(int(request.match_info["id"])))
+
+    async def get_series(self, request: web.Request) -> web.Response:
+        return web.json_response(self.series(int(request.match_info["id"])))
+
+    async def echo(self, request: web.Request) -> web.Response:
+        return web.json_response(await request.json())
+
+    async def no_content(self, _: web.Request) -> web.Response:
+        return web.Response(status=200)
+
+    async def ping(self, _: web.Request) -> web.Response:
+        return web.json_response({"current": "v3"})
+
+
+def season_pack(size: int, fake: FakeArr) -> list[tuple[str, dict[str, Any]]]:
+    webhooks = []
+    for n in range(size):
+        payload = sonarr_download(1, series_id=1)
+        episode = payload["episodes"][0]
+        episode.update(id=10000 + n, episodeNumber=n % fake.episodes + 1)
+        episode["seasonNumber"] = n // fake.episodes + 1
+        webhooks.append(("/sonarr", payload))
+    return webhooks
+
+
+def library_import(size: int, _: FakeArr) -> list[tuple[str, dict[str, Any]]]:
+    webhooks = []
+    for n in range(size):
+        if n % 2:
+            webhooks.append(("/radarr", radarr_download(movie_id=1000 + n)))
+        else:
+            payload = sonarr_download(1, series_id=1000 + n)
+            payload["episodes"][0]["id"] = 50000 + n
+            webhooks.append(("/sonarr", payload))
+    return webhooks
+
+
+def duplicates(size: int, _: FakeArr) -> list[tuple[str, dict[str, Any]]]:
+    return [
+        ("/radarr", radarr_download()) if n % 2 else ("/sonarr", sonarr_download())
+        for n in range(size)
+    ]
+
+
+SCENARIOS: dict[str, Callable[[int, FakeArr], list[tuple[str, dict[str, Any]]]]] = {
+    "season-pack": season_pack,
+    "library-import": library_import,
+    "duplicates": duplicates,
+}
+
+
+async def wait_until_idle(session: ClientSession, base: str, timeout: float = 60.0) -> None:
+    """Wait until queued and batched webhooks have been handled."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        async with session.get(f"{base}/stats") as response:
+            stats = await response.json()
+        queue = stats.get("queue")
+        coalescer = stats.get("sonarr", {}).get("coalescer")
+        busy = queue and (
+            queue["depth"] or queue["processed"] + queue["failed"] < queue["enqueued"]
+        )
+        if not busy and not (coalescer and coalescer["pending"]):
+            return
+        await asyncio.sleep(0.01)
+
+
+async def run_scenario(
+    name: str,
+    args: argparse.Namespace,
+    overrides: dict[str, Any],
+) -> dict[str, Any]:
+    from unmonitorr import server
+    from unmonitorr.config import Config
+
+    fake = FakeArr(args.latency, args.error_rate, args.seasons, args.episodes)
+    arr = TestServer(fake.app())
+    await arr.start_server()
+
+    config = Config()
+    config.radarr_uri = config.sonarr_uri = str(arr.make_url("")).rstrip("/")
+    config.radarr_api_key = config.sonarr_api_key = "loadtest"
+    config.handle_series_ended_only = False
+    for key, value in overrides.items():
+        setattr(config, key, value)
+
+    app_server = TestServer(server.init_web_application(config))
+    await app_server.start_server()
+    base = str(app_server.make_url("")).rstrip("/")
+
+    webhooks = SCENARIOS[name](args.webhooks, fake)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+
+    async with ClientSession() as session:
+
+        async def send(path: str, payload: dict[str, Any]) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                async with session.post(f"{base}{path}", json=payload) as response:
+                    await response.read()
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send(path, payload) for path, payload in webhooks))
+        await wait_until_idle(session, base)
+        elapsed = time.perf_counter() - started
+
+    await app_server.close()
+    await arr.close()
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    upstream = sum(fake.calls.values())
+    return {
+        "scenario": name,
+        "webhooks": len(webhooks),
+        "statuses": dict(statuses),
+        "seconds": elapsed,
+        "throughput": len(webhooks) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "upstream_calls": upstream,
+        "calls_per_webhook": upstream / len(webhooks),
+        "calls": dict(fake.calls.most_common()),
+    }
+
+
+def parse_override(value: str) -> tuple[str, Any]:
+    key, _, raw = value.partition("=")
+    try:
+        return key, json.loads(raw)
+    except json.JSONDecodeError:
+        return key, raw
+
+
+def report(result: dict[str, Any]) -> None:
+    sys.stdout.write(
+        f"{result['scenario']:<15} {result['webhooks']:>8} {result['throughput']:>10.1f} "
+        f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['calls_per_webhook']:>10.2f}"
+        f"  {result['statuses']}\n"
+    )
+    for call, count in result["calls"].items():
+        sys.stdout.write(f"{'':<15} {count:>8}  {call}\n")
+
+
+def setup_environment() -> None:
+    """Run the app from a scratch directory, so logs and config stay out of the repo."""
+    os.environ.setdefault("LOG_LEVEL", "warn")
+    workdir = Path(tempfile.mkdtemp(prefix="unmonitorr-loadtest-"))
+    (workdir / "unmonitorr").mkdir()
+    (workdir / "unmonitorr" / "static").symlink_to(SRC / "unmonitorr" / "static")
+    os.chdir(workdir)
+    sys.path.insert(0, str(SRC))
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenario", choices=[*SCENARIOS, "all"], default="all")
+    parser.add_argument("--webhooks", type=int, default=200, help="webhooks per scenario")
+    parser.add_argument("--concurrency", type=int, default=50, help="requests in flight")
+    parser.add_argument("--latency", type=float, default=0.01, help="mean arr latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="arr 500 error rate")
+    parser.add_argument("--seasons", type=int, default=10, help="seasons per fake series")
+    parser.add_argument("--episodes", type=int, default=24, help="episodes per fake season")
+    parser.add_argument(
+        "--set",
+        type=parse_override,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="override a config.json setting, for example --set webhook_queue_enabled=true",
+    )
+    parser.add_argument("--max-p99-ms", type=float, help="fail if p99 latency exceeds this")
+    parser.add_argument(
+        "--max-calls-per-webhook", type=float, help="fail if upstream calls exceed this"
+    )
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args()
+
+    if args.json:
+        args.json = args.json.resolve()
+    setup_environment()
+
+    names = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    sys.stdout.write(
+        f"{'scenario':<15} {'webhooks':>8} {'webhook/s':>10} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'calls/hook':>10}  statuses\n"
+    )
+    results = []
+    for name in names:
+        result = await run_scenario(name, args, dict(args.set))
+        report(result)
+        results.append(result)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+    failed = False
+    for result in results:
+        if args.max_p99_ms is not None and result["p99_ms"] > args.max_p99_ms:
+            sys.stdout.write(
+                f"{result['scenario']}: p99 {result['p99_ms']:.2f}ms > {args.max_p99_ms}ms\n"
+            )
+            failed = True
+        calls = result["calls_per_webhook"]
+        if args.max_calls_per_webhook is not None and calls > args.max_calls_per_webhook:
+            sys.stdout.write(
+                f"{result['scenario']}: {calls:.2f} calls/webhook > {args.max_calls_per_webhook}\n"
+            )
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,161 @@
+"""Microbenchmarks of model validation, serialization and payload validation.
+
+Times `SonarrAPISeries` and `RadarrAPIMovie` validation and `model_dump(by_alias=True)`,
+as used for lookups and PUT bodies, across series sizes, and webhook payload validation
+as done by `WebhookHandler.validate_payload` across payload sizes. The API fixtures are
+the ones used by `tests/test_api_models.py`.
+
+Results can be saved as a JSON baseline, and later runs compared against it, failing when
+any benchmark is slower than the baseline by more than the threshold.
+
+Run from the repository root::
+
+    python -m benchmarks.microbench --save benchmarks/baseline.json
+    python -m benchmarks.microbench --compare benchmarks/baseline.json --threshold 0.2
+"""
+
+import argparse
+import copy
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pydantic
+
+from benchmarks.bench_validation import payload_validator, radarr_download, sonarr_download
+from src.unmonitorr.types_ import (
+    RadarrAPIMovie,
+    RadarrWebhookPayload,
+    SonarrAPISeries,
+    SonarrWebhookPayload,
+)
+from tests.test_api_models import TestAPIModels
+
+
+def api_fixtures() -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return the Radarr movie and Sonarr series API fixtures from the model tests."""
+    fixtures = TestAPIModels()
+    fixtures.setUp()
+    return fixtures.radarr_api_payload, fixtures.sonarr_api_payload
+
+
+def series_with_seasons(series: dict[str, Any], seasons: int) -> dict[str, Any]:
+    """Return a copy of the series fixture with `seasons` seasons."""
+    series = copy.deepcopy(series)
+    season = series["seasons"][0]
+    series["seasons"] = [{**copy.deepcopy(season), "seasonNumber": n + 1} for n in range(seasons)]
+    stats = series["statistics"]
+    stats["seasonCount"] = seasons
+    for key in ("episodeFileCount", "episodeCount", "totalEpisodeCount", "sizeOnDisk"):
+        stats[key] = season["statistics"][key] * seasons
+    return series
+
+
+def build_cases() -> dict[str, Callable[[], object]]:
+    movie, series = api_fixtures()
+    cases: dict[str, Callable[[], object]] = {}
+
+    cases["radarr movie validate"] = lambda: RadarrAPIMovie.model_validate(movie)
+    movie_model = RadarrAPIMovie.model_validate(movie)
+    cases["radarr movie dump"] = lambda: movie_model.model_dump(by_alias=True)
+
+    for seasons in (1, 10, 30):
+        data = series_with_seasons(series, seasons)
+        body = json.dumps(data).encode()
+        model = SonarrAPISeries.model_validate(data)
+        cases[f"sonarr series validate ({seasons} seasons)"] = (
+            lambda data=data: SonarrAPISeries.model_validate(data)
+        )
+        cases[f"sonarr series validate_json ({seasons} seasons)"] = (
+            lambda body=body: SonarrAPISeries.model_validate_json(body)
+        )
+        cases[f"sonarr series dump ({seasons} seasons)"] = lambda model=model: model.model_dump(
+            by_alias=True
+        )
+
+    validate_payload = payload_validator()
+    radarr_body = json.dumps(radarr_download()).encode()
+    cases["validate_payload radarr"] = lambda: validate_payload(radarr_body, RadarrWebhookPayload)
+    for episodes in (1, 10, 24):
+        body = json.dumps(sonarr_download(episodes)).encode()
+        cases[f"validate_payload sonarr ({episodes} episodes)"] = (
+            lambda body=body: validate_payload(body, SonarrWebhookPayload)
+        )
+    misrouted = json.dumps(sonarr_download()).encode()
+    cases["validate_payload misrouted"] = lambda: validate_payload(misrouted, RadarrWebhookPayload)
+    return cases
+
+
+def measure(fn: Callable[[], object], repeat: int = 7) -> float:
+    """Return the best time per call in microseconds."""
+    # size each run to at least 0.2s so fast and slow cases are equally stable
+    number, _ = timeit.Timer(fn).autorange()
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6
+
+
+def environment() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "pydantic": pydantic.VERSION,
+        "machine": platform.machine(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--save", type=Path, help="write the results to this baseline file")
+    parser.add_argument("--compare", type=Path, help="compare the results to this baseline file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown against the baseline as a fraction (default: 0.25)",
+    )
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this text")
+    args = parser.parse_args()
+
+    baseline: dict[str, float] = {}
+    if args.compare:
+        saved = json.loads(args.compare.read_text())
+        baseline = saved["results"]
+        if saved.get("environment") != environment():
+            sys.stdout.write(f"warning: baseline was recorded on {saved.get('environment')}\n")
+
+    results: dict[str, float] = {}
+    regressions: list[str] = []
+    sys.stdout.write(f"{'benchmark':<42} {'us/call':>10} {'baseline':>10} {'change':>8}\n")
+    for name, fn in build_cases().items():
+        if args.filter not in name:
+            continue
+        results[name] = elapsed = measure(fn)
+        line = f"{name:<42} {elapsed:>10.2f}"
+        if name in baseline:
+            change = elapsed / baseline[name] - 1
+            line += f" {baseline[name]:>10.2f} {change:>+7.1%}"
+            if change > args.threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        sys.stdout.write(line + "\n")
+
+    if args.save:
+        args.save.write_text(
+            json.dumps({"environment": environment(), "results": results}, indent=2) + "\n"
+        )
+        sys.stdout.write(f"Saved results to {args.save}\n")
+
+    if regressions:
+        sys.stdout.write(
+            f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}:\n"
+        )
+        for name in regressions:
+            sys.stdout.write(f"  {name}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
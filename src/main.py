@@ -44,6 +44,7 @@ async def main() -> None:
         logger.warning("Server shutdown started: %s", e.__class__.__name__)
     finally:
         logger.info("Cleaning up resources.")
+        # triggers the app's cleanup signal, which closes the pooled arr client sessions
         await runner.cleanup()
 
 
@@ -0,0 +1,109 @@
+"""Unmonitor or remove every movie and series already in Radarr and Sonarr.
+
+Applies the same rules as the webhooks to the whole library, for items imported before
+Unmonitorr was set up. Uses the saved configuration, including `remove_media`, so run it
+with --dry-run first to see what would change.
+
+Run from the ``src`` directory, or in the container::
+
+    python sweep.py --dry-run
+    python sweep.py --only series --batch-size 500
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from unmonitorr import log
+from unmonitorr.arrs import RadarrClient, SonarrClient
+from unmonitorr.config import Config
+from unmonitorr.server import create_arr_client
+from unmonitorr.sweep import LibrarySweep, SweepResult
+
+logger = log.get_logger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only report what would be unmonitored or removed"
+    )
+    parser.add_argument(
+        "--only", choices=("movies", "series"), help="sweep only one of the libraries"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=250,
+        help="items updated by each bulk request (default: 250)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="bulk requests in flight to each arr (default: 4)",
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    return parser.parse_args()
+
+
+def report(results: list[SweepResult], *, as_json: bool) -> None:
+    if as_json:
+        sys.stdout.write(json.dumps([result.to_dict() for result in results], indent=2) + "\n")
+        return
+
+    for result in results:
+        if result.dry_run:
+            for item in result.matched:
+                logger.info("Would %s %s: %s", result.action, result.library, item)
+            logger.info(
+                "Dry run: would %s %s of %s %s.",
+                result.action,
+                len(result.matched),
+                result.scanned,
+                result.library,
+            )
+            continue
+
+        logger.info(
+            "Swept %s %s in %.1fs: %s %s, %s failed.",
+            result.scanned,
+            result.library,
+            result.duration,
+            result.handled,
+            "removed" if result.action == "remove" else "unmonitored",
+            result.failed,
+        )
+
+
+async def main() -> int:
+    args = parse_args()
+    config = Config()
+
+    radarr = create_arr_client(RadarrClient, config.radarr_uri, config.radarr_api_key, config)
+    sonarr = create_arr_client(SonarrClient, config.sonarr_uri, config.sonarr_api_key, config)
+    sweep = LibrarySweep(
+        config,
+        radarr,
+        sonarr,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        dry_run=args.dry_run,
+    )
+
+    try:
+        results = await sweep.run(
+            movies=args.only in (None, "movies"),
+            series=args.only in (None, "series"),
+        )
+    finally:
+        await radarr.close()
+        await sonarr.close()
+
+    report(results, as_json=args.json)
+    return 1 if any(result.failed for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,3 +1,8 @@
 from .arrbase import *
+from .breaker import *
+from .cache import *
+from .limiter import *
 from .radarr import *
+from .retry import *
+from .singleflight import *
 from .sonarr import *
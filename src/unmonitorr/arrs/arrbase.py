@@ -1,8 +1,27 @@
-from typing import Any
+import asyncio
+import time
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Final
 
 import aiohttp
 
-from unmonitorr import log
+from unmonitorr import deadline, log, tracing
+from unmonitorr.jsonstream import JsonArrayParser
+from unmonitorr.metrics import (
+    ARR_REQUEST_DURATION,
+    ARR_REQUEST_ERRORS,
+    ARR_REQUEST_RETRIES,
+    ARR_REQUEST_TIMEOUTS,
+)
+
+from .breaker import CircuitBreaker, CircuitOpenError
+from .cache import MISSING, TTLCache
+from .limiter import ConcurrencyLimiter
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
 
 __all__ = (
     "BaseArrClient",
@@ -11,6 +30,12 @@ __all__ = (
 
 logger = log.get_logger(__name__)
 
+# bytes read from a streamed response at a time
+_STREAM_CHUNK_SIZE: Final = 64 * 1024
+
+# resources whose last change is remembered, the oldest being forgotten first
+_CHANGED_SIZE: Final = 1024
+
 
 class HTTPException(Exception):
     def __init__(self, response: aiohttp.ClientResponse, message: str | None = None) -> None:
@@ -30,15 +55,110 @@ class HTTPException(Exception):
 
 
 class BaseArrClient:
+    """Base client shared by Radarr and Sonarr.
+
+    Each client owns a single pooled :class:`aiohttp.ClientSession` that is reused for
+    every request made to its arr instance.
+
+    Parameters
+    ----------
+    uri : str
+        The base URI of the arr instance.
+    api_key : str
+        The API key for the arr instance.
+    pool_limit_per_host : int
+        Maximum number of simultaneous connections to the arr instance.
+    dns_cache_ttl : int
+        Seconds to cache resolved DNS entries for.
+    keepalive_timeout : float
+        Seconds an idle connection is kept open for reuse.
+    connect_timeout : float
+        Seconds to wait for a connection to the arr instance. No limit if 0.
+    read_timeout : float
+        Seconds to wait for each read of a response. No limit if 0.
+    total_timeout : float
+        Seconds a request may take in total, including waiting for a pooled
+        connection. No limit if 0.
+    cache : TTLCache | None
+        Cache for fetched resources. Caching is disabled if None.
+    limiter : ConcurrencyLimiter | None
+        Limits the requests in flight to the arr instance. Unlimited if None.
+    retry : RetryPolicy | None
+        Backoff for retrying failed idempotent requests. Requests are not retried if None.
+    breaker : CircuitBreaker | None
+        Fails requests fast while the arr instance is down. Disabled if None.
+    """
 
     __slots__ = (
+        "_changed",
+        "_closing",
+        "_connections_created",
+        "_connections_reused",
+        "_draining",
+        "_editor_probed",
+        "_in_flight",
+        "_session",
         "api_key",
+        "breaker",
+        "cache",
+        "dns_cache_ttl",
+        "editor_supported",
+        "keepalive_timeout",
+        "limiter",
+        "pool_limit_per_host",
+        "retry",
+        "singleflight",
+        "timeout",
         "uri",
     )
 
-    def __init__(self, uri: str, api_key: str) -> None:
+    def __init__(
+        self,
+        uri: str,
+        api_key: str,
+        *,
+        pool_limit_per_host: int = 10,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        total_timeout: float = 300.0,
+        cache: TTLCache | None = None,
+        limiter: ConcurrencyLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
         self.uri = uri
         self.api_key = api_key
+        self.pool_limit_per_host = pool_limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout or None,
+            sock_connect=connect_timeout or None,
+            sock_read=read_timeout or None,
+        )
+        self.cache = cache
+        self.limiter = limiter
+        self.retry = retry
+        self.breaker = breaker
+
+        # shares concurrent lookups of the same resource
+        self.singleflight = SingleFlight()
+        # when each resource was last changed outside the client, such as by an import
+        self._changed: OrderedDict[tuple[str, int], float] = OrderedDict()
+
+        # cleared if the arr instance is too old to have the bulk editor endpoints
+        self.editor_supported: bool = True
+        self._editor_probed: bool = False
+
+        self._session: aiohttp.ClientSession | None = None
+        # requests using each session, and replaced sessions waiting for theirs to finish
+        self._in_flight: Counter[aiohttp.ClientSession] = Counter()
+        self._draining: set[aiohttp.ClientSession] = set()
+        self._closing: set[asyncio.Task[None]] = set()
+        self._connections_created: int = 0
+        self._connections_reused: int = 0
 
         if self.disabled:
             logger.warning(
@@ -68,10 +188,220 @@ class BaseArrClient:
         """Sonarr and Radarr also use the same headers."""
         return {"X-API-Key": self.api_key, "Accept": "application/json"}
 
-    def update_client_config(self, uri: str, api_key: str) -> None:
+    async def update_client_config(self, uri: str, api_key: str) -> None:
+        """Update the client's URI and API key, rebuilding the session if either changed."""
+        changed = uri != self.uri or api_key != self.api_key
         self.uri = uri
         self.api_key = api_key
-        self.headers["X-API-Key"] = api_key
+
+        if changed:
+            if self.cache is not None:
+                self.cache.clear()
+            if self.breaker is not None:
+                self.breaker.reset()
+            self.editor_supported, self._editor_probed = True, False
+            # requests still using the old session finish before it is closed
+            self._retire_session()
+            if not self.disabled:
+                await self.start()
+
+    async def start(self) -> None:
+        """Open the pooled session if the client is configured."""
+        if self.disabled or self._session is not None:
+            return
+        self._session = self._create_session()
+        logger.debug("%s session opened.", self.__class__.__name__)
+
+    async def close(self) -> None:
+        """Close the pooled session, and any it replaced, and release their connections."""
+        sessions = [*self._draining]
+        self._draining.clear()
+        if self._session is not None:
+            sessions.append(self._session)
+            self._session = None
+
+        for session in sessions:
+            await session.close()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if sessions:
+            logger.debug("%s session closed.", self.__class__.__name__)
+
+    def _retire_session(self) -> None:
+        """Stop using the current session, closing it once its requests have finished."""
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        if self._in_flight[session]:
+            self._draining.add(session)
+        else:
+            self._close_later(session)
+
+    def _close_later(self, session: aiohttp.ClientSession) -> None:
+        task = asyncio.create_task(session.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+        logger.debug("Closing replaced %s session.", self.__class__.__name__)
+
+    @contextmanager
+    def _lease(self) -> Iterator[aiohttp.ClientSession]:
+        """Use the pooled session for one request, keeping it open until the request ends."""
+        session = self.session
+        self._in_flight[session] += 1
+        try:
+            yield session
+        finally:
+            self._in_flight[session] -= 1
+            if not self._in_flight[session]:
+                del self._in_flight[session]
+                if session in self._draining:
+                    self._draining.discard(session)
+                    self._close_later(session)
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self.pool_limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+
+        return aiohttp.ClientSession(
+            connector=connector, timeout=self.timeout, trace_configs=[trace_config]
+        )
+
+    async def _on_connection_created(
+        self,
+        _session: aiohttp.ClientSession,
+        _ctx: SimpleNamespace,
+        _params: Any,  # noqa: ANN401
+    ) -> None:
+        self._connections_created += 1
+
+    async def _on_connection_reused(
+        self,
+        _session: aiohttp.ClientSession,
+        _ctx: SimpleNamespace,
+        _params: Any,  # noqa: ANN401
+    ) -> None:
+        self._connections_reused += 1
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, opening it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Return connection pool statistics for this client."""
+        in_use = idle = 0
+        if self._session is not None and (connector := self._session.connector) is not None:
+            # aiohttp does not expose these counts publicly.
+            in_use = len(getattr(connector, "_acquired", ()))
+            idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+
+        total = self._connections_created + self._connections_reused
+        return {
+            "open": in_use + idle,
+            "in_use": in_use,
+            "idle": idle,
+            "created": self._connections_created,
+            "reused": self._connections_reused,
+            "reuse_ratio": self._connections_reused / total if total else 0.0,
+        }
+
+    def cache_get(self, resource: str, id: int) -> Any:  # noqa: ANN401
+        """Return the cached `resource` with `id`, or `MISSING` if it is not cached.
+
+        None is returned if the resource was recently not found.
+        """
+        if self.cache is None:
+            return MISSING
+        return self.cache.get((resource, id))
+
+    def cache_set(
+        self, resource: str, id: int, value: Any, *, fetched_at: float | None = None  # noqa: ANN401
+    ) -> None:
+        """Cache `value` as the `resource` with `id`. A value of None caches a not-found result.
+
+        A value fetched, by `time.monotonic`, at `fetched_at` is not cached if the resource
+        has changed since.
+        """
+        if self.cache is None:
+            return
+        changed_at = self.changed_at(resource, id)
+        if fetched_at is not None and changed_at is not None and fetched_at < changed_at:
+            return
+        self.cache.set((resource, id), value)
+
+    def cache_invalidate(self, resource: str, *ids: int) -> None:
+        """Remove the cached `resource` entries for `ids`."""
+        if self.cache is not None:
+            for id in ids:
+                self.cache.invalidate((resource, id))
+
+    def mark_changed(self, resource: str, *ids: int) -> None:
+        """Record that the `resource` entries for `ids` changed outside the client.
+
+        Their cached entries are removed, and lookups started before now are neither
+        joined by later lookups nor cached.
+        """
+        now = time.monotonic()
+        for id in ids:
+            self._changed[(resource, id)] = now
+            self._changed.move_to_end((resource, id))
+        while len(self._changed) > _CHANGED_SIZE:
+            self._changed.popitem(last=False)
+        self.cache_invalidate(resource, *ids)
+
+    def changed_at(self, resource: str, id: int) -> float | None:
+        """Return the `time.monotonic` time the `resource` with `id` last changed, if known."""
+        return self._changed.get((resource, id))
+
+    async def check_editor_unsupported(
+        self, error: HTTPException, method: str, url: str, json: dict[str, Any], ids: str
+    ) -> bool:
+        """Return True if a failed bulk editor request should fall back to single updates.
+
+        A 404 or 405 can also come from a stale ID or a proxy, so the first one is checked
+        by sending the same request with no IDs. The editor is only disabled if that is
+        refused too, and otherwise the failed request alone falls back.
+
+        Parameters
+        ----------
+        error : HTTPException
+            The error the editor request failed with.
+        method : str
+            The method of the editor request.
+        url : str
+            The URL of the editor endpoint.
+        json : dict[str, Any]
+            The body of the editor request.
+        ids : str
+            The key of the IDs in `json`.
+        """
+        if error.status not in (404, 405):
+            return False
+        if self._editor_probed:
+            return True
+
+        try:
+            await self.request(method, url, headers=self.headers, json={**json, ids: []})
+        except HTTPException as e:
+            if e.status not in (404, 405):
+                # the probe was inconclusive, so it is tried again on the next refusal
+                return True
+            logger.info(
+                "%s does not support the bulk editor endpoints -- Falling back to single updates.",
+                self.__class__.__name__,
+            )
+            self.editor_supported = False
+        self._editor_probed = True
+        return True
 
     async def request(
         self,
@@ -80,27 +410,282 @@ class BaseArrClient:
         headers: dict[str, str],
         json: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
+        *,
+        idempotent: bool | None = None,
+        circuit: bool = True,
+        limit: bool = True,
     ) -> dict[str, Any]:
+        """Send a request to the arr instance and return its decoded JSON body.
+
+        Idempotent requests, only GETs unless stated otherwise, are retried with backoff
+        after a connection error, timeout, rate limit or server error. While the circuit
+        breaker is open, requests fail fast with :class:`CircuitOpenError`.
+
+        Within a webhook deadline, requests are given no more than the time left, and
+        raise :class:`DeadlineExceeded` instead of starting once it has passed.
 
+        Parameters
+        ----------
+        idempotent : bool | None
+            Whether the request is safe to retry. Defaults to True for GET requests.
+        circuit : bool
+            Whether the request goes through, and counts toward, the circuit breaker.
+        limit : bool
+            Whether the request waits for, and counts toward, the concurrency limiter.
+        """
         logger.debug(
             "Performing %s request: URL=%s, headers=%s, json=%s, params=%s",
             method,
             url,
             headers,
-            json,
+            log.sampled(str, json),
             params,
         )
 
-        async with (
-            aiohttp.ClientSession() as session,
-            session.request(method, url, headers=headers, params=params, json=json) as response,
-        ):
-            logger.debug(
-                "Response received: URL=%s, status=%s",
-                response.url,
-                response.status,
-            )
+        client = type(self).__name__.removesuffix("Client").lower()
+        if idempotent is None:
+            idempotent = method == "GET"
+        retry = self.retry if idempotent else None
+        breaker = self.breaker if circuit else None
+
+        attempt = 0
+        while True:
+            self._admit(client, breaker, method, url)
+
             try:
-                return await response.json()
-            except aiohttp.ContentTypeError as e:
-                raise HTTPException(response, str(e)) from None
+                response = await self._send(client, method, url, headers, json, params, limit=limit)
+            except (HTTPException, aiohttp.ClientError, TimeoutError) as e:
+                attempt += 1
+                await self._backoff_or_raise(e, attempt, client, method, url, retry, breaker)
+            else:
+                self._record_outcome(breaker, failed=False)
+                return response
+
+    async def stream(
+        self,
+        url: str,
+        headers: dict[str, str],
+        params: dict[str, Any] | None = None,
+    ) -> AsyncIterator[Any]:
+        """Send a GET request for a JSON array and yield its elements as they arrive.
+
+        Only the element being read is held in memory instead of the whole response. The
+        request is retried and goes through the circuit breaker like :meth:`request`, but
+        is no longer retried once an element has been yielded.
+
+        Raises
+        ------
+        HTTPException
+            If the request failed or the response is not a JSON array.
+        """
+        logger.debug("Streaming GET request: URL=%s, headers=%s, params=%s", url, headers, params)
+
+        client = type(self).__name__.removesuffix("Client").lower()
+        attempt = 0
+        while True:
+            self._admit(client, self.breaker, "GET", url)
+
+            yielded = False
+            try:
+                async for element in self._send_streaming(client, url, headers, params):
+                    yielded = True
+                    yield element
+            except (HTTPException, aiohttp.ClientError, TimeoutError) as e:
+                attempt += 1
+                # a retry would yield the same elements again
+                retry = None if yielded else self.retry
+                await self._backoff_or_raise(e, attempt, client, "GET", url, retry, self.breaker)
+            else:
+                self._record_outcome(self.breaker, failed=False)
+                return
+
+    async def _backoff_or_raise(
+        self,
+        error: Exception,
+        attempt: int,
+        client: str,
+        method: str,
+        url: str,
+        retry: RetryPolicy | None,
+        breaker: CircuitBreaker | None,
+    ) -> None:
+        """Wait to retry a failed request, or raise `error` if it should not be retried."""
+        if isinstance(error, HTTPException):
+            status, retry_after = error.status, error.headers.get("Retry-After")
+        else:
+            status, retry_after = None, None
+
+        # the instance answered a refused request, so it only failed if it is unwell
+        failed = RetryPolicy.should_retry(status)
+        if self._record_outcome(breaker, failed=failed) and breaker is not None:
+            # the work is parked rather than dropped once the circuit opens
+            raise CircuitOpenError(client, breaker) from error
+
+        if retry is None or not failed or attempt > retry.retries:
+            raise error
+
+        delay = retry.backoff(attempt, retry_after)
+        if (left := deadline.remaining()) is not None and delay >= left:
+            raise error
+        retry.retried += 1
+        ARR_REQUEST_RETRIES.inc(client, method)
+        logger.info(
+            "Retrying %s request in %.2fs after %s (retry %s of %s): URL=%s",
+            method,
+            delay,
+            status or type(error).__name__,
+            attempt,
+            retry.retries,
+            url,
+        )
+        await asyncio.sleep(delay)
+
+    @staticmethod
+    def _admit(client: str, breaker: CircuitBreaker | None, method: str, url: str) -> None:
+        """Raise instead of sending a request once the deadline passed or the circuit opened."""
+        if deadline.expired():
+            msg = f"Deadline exceeded before {method} {url}"
+            raise deadline.DeadlineExceeded(msg)
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(client, breaker)
+
+    @staticmethod
+    def _record_outcome(breaker: CircuitBreaker | None, *, failed: bool) -> bool:
+        """Report a request's outcome to `breaker`, returning True if the circuit is open."""
+        if breaker is None:
+            return False
+        if failed:
+            return breaker.record_failure()
+        breaker.record_success()
+        return False
+
+    async def _send(
+        self,
+        client: str,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        json: dict[str, Any] | None,
+        params: dict[str, Any] | None,
+        *,
+        limit: bool = True,
+    ) -> dict[str, Any]:
+        if limit:
+            await self._throttle()
+        with (
+            self._lease() as session,
+            self._observe(client, method, limit=limit) as outcome,
+            tracing.span(f"{client} {method}", url=url) as span,
+        ):
+            async with session.request(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                json=json,
+                timeout=self._request_timeout(),
+            ) as response:
+                self._received(response, outcome, span)
+                return await self._read_response(response)
+
+    async def _send_streaming(
+        self,
+        client: str,
+        url: str,
+        headers: dict[str, str],
+        params: dict[str, Any] | None,
+    ) -> AsyncIterator[Any]:
+        await self._throttle()
+        with (
+            self._lease() as session,
+            self._observe(client, "GET") as outcome,
+            tracing.span(f"{client} GET", url=url) as span,
+        ):
+            async with session.get(
+                url, headers=headers, params=params, timeout=self._request_timeout()
+            ) as response:
+                self._received(response, outcome, span)
+                if not response.ok:
+                    raise HTTPException(response, await response.text())
+
+                parser = JsonArrayParser()
+                try:
+                    async for chunk in response.content.iter_chunked(_STREAM_CHUNK_SIZE):
+                        for element in parser.feed(chunk):
+                            yield element
+                    for element in parser.close():
+                        yield element
+                except ValueError as e:
+                    raise HTTPException(response, str(e)) from None
+
+    async def _throttle(self) -> None:
+        if self.limiter is not None:
+            with tracing.span("throttle"):
+                # waiting for a slot counts toward the deadline like the request itself
+                await asyncio.wait_for(self.limiter.acquire(), deadline.remaining())
+
+    @contextmanager
+    def _observe(
+        self, client: str, method: str, *, limit: bool = True
+    ) -> Iterator[SimpleNamespace]:
+        """Record the duration and outcome of a request, then release its limiter slot.
+
+        The slot is only released if `limit` is True, i.e. the request acquired one.
+        """
+        outcome = SimpleNamespace(status="error", started=time.perf_counter())
+        try:
+            yield outcome
+        except TimeoutError:
+            # includes aiohttp's connect and read timeouts, which are also client errors
+            outcome.status = "timeout"
+            ARR_REQUEST_TIMEOUTS.inc(client, method)
+            raise
+        except (HTTPException, aiohttp.ClientError):
+            ARR_REQUEST_ERRORS.inc(client, method, outcome.status)
+            raise
+        finally:
+            latency = time.perf_counter() - outcome.started
+            ARR_REQUEST_DURATION.observe(latency, client, method, outcome.status)
+            if limit and self.limiter is not None:
+                status = outcome.status
+                self.limiter.release(latency, int(status) if status.isdigit() else None)
+
+    @staticmethod
+    def _received(
+        response: aiohttp.ClientResponse,
+        outcome: SimpleNamespace,
+        span: tracing.Span | None,
+    ) -> None:
+        outcome.status = str(response.status)
+        if span is not None:
+            span.attributes["status"] = response.status
+        logger.debug(
+            "Response received: URL=%s, status=%s",
+            response.url,
+            response.status,
+            extra={"duration": round(time.perf_counter() - outcome.started, 6)},
+        )
+
+    def _request_timeout(self) -> aiohttp.ClientTimeout:
+        left = deadline.remaining()
+        if left is None:
+            return self.timeout
+        total = left if self.timeout.total is None else min(left, self.timeout.total)
+        return aiohttp.ClientTimeout(
+            total=total,
+            sock_connect=self.timeout.sock_connect,
+            sock_read=self.timeout.sock_read,
+        )
+
+    async def _read_response(self, response: aiohttp.ClientResponse) -> dict[str, Any]:
+        if not response.ok:
+            raise HTTPException(response, await response.text())
+
+        # DELETE and bulk editor requests can succeed without a response body
+        if response.status == 204 or response.content_length == 0:  # noqa: PLR2004
+            return {}
+
+        try:
+            return await response.json()
+        except aiohttp.ContentTypeError as e:
+            raise HTTPException(response, str(e)) from None
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from typing import Any, Final
+
+__all__ = (
+    "CircuitBreaker",
+    "CircuitOpenError",
+)
+
+
+CLOSED: Final[str] = "closed"
+OPEN: Final[str] = "open"
+HALF_OPEN: Final[str] = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while an arr instance's circuit is open."""
+
+    def __init__(self, client: str, breaker: "CircuitBreaker") -> None:
+        self.client = client
+        self.breaker = breaker
+        super().__init__(f"{client} is unavailable, retrying in {breaker.retry_in():.1f}s")
+
+
+class CircuitBreaker:
+    """Stops requests to an arr instance that keeps failing until it recovers.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests fail
+    fast. Once `reset_timeout` seconds have passed it is half-open, and a single probe
+    request is let through: its success closes the circuit, its failure opens it again.
+
+    Parameters
+    ----------
+    failure_threshold : int
+        Consecutive failed requests that open the circuit.
+    reset_timeout : float
+        Seconds the circuit stays open before a probe request is let through.
+    """
+
+    __slots__ = (
+        "_changed",
+        "_failures",
+        "_opened_at",
+        "_probe_started",
+        "failure_threshold",
+        "opened",
+        "rejected",
+        "reset_timeout",
+    )
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._failures: int = 0
+        self._opened_at: float | None = None
+        self._probe_started: float | None = None
+        self._changed = asyncio.Event()
+
+        self.opened: int = 0
+        self.rejected: int = 0
+
+    @property
+    def state(self) -> str:
+        """Return ``closed``, ``open`` or ``half_open``."""
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    def retry_in(self) -> float:
+        """Return the seconds left until a probe request is let through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent, claiming the probe while half-open."""
+        state = self.state
+        if state == CLOSED:
+            return True
+
+        now = time.monotonic()
+        # a probe that never reported back is given up on after another reset timeout
+        if state == HALF_OPEN and (
+            self._probe_started is None or now - self._probe_started >= self.reset_timeout
+        ):
+            self._probe_started = now
+            return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Record a request that reached a healthy instance, closing the circuit."""
+        self._failures = 0
+        if self._opened_at is not None:
+            self._opened_at = self._probe_started = None
+            self._notify()
+
+    def record_failure(self) -> bool:
+        """Record a failed request, opening the circuit at the threshold or after a probe.
+
+        Returns
+        -------
+        bool
+            True if the circuit is now open.
+        """
+        self._failures += 1
+        if self._opened_at is None and self._failures < self.failure_threshold:
+            return False
+
+        if self._opened_at is None:
+            self.opened += 1
+        self._opened_at = time.monotonic()
+        self._probe_started = None
+        self._notify()
+        return True
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures, as for a newly configured instance."""
+        self._failures = 0
+        self._opened_at = self._probe_started = None
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self) -> None:
+        """Wait until a request may be attempted again.
+
+        Returns once the circuit closes, or once it is half-open and no probe is running.
+        """
+        while (state := self.state) != CLOSED:
+            if state == HALF_OPEN and self._probe_started is None:
+                return
+
+            # a running probe, or the end of the open period, is waited for
+            timeout = self.retry_in() if state == OPEN else self.reset_timeout
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except TimeoutError:
+                if state == HALF_OPEN:
+                    return
+
+    def stats(self) -> dict[str, Any]:
+        """Return the circuit state, consecutive failures and rejected requests."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in": self.retry_in(),
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,116 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Final
+
+__all__ = (
+    "MISSING",
+    "TTLCache",
+)
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Final[Any] = _Missing()
+
+
+class TTLCache:
+    """A bounded least-recently-used cache whose entries expire after a time-to-live.
+
+    Negative entries record that a lookup found nothing, and expire after their own,
+    usually shorter, time-to-live.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries kept before the least recently used is evicted.
+    ttl : float
+        Seconds an entry is served for after it is stored.
+    negative_ttl : float
+        Seconds a negative entry is served for after it is stored.
+    """
+
+    __slots__ = (
+        "_entries",
+        "evictions",
+        "hits",
+        "maxsize",
+        "misses",
+        "negative_hits",
+        "negative_ttl",
+        "ttl",
+    )
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0, negative_ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+        self.hits: int = 0
+        self.negative_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:  # noqa: ANN401
+        """Return the cached value for `key`, or `MISSING` if absent or expired.
+
+        A negative entry is returned as None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        if value is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:  # noqa: ANN401
+        """Store `value` for `key`. Storing None records a negative entry."""
+        ttl = self.negative_ttl if value is None else self.ttl
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove `key` from the cache."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the cache size and hit and miss ratios."""
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            "miss_ratio": self.misses / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any
+
+__all__ = ("ConcurrencyLimiter",)
+
+
+TOO_MANY_REQUESTS = 429
+SERVER_ERROR = 500
+
+
+class ConcurrencyLimiter:
+    """Limits the number of requests in flight to an arr instance.
+
+    In adaptive mode the limit follows an additive-increase/multiplicative-decrease
+    scheme: it is halved when a request is slow, rate limited or fails with a server
+    error, and raised by one after a full limit's worth of healthy requests.
+
+    Parameters
+    ----------
+    limit : int
+        Maximum number of requests in flight.
+    adaptive : bool
+        Adjust the limit between `min_limit` and `limit` based on upstream health.
+    min_limit : int
+        The lowest limit adaptive mode backs off to.
+    latency_target : float
+        Seconds above which a request counts as a sign of overload in adaptive mode.
+    cooldown : float
+        Minimum seconds between two decreases, so one burst of failures only backs off
+        once.
+    """
+
+    __slots__ = (
+        "_last_decrease",
+        "_successes",
+        "_waiters",
+        "adaptive",
+        "cooldown",
+        "decreases",
+        "in_flight",
+        "increases",
+        "latency_target",
+        "limit",
+        "max_limit",
+        "min_limit",
+        "throttled",
+        "throttled_wait",
+    )
+
+    def __init__(
+        self,
+        limit: int,
+        *,
+        adaptive: bool = False,
+        min_limit: int = 1,
+        latency_target: float = 2.0,
+        cooldown: float = 1.0,
+    ) -> None:
+        self.max_limit = limit
+        self.limit = limit
+        self.adaptive = adaptive
+        self.min_limit = max(1, min(min_limit, limit))
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+
+        self.in_flight: int = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._successes: int = 0
+        self._last_decrease: float = 0.0
+
+        self.throttled: int = 0
+        self.throttled_wait: float = 0.0
+        self.increases: int = 0
+        self.decreases: int = 0
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was granted as the waiter was cancelled, so hand it on
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(future)
+            raise
+        finally:
+            self.throttled += 1
+            self.throttled_wait += time.monotonic() - started
+
+    def release(self, latency: float, status: int | None) -> None:
+        """Free a slot, and adjust the limit from the request's outcome in adaptive mode.
+
+        Parameters
+        ----------
+        latency : float
+            Seconds the request took.
+        status : int | None
+            The response status, or None if no response was received.
+        """
+        self.in_flight -= 1
+        if self.adaptive:
+            overloaded = (
+                status is None
+                or status == TOO_MANY_REQUESTS
+                or status >= SERVER_ERROR
+                or latency > self.latency_target
+            )
+            self._adjust(overloaded=overloaded)
+        self._wake()
+
+    def _adjust(self, *, overloaded: bool) -> None:
+        if overloaded:
+            self._successes = 0
+            now = time.monotonic()
+            if self.limit > self.min_limit and now - self._last_decrease >= self.cooldown:
+                self.limit = max(self.min_limit, self.limit // 2)
+                self._last_decrease = now
+                self.decreases += 1
+            return
+
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+            self.increases += 1
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the current limit, queued requests and time spent waiting for a slot."""
+        return {
+            "limit": self.limit,
+            "max_limit": self.max_limit,
+            "adaptive": self.adaptive,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "throttled": self.throttled,
+            "throttled_wait_seconds": self.throttled_wait,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
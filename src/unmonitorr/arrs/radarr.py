@@ -1,13 +1,24 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, Final
+
+from pydantic import ValidationError
+
 from unmonitorr import log
-from unmonitorr.types_ import RadarrAPIMovie
+from unmonitorr.types_ import RadarrAPIMovie, RadarrHistoryRecord
 
 from .arrbase import BaseArrClient, HTTPException
+from .cache import MISSING
 
 __all__ = ("RadarrClient",)
 
 logger = log.get_logger(__name__)
 
 
+# the downloadFolderImported event type in Radarr's history
+HISTORY_IMPORT_EVENT: Final[int] = 3
+
+
 class RadarrClient(BaseArrClient):
     """A client for interacting with Radarr's API."""
 
@@ -24,24 +35,118 @@ class RadarrClient(BaseArrClient):
         -------
         dict[str, Any] | None
             The movie details if found, otherwise None.
+
+        Notes
+        -----
+        Concurrent lookups for the same movie share a single request and parsed model.
+        Results, including not-found results, are served from the cache when enabled.
         """
+        if (cached := self.cache_get("movie", id)) is not MISSING:
+            logger.debug("Using cached movie details for ID: %s", id)
+            return cached
+
+        return await self.singleflight.do(
+            (self.uri, "movie", id), lambda: self._fetch_movie_by_id(id)
+        )
+
+    async def _fetch_movie_by_id(self, id: int) -> RadarrAPIMovie | None:
         url = self.base_url + f"/movie/{id}"
 
         logger.debug("Fetching movie details for ID: %s", id)
         try:
             response = await self.request("GET", url, headers=self.headers)
-            logger.debug("Successfully fetched movie details: %s", response)
+            logger.debug("Successfully fetched movie details: %s", log.sampled(str, response))
         except HTTPException as e:
             logger.warning(
                 "Unexpected error fetching movie from Radarr: status=%s, reason=%s",
                 e.status,
                 e.reason,
             )
+            if e.status == 404:  # noqa: PLR2004
+                self.cache_set("movie", id, None)
             return None
         else:
-            return RadarrAPIMovie.model_validate(response)
+            movie = RadarrAPIMovie.model_validate(response)
+            self.cache_set("movie", id, movie)
+            return movie
+
+    async def iter_all_movies(self) -> AsyncIterator[RadarrAPIMovie]:
+        """Yield every movie in Radarr as it is read from a single request.
 
-    async def delete_movie(self, id: int) -> None:
+        The response is parsed as it arrives, so only one movie is held in memory at a
+        time. Movies that cannot be read are skipped with a warning.
+
+        Yields
+        ------
+        RadarrAPIMovie
+            The next movie in the library.
+
+        Raises
+        ------
+        HTTPException
+            If Radarr refused the request.
+        """
+        url = f"{self.base_url}/movie"
+
+        logger.debug("Fetching all movies from Radarr.")
+        count = 0
+        async for data in self.stream(url, headers=self.headers):
+            try:
+                movie = RadarrAPIMovie.model_validate(data)
+            except ValidationError:
+                logger.warning("Skipping unreadable movie from Radarr: id=%s", data.get("id"))
+                continue
+            count += 1
+            yield movie
+        logger.debug("Fetched %s movies from Radarr.", count)
+
+    async def get_import_history(self, page: int, page_size: int) -> list[RadarrHistoryRecord]:
+        """Fetch a page of Radarr's import history, newest first.
+
+        Each record is fetched with its movie. Records that cannot be read are skipped
+        with a warning.
+
+        Parameters
+        ----------
+        page : int
+            The page to fetch, starting at 1.
+        page_size : int
+            The number of records on each page.
+
+        Returns
+        -------
+        list[RadarrHistoryRecord]
+            The import records on the page.
+
+        Raises
+        ------
+        HTTPException
+            If Radarr refused the request.
+        """
+        url = f"{self.base_url}/history"
+        params: dict[str, Any] = {
+            "page": page,
+            "pageSize": page_size,
+            "sortKey": "date",
+            "sortDirection": "descending",
+            "eventType": HISTORY_IMPORT_EVENT,
+            "includeMovie": "true",
+        }
+
+        logger.debug("Fetching import history from Radarr: page=%s, page_size=%s", page, page_size)
+        response = await self.request("GET", url, headers=self.headers, params=params)
+
+        records: list[RadarrHistoryRecord] = []
+        for data in response.get("records", []):
+            try:
+                records.append(RadarrHistoryRecord.model_validate(data))
+            except ValidationError:
+                logger.warning(
+                    "Skipping unreadable history record from Radarr: id=%s", data.get("id")
+                )
+        return records
+
+    async def delete_movie(self, id: int) -> bool:
         """
         Delete a movie from Radarr.
 
@@ -49,6 +154,11 @@ class RadarrClient(BaseArrClient):
         ----------
         id : int
             The ID of the movie to delete.
+
+        Returns
+        -------
+        bool
+            True if the movie was deleted, otherwise False.
         """
         url = f"{self.base_url}/movie/{id}"
 
@@ -62,8 +172,11 @@ class RadarrClient(BaseArrClient):
                 e.status,
                 e.reason,
             )
+            return False
+        self.cache_invalidate("movie", id)
+        return True
 
-    async def put_updated_movie(self, movie: RadarrAPIMovie) -> None:
+    async def put_updated_movie(self, movie: RadarrAPIMovie) -> bool:
         """
         Unmonitor a specific movie in Radarr.
 
@@ -71,10 +184,15 @@ class RadarrClient(BaseArrClient):
         ----------
         movie: RadarAPIMovie
             The movie data containing the ID and updated monitoring status.
+
+        Returns
+        -------
+        bool
+            True if the movie was updated, otherwise False.
         """
         url = f"{self.base_url}/movie/{movie.id}"
 
-        logger.debug("Movie data to update: %s", movie.model_dump())
+        logger.debug("Movie data to update: %s", log.sampled(movie.model_dump))
         try:
             await self.request(
                 "PUT", url, headers=self.headers, json=movie.model_dump(by_alias=True)
@@ -86,3 +204,101 @@ class RadarrClient(BaseArrClient):
                 e.status,
                 e.reason,
             )
+            return False
+        self.cache_set("movie", movie.id, movie)
+        return True
+
+    async def bulk_unmonitor_movies(self, ids: list[int]) -> bool:
+        """
+        Unmonitor movies with a single request to Radarr's movie editor.
+
+        Falls back to fetching and updating each movie if the editor is unavailable.
+
+        Parameters
+        ----------
+        ids : list[int]
+            The IDs of the movies to unmonitor.
+
+        Returns
+        -------
+        bool
+            True if every movie was unmonitored, otherwise False.
+        """
+        if self.editor_supported:
+            url = f"{self.base_url}/movie/editor"
+            json: dict[str, Any] = {"movieIds": ids, "monitored": False}
+
+            logger.info("Unmonitoring %s movies: %s", len(ids), ids)
+            try:
+                await self.request("PUT", url, headers=self.headers, json=json, idempotent=True)
+            except HTTPException as e:
+                if not await self.check_editor_unsupported(e, "PUT", url, json, "movieIds"):
+                    logger.warning(
+                        "Unexpected error during unmonitoring movies: status=%s, reason=%s",
+                        e.status,
+                        e.reason,
+                    )
+                    return False
+            else:
+                logger.info("Successfully unmonitored movies: %s", ids)
+                self.cache_invalidate("movie", *ids)
+                return True
+
+        results = await asyncio.gather(*(self._fetch_and_unmonitor_movie(id) for id in ids))
+        return all(results)
+
+    async def _fetch_and_unmonitor_movie(self, id: int) -> bool:
+        movie = await self.get_movie_by_id(id)
+        if not movie:
+            logger.warning("Unable to fetch movie from Radarr: id=%s", id)
+            return False
+
+        # the fetched movie may be cached or shared, so it is left unchanged and the
+        # unmonitored copy is only cached once the update succeeds
+        updated = movie.model_copy(deep=True)
+        updated.unmonitor()
+        return await self.put_updated_movie(updated)
+
+    async def bulk_delete_movies(self, ids: list[int]) -> bool:
+        """
+        Delete movies with a single request to Radarr's movie editor.
+
+        Falls back to deleting each movie if the editor is unavailable. Files are never
+        deleted.
+
+        Parameters
+        ----------
+        ids : list[int]
+            The IDs of the movies to delete.
+
+        Returns
+        -------
+        bool
+            True if every movie was deleted, otherwise False.
+        """
+        if self.editor_supported:
+            url = f"{self.base_url}/movie/editor"
+            json: dict[str, Any] = {
+                "movieIds": ids,
+                "deleteFiles": False,
+                "addImportExclusion": False,
+            }
+
+            logger.info("Deleting %s movies: %s", len(ids), ids)
+            try:
+                await self.request("DELETE", url, headers=self.headers, json=json)
+            except HTTPException as e:
+                if not await self.check_editor_unsupported(e, "DELETE", url, json, "movieIds"):
+                    logger.warning(
+                        "Unexpected error during movie deletion: status=%s, reason=%s",
+                        e.status,
+                        e.reason,
+                    )
+                    return False
+            else:
+                logger.info("Successfully deleted movies: %s", ids)
+                self.cache_invalidate("movie", *ids)
+                return True
+
+        results = await asyncio.gather(*(self.delete_movie(id) for id in ids))
+        return all(results)
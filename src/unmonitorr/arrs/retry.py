@@ -0,0 +1,65 @@
+import random
+from typing import Any, Final
+
+__all__ = ("RetryPolicy",)
+
+
+RETRY_STATUSES: Final[frozenset[int]] = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for retrying idempotent arr requests.
+
+    Parameters
+    ----------
+    retries : int
+        Attempts made after the first one fails.
+    base_delay : float
+        Seconds the backoff for the first retry is drawn up to, doubling for each retry.
+    max_delay : float
+        Upper bound of any single backoff, including a server's ``Retry-After``.
+    """
+
+    __slots__ = (
+        "base_delay",
+        "max_delay",
+        "retried",
+        "retries",
+    )
+
+    def __init__(self, retries: int = 3, base_delay: float = 0.5, max_delay: float = 10.0) -> None:
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retried: int = 0
+
+    @staticmethod
+    def should_retry(status: int | None) -> bool:
+        """Return True if a request that ended with `status` is worth retrying.
+
+        A status of None means no response was received.
+        """
+        return status is None or status in RETRY_STATUSES
+
+    def backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        """Return the seconds to wait before retry number `attempt`, counting from 1.
+
+        Parameters
+        ----------
+        attempt : int
+            The retry about to be made.
+        retry_after : str | None
+            The failed response's ``Retry-After`` header, honoured when it is in seconds.
+        """
+        # full jitter spreads out the retries of requests that failed together
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return min(delay, self.max_delay)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the retry settings and the number of retries made."""
+        return {
+            "retries": self.retries,
+            "retried": self.retried,
+        }
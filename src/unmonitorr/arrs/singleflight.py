@@ -0,0 +1,75 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+__all__ = ("SingleFlight",)
+
+
+class SingleFlight:
+    """Shares a single in-flight call between concurrent callers using the same key.
+
+    While a call for a key is running, later callers with that key wait for it and
+    receive the same result instead of starting their own call. A caller that needs a
+    result no older than some time only joins a call started at or after it.
+    """
+
+    __slots__ = (
+        "_in_flight",
+        "calls",
+        "coalesced",
+    )
+
+    def __init__(self) -> None:
+        # the running call for each key, with the monotonic time it started
+        self._in_flight: dict[Hashable, tuple[float, asyncio.Future[Any]]] = {}
+        self.calls: int = 0
+        self.coalesced: int = 0
+
+    async def do[
+        T
+    ](self, key: Hashable, fn: Callable[[], Awaitable[T]], *, since: float | None = None) -> T:
+        """Await `fn`, or join the call already running for `key`.
+
+        Parameters
+        ----------
+        key : Hashable
+            Identifies calls that can share a result.
+        fn : Callable[[], Awaitable[T]]
+            Starts the call when none is running for `key`.
+        since : float | None
+            A `time.monotonic` time the joined call must have started at or after. An
+            older call is left to its callers, and a new one is started for `key`.
+
+        Returns
+        -------
+        T
+            The result of the shared call.
+        """
+        self.calls += 1
+
+        entry = self._in_flight.get(key)
+        if entry is None or (since is not None and entry[0] < since):
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = (time.monotonic(), future)
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            future = entry[1]
+            self.coalesced += 1
+
+        # shielded so one cancelled caller does not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future[Any]) -> None:
+        # a newer call may have replaced the finished one
+        entry = self._in_flight.get(key)
+        if entry is not None and entry[1] is future:
+            del self._in_flight[key]
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of calls and how many of them joined an in-flight call."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
@@ -1,9 +1,20 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
 from typing import Any, Final
 
+from pydantic import ValidationError
+
 from unmonitorr import log
-from unmonitorr.types_ import SonarrAPISeries, SonarrWebhookPayload, WebhookSeries
+from unmonitorr.types_ import (
+    SonarrAPISeries,
+    SonarrHistoryRecord,
+    SonarrWebhookPayload,
+    WebhookSeries,
+)
 
 from .arrbase import BaseArrClient, HTTPException
+from .cache import MISSING
 
 __all__ = ("SonarrClient",)
 
@@ -12,21 +23,83 @@ logger = log.get_logger(__name__)
 
 COMPLETE_PERCENT: Final[int] = 100
 
+# the downloadFolderImported event type in Sonarr's history
+HISTORY_IMPORT_EVENT: Final[int] = 3
+
 
 class SonarrClient(BaseArrClient):
     """A client for interacting with Radarr's API."""
 
-    async def delete_series(self, series: WebhookSeries, *, exclude: bool = False) -> None:
+    async def delete_series(self, series: WebhookSeries, *, exclude: bool = False) -> bool:
         """Delete a series from Sonarr.
 
         Parameters
         ----------
         id : int
             The ID of the series to delete.
+
+        Returns
+        -------
+        bool
+            True if the series was deleted, otherwise False.
         """
         logger.info("Deleting series from Sonarr: %s", series)
-        url = f"{self.base_url}/series/{series.id}"
 
+        if not await self._delete_series_by_id(series.id, exclude=exclude):
+            return False
+
+        logger.info("Successfully deleted series from Sonarr: %s", series)
+        return True
+
+    async def bulk_delete_series(self, ids: list[int], *, exclude: bool = False) -> bool:
+        """Delete series with a single request to Sonarr's series editor.
+
+        Falls back to deleting each series if the editor is unavailable. Files are never
+        deleted.
+
+        Parameters
+        ----------
+        ids : list[int]
+            The IDs of the series to delete.
+        exclude : bool
+            Whether to add the series to the import list exclusions.
+
+        Returns
+        -------
+        bool
+            True if every series was deleted, otherwise False.
+        """
+        if self.editor_supported:
+            url = f"{self.base_url}/series/editor"
+            json: dict[str, Any] = {
+                "seriesIds": ids,
+                "deleteFiles": False,
+                "addImportListExclusion": exclude,
+            }
+
+            logger.info("Deleting %s series from Sonarr: %s", len(ids), ids)
+            try:
+                await self.request("DELETE", url, headers=self.headers, json=json)
+            except HTTPException as e:
+                if not await self.check_editor_unsupported(e, "DELETE", url, json, "seriesIds"):
+                    logger.warning(
+                        "Unexpected error during series deletion: status=%s, reason=%s",
+                        e.status,
+                        e.reason,
+                    )
+                    return False
+            else:
+                logger.info("Successfully deleted series from Sonarr: %s", ids)
+                self.cache_invalidate("series", *ids)
+                return True
+
+        results = await asyncio.gather(
+            *(self._delete_series_by_id(id, exclude=exclude) for id in ids)
+        )
+        return all(results)
+
+    async def _delete_series_by_id(self, id: int, *, exclude: bool) -> bool:
+        url = f"{self.base_url}/series/{id}"
         params: dict[str, Any] = {
             "deleteFiles": "false",
             "addImportListExclusion": "true" if exclude else "false",
@@ -34,42 +107,73 @@ class SonarrClient(BaseArrClient):
 
         try:
             await self.request("DELETE", url, headers=self.headers, params=params)
-            logger.info("Successfully deleted series from Sonarr: %s", series)
         except HTTPException as e:
             logger.warning(
                 "Unexpected error during series deletion: status=%s, reason=%s",
                 e.status,
                 e.reason,
             )
+            return False
+        self.cache_invalidate("series", id)
+        return True
 
-    async def unmonitor_episodes(self, payload: SonarrWebhookPayload) -> None:
+    async def unmonitor_episodes(self, payload: SonarrWebhookPayload) -> bool:
         """Unmonitor episodes for a given series in Sonarr.
 
         Parameters
         ----------
         payload: SonarrWebhookPayload
             Webhook payload from Sonarr that contains the episodes.
+
+        Returns
+        -------
+        bool
+            True if the episodes were unmonitored, otherwise False.
         """
         logger.info("Attempting to unmonitor episodes for series: %s", payload.series)
-        logger.debug("Series details: %s", payload.series.model_dump())
+        logger.debug("Series details: %s", log.sampled(payload.series.model_dump))
+
+        if not await self.unmonitor_episode_ids(payload.episode_ids_to_unmonitor()):
+            return False
+
+        logger.info("Successfully unmonitored episodes: %s", payload.episodes)
+        return True
+
+    async def unmonitor_episode_ids(self, episode_ids: list[int]) -> bool:
+        """Unmonitor episodes in Sonarr with a single request.
+
+        Parameters
+        ----------
+        episode_ids: list[int]
+            The IDs of the episodes to unmonitor.
 
+        Returns
+        -------
+        bool
+            True if Sonarr accepted the request, otherwise False.
+        """
         url = f"{self.base_url}/episode/monitor"
         params: dict[str, Any] = {"includeImages": "false"}
 
         json: dict[str, Any] = {
-            "episodeIds": [e.id for e in payload.episodes],
+            "episodeIds": episode_ids,
             "monitor": False,
         }
 
         try:
-            await self.request("PUT", url, headers=self.headers, json=json, params=params)
-            logger.info("Successfully unmonitored episodes: %s", payload.episodes)
+            await self.request(
+                "PUT", url, headers=self.headers, json=json, params=params, idempotent=True
+            )
         except HTTPException as e:
             logger.warning(
                 "Unexpected error during unmonitoring episodes: status=%s, reason=%s",
                 e.status,
                 e.reason,
             )
+            return False
+
+        logger.debug("Unmonitored %s episodes: %s", len(episode_ids), episode_ids)
+        return True
 
     async def get_series_by_id(self, id: int) -> SonarrAPISeries | None:
         """Fetch details for a specific series from Sonarr.
@@ -83,36 +187,147 @@ class SonarrClient(BaseArrClient):
         -------
         dict[str, Any] | None
             The series details if found, otherwise None.
+
+        Notes
+        -----
+        Concurrent lookups for the same series share a single request and parsed model.
+        Results, including not-found results, are served from the cache when enabled.
+        Once the series is marked as changed by an import, lookups only share, and the
+        cache only keeps, a request started after the import was noticed.
         """
+        if (cached := self.cache_get("series", id)) is not MISSING:
+            logger.debug("Using cached series details for ID: %s", id)
+            return cached
+
+        return await self.singleflight.do(
+            (self.uri, "series", id),
+            lambda: self._fetch_series_by_id(id),
+            since=self.changed_at("series", id),
+        )
+
+    async def _fetch_series_by_id(self, id: int) -> SonarrAPISeries | None:
         logger.debug("Fetching series details for ID: %s", id)
         url = self.base_url + f"/series/{id}"
+        started = time.monotonic()
 
         try:
             response = await self.request("GET", url, headers=self.headers)
-            logger.debug("Successfully fetched series details: %s", response)
+            logger.debug("Successfully fetched series details: %s", log.sampled(str, response))
         except HTTPException as e:
             logger.warning(
                 "Unexpected error fetching series from Sonarr: status=%s, reason=%s",
                 e.status,
                 e.reason,
             )
+            if e.status == 404:  # noqa: PLR2004
+                self.cache_set("series", id, None, fetched_at=started)
             return None
 
         else:
-            return SonarrAPISeries.model_validate(response)
+            series = SonarrAPISeries.model_validate(response)
+            self.cache_set("series", id, series, fetched_at=started)
+            return series
+
+    async def iter_all_series(self) -> AsyncIterator[SonarrAPISeries]:
+        """Yield every series in Sonarr, with statistics, as it is read from a single request.
+
+        The response is parsed as it arrives, so only one series is held in memory at a
+        time. Series that cannot be read are skipped with a warning.
+
+        Yields
+        ------
+        SonarrAPISeries
+            The next series in the library.
+
+        Raises
+        ------
+        HTTPException
+            If Sonarr refused the request.
+        """
+        url = f"{self.base_url}/series"
+
+        logger.debug("Fetching all series from Sonarr.")
+        count = 0
+        async for data in self.stream(url, headers=self.headers):
+            try:
+                series = SonarrAPISeries.model_validate(data)
+            except ValidationError:
+                logger.warning("Skipping unreadable series from Sonarr: id=%s", data.get("id"))
+                continue
+            count += 1
+            yield series
+        logger.debug("Fetched %s series from Sonarr.", count)
+
+    async def get_import_history(self, page: int, page_size: int) -> list[SonarrHistoryRecord]:
+        """Fetch a page of Sonarr's import history, newest first.
+
+        Each record is fetched with its series and episode. Records that cannot be read are skipped
+        with a warning.
+
+        Parameters
+        ----------
+        page : int
+            The page to fetch, starting at 1.
+        page_size : int
+            The number of records on each page.
+
+        Returns
+        -------
+        list[SonarrHistoryRecord]
+            The import records on the page.
+
+        Raises
+        ------
+        HTTPException
+            If Sonarr refused the request.
+        """
+        url = f"{self.base_url}/history"
+        params: dict[str, Any] = {
+            "page": page,
+            "pageSize": page_size,
+            "sortKey": "date",
+            "sortDirection": "descending",
+            "eventType": HISTORY_IMPORT_EVENT,
+            "includeSeries": "true",
+            "includeEpisode": "true",
+        }
+
+        logger.debug("Fetching import history from Sonarr: page=%s, page_size=%s", page, page_size)
+        response = await self.request("GET", url, headers=self.headers, params=params)
+
+        records: list[SonarrHistoryRecord] = []
+        for data in response.get("records", []):
+            try:
+                records.append(SonarrHistoryRecord.model_validate(data))
+            except ValidationError:
+                logger.warning(
+                    "Skipping unreadable history record from Sonarr: id=%s", data.get("id")
+                )
+        return records
 
-    async def put_updated_series(self, series: SonarrAPISeries) -> None:
+    async def put_updated_series(self, series: SonarrAPISeries) -> bool:
         """Mark a series as unmonitored
 
         Parameters
         ----------
         series: SonarrAPISeries
             The complete series data from Sonarr.
+
+        Returns
+        -------
+        bool
+            True if the series was updated, otherwise False.
         """
+        if not await self._put_series(series):
+            return False
+        self.cache_set("series", series.id, series)
+        return True
+
+    async def _put_series(self, series: SonarrAPISeries) -> bool:
         url = f"{self.base_url}/series/{series.id}"
 
         logger.info("Unmonitoring series: %s", series)
-        logger.debug("Series data to update: %s", series.model_dump())
+        logger.debug("Series data to update: %s", log.sampled(series.model_dump))
         try:
             await self.request(
                 "PUT", url, headers=self.headers, json=series.model_dump(by_alias=True)
@@ -124,6 +339,162 @@ class SonarrClient(BaseArrClient):
                 e.status,
                 e.reason,
             )
+            return False
+        return True
+
+    async def unmonitor_seasons(self, series: SonarrAPISeries, season_numbers: list[int]) -> bool:
+        """Unmonitor seasons of a series with a single update of its full document.
+
+        The series is left unchanged, and a copy with the seasons unmonitored is cached
+        once the update succeeds.
+
+        Parameters
+        ----------
+        series : SonarrAPISeries
+            The complete series data from Sonarr.
+        season_numbers : list[int]
+            The numbers of the seasons to unmonitor.
+
+        Returns
+        -------
+        bool
+            True if the seasons were unmonitored, otherwise False.
+        """
+        url = f"{self.base_url}/series/{series.id}"
+
+        updated = series.model_copy(deep=True)
+        for season in updated.seasons:
+            if season.season_number in season_numbers:
+                season.unmonitor()
+
+        logger.info("Unmonitoring seasons %s of series: %s", season_numbers, series)
+        try:
+            await self.request(
+                "PUT",
+                url,
+                headers=self.headers,
+                json=updated.model_dump(by_alias=True),
+                idempotent=True,
+            )
+        except HTTPException as e:
+            logger.warning(
+                "Unexpected error during unmonitoring seasons: status=%s, reason=%s",
+                e.status,
+                e.reason,
+            )
+            return False
+        logger.info("Successfully unmonitored seasons %s of series: %s", season_numbers, series)
+        self.cache_set("series", series.id, updated)
+        return True
+
+    async def bulk_unmonitor_series(self, series: list[SonarrAPISeries]) -> bool:
+        """Unmonitor series with a single request to Sonarr's series editor.
+
+        Falls back to updating each series with its full document if the editor is
+        unavailable.
+
+        Parameters
+        ----------
+        series : list[SonarrAPISeries]
+            The series to unmonitor.
+
+        Returns
+        -------
+        bool
+            True if every series was unmonitored, otherwise False.
+        """
+        # the series may be shared with the cache and other lookups, so they are only
+        # replaced by the unmonitored copies once the update succeeds
+        updates = [s.model_copy(deep=True) for s in series]
+        for s in updates:
+            s.unmonitor_series()
+
+        if self.editor_supported:
+            url = f"{self.base_url}/series/editor"
+            ids = [s.id for s in updates]
+            json: dict[str, Any] = {"seriesIds": ids, "monitored": False}
+
+            logger.info("Unmonitoring %s series: %s", len(ids), ids)
+            try:
+                await self.request("PUT", url, headers=self.headers, json=json, idempotent=True)
+            except HTTPException as e:
+                if not await self.check_editor_unsupported(e, "PUT", url, json, "seriesIds"):
+                    logger.warning(
+                        "Unexpected error during unmonitoring series: status=%s, reason=%s",
+                        e.status,
+                        e.reason,
+                    )
+                    return False
+            else:
+                for s in updates:
+                    self.cache_set("series", s.id, s)
+                logger.info("Successfully unmonitored series: %s", ids)
+                return True
+
+        results = await asyncio.gather(*(self.put_updated_series(s) for s in updates))
+        return all(results)
+
+    async def bulk_unmonitor_series_ids(self, ids: list[int]) -> bool:
+        """Unmonitor series by ID with a single request to Sonarr's series editor.
+
+        Falls back to fetching and updating each series if the editor is unavailable.
+        Neither path fills the cache, so a library-wide update only holds the IDs, and
+        one series document at a time in the fallback.
+
+        Parameters
+        ----------
+        ids : list[int]
+            The IDs of the series to unmonitor.
+
+        Returns
+        -------
+        bool
+            True if every series was unmonitored, otherwise False.
+        """
+        if self.editor_supported:
+            url = f"{self.base_url}/series/editor"
+            json: dict[str, Any] = {"seriesIds": ids, "monitored": False}
+
+            logger.info("Unmonitoring %s series: %s", len(ids), ids)
+            try:
+                await self.request("PUT", url, headers=self.headers, json=json, idempotent=True)
+            except HTTPException as e:
+                if not await self.check_editor_unsupported(e, "PUT", url, json, "seriesIds"):
+                    logger.warning(
+                        "Unexpected error during unmonitoring series: status=%s, reason=%s",
+                        e.status,
+                        e.reason,
+                    )
+                    return False
+            else:
+                logger.info("Successfully unmonitored series: %s", ids)
+                self.cache_invalidate("series", *ids)
+                return True
+
+        success = True
+        for id in ids:
+            success = await self._fetch_and_unmonitor_series(id) and success
+        return success
+
+    async def _fetch_and_unmonitor_series(self, id: int) -> bool:
+        url = f"{self.base_url}/series/{id}"
+        try:
+            response = await self.request("GET", url, headers=self.headers)
+        except HTTPException as e:
+            logger.warning(
+                "Unable to fetch series from Sonarr: id=%s, status=%s, reason=%s",
+                id,
+                e.status,
+                e.reason,
+            )
+            return False
+
+        series = SonarrAPISeries.model_validate(response)
+        series.unmonitor_series()
+        if not await self._put_series(series):
+            return False
+        self.cache_invalidate("series", id)
+        return True
 
     def series_is_ended(self, series: dict[str, Any]) -> bool:
         """
@@ -0,0 +1,133 @@
+import asyncio
+import contextvars
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from unmonitorr import log
+from unmonitorr.types_ import SonarrWebhookPayload
+
+__all__ = ("EpisodeCoalescer",)
+
+logger = log.get_logger(__name__)
+
+
+class EpisodeCoalescer:
+    """Buffers Sonarr episode payloads so bursts are handled as a single batch.
+
+    Payloads are held for up to `window` seconds, or until `max_batch` episode IDs are
+    buffered, and are then passed together to `flush`. :meth:`submit` returns a future
+    for the result of the batch containing the payload, which callers of :meth:`add`
+    wait for.
+
+    Each batch is flushed in a new, empty context, so it does not run under the deadline,
+    trace or log fields of the payload that happened to trigger it.
+
+    Parameters
+    ----------
+    flush : Callable[[list[SonarrWebhookPayload]], Awaitable[bool]]
+        Coroutine function called with every payload in the batch, returning whether the
+        batch was handled successfully.
+    window : float
+        Seconds to wait for more payloads after the first one arrives.
+    max_batch : int
+        Number of buffered episode IDs that triggers an immediate flush.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[SonarrWebhookPayload]], Awaitable[bool]],
+        *,
+        window: float = 0.5,
+        max_batch: int = 250,
+    ) -> None:
+        self.flush = flush
+        self.window = window
+        self.max_batch = max_batch
+
+        self._pending: list[SonarrWebhookPayload] = []
+        self._pending_episodes: int = 0
+        self._waiter: asyncio.Future[bool] | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushing: set[asyncio.Task[None]] = set()
+
+        self.flushes: int = 0
+        self.payloads: int = 0
+        self.episodes: int = 0
+
+    async def add(self, payload: SonarrWebhookPayload) -> bool:
+        """Buffer a payload and wait for its batch to be flushed.
+
+        Returns
+        -------
+        bool
+            True if the batch containing the payload was handled successfully.
+        """
+        return await asyncio.shield(self.submit(payload))
+
+    def submit(self, payload: SonarrWebhookPayload) -> asyncio.Future[bool]:
+        """Buffer a payload without waiting for its batch.
+
+        Returns
+        -------
+        asyncio.Future[bool]
+            Resolves to True once the batch containing the payload was handled
+            successfully, or to False if it failed.
+        """
+        if self._waiter is None:
+            loop = asyncio.get_running_loop()
+            self._waiter = loop.create_future()
+            self._timer = loop.call_later(self.window, self._flush_pending)
+
+        waiter = self._waiter
+        self._pending.append(payload)
+        self._pending_episodes += len(payload.episodes)
+
+        if self._pending_episodes >= self.max_batch:
+            self._flush_pending()
+
+        return waiter
+
+    async def stop(self) -> None:
+        """Flush anything still buffered and wait for in-progress flushes."""
+        self._flush_pending()
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+
+    def _flush_pending(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._waiter is None:
+            return
+
+        batch, waiter = self._pending, self._waiter
+        self._pending, self._pending_episodes, self._waiter = [], 0, None
+
+        task = asyncio.create_task(self._run(batch, waiter), context=contextvars.Context())
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _run(self, batch: list[SonarrWebhookPayload], waiter: asyncio.Future[bool]) -> None:
+        self.flushes += 1
+        self.payloads += len(batch)
+        self.episodes += sum(len(p.episodes) for p in batch)
+        logger.debug("Flushing batch of %s Sonarr payloads.", len(batch))
+
+        success = False
+        try:
+            success = await self.flush(batch)
+        except Exception:
+            logger.exception("Unhandled error flushing batch of %s Sonarr payloads.", len(batch))
+        finally:
+            waiter.set_result(success)
+
+    def stats(self) -> dict[str, Any]:
+        """Return batching statistics."""
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "payloads": self.payloads,
+            "episodes": self.episodes,
+            "avg_payloads_per_flush": self.payloads / self.flushes if self.flushes else 0.0,
+        }
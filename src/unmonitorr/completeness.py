@@ -0,0 +1,166 @@
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+__all__ = ("CompletenessIndex",)
+
+
+class _Entry:
+    """The episodes a series is missing, by season, as of its last fetch."""
+
+    __slots__ = (
+        "doubtful",
+        "ended",
+        "missing",
+        "refreshed",
+    )
+
+    def __init__(self, missing: dict[int, int], *, ended: bool) -> None:
+        # only seasons still missing episodes are kept, so most entries stay tiny
+        self.missing = missing
+        self.ended = ended
+        self.refreshed = time.monotonic()
+        self.doubtful = False
+
+
+class CompletenessIndex:
+    """A bounded in-memory index of the episodes each series is missing.
+
+    Entries are seeded from the series fetched from Sonarr and counted down as episodes
+    are imported, so a series that is still missing episodes can be skipped without
+    fetching it. Imports are only counted, not tracked by episode, which keeps each entry
+    small but can count an upgrade or repeated import as a new episode. The index
+    therefore never decides that a series is complete on its own: once its counts reach
+    zero, or a season completes while season handling is enabled, the series is fetched
+    again to verify it.
+
+    Parameters
+    ----------
+    max_age : float
+        Seconds an entry is trusted for after it was fetched.
+    maxsize : int
+        Maximum number of series kept before the least recently used is dropped.
+
+    Examples
+    --------
+    >>> index = CompletenessIndex(max_age=3600.0)
+    >>> index.update(1, {1: 0, 2: 2}, ended=True)
+    >>> index.needs_fetch(1, series=True, ended_only=True, seasons=False)
+    False
+    >>> index.record_imports(1, [2, 2])
+    >>> index.needs_fetch(1, series=True, ended_only=True, seasons=False)
+    True
+    """
+
+    __slots__ = (
+        "_entries",
+        "corrections",
+        "hits",
+        "max_age",
+        "maxsize",
+        "misses",
+    )
+
+    def __init__(self, max_age: float, maxsize: int = 50000) -> None:
+        self.max_age = max_age
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.corrections: int = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, series_id: int, missing: Mapping[int, int], *, ended: bool) -> None:
+        """Replace the entry for a series with the counts from a fresh fetch.
+
+        Parameters
+        ----------
+        series_id : int
+            The ID of the series in Sonarr.
+        missing : Mapping[int, int]
+            The number of episodes each season is missing, by season number.
+        ended : bool
+            Whether the series has ended.
+        """
+        previous = self._entries.get(series_id)
+        entry = _Entry({n: count for n, count in missing.items() if count > 0}, ended=ended)
+        if previous is not None and previous.doubtful and entry.missing:
+            # the counts had reached zero, but the series was still missing episodes
+            self.corrections += 1
+
+        self._entries[series_id] = entry
+        self._entries.move_to_end(series_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, series_id: int) -> None:
+        """Forget a series, such as one removed from Sonarr."""
+        self._entries.pop(series_id, None)
+
+    def record_imports(self, series_id: int, season_numbers: Iterable[int]) -> None:
+        """Count imported episodes, given by their season numbers, against a series.
+
+        A series that was never fetched is left to be seeded by its next fetch.
+        """
+        entry = self._entries.get(series_id)
+        if entry is None:
+            return
+
+        for season_number in season_numbers:
+            count = entry.missing.get(season_number)
+            if count is None:
+                continue
+            if count > 1:
+                entry.missing[season_number] = count - 1
+            else:
+                del entry.missing[season_number]
+                entry.doubtful = True
+
+    def needs_fetch(self, series_id: int, *, series: bool, ended_only: bool, seasons: bool) -> bool:
+        """Return True if the series has to be fetched to decide how to handle it.
+
+        Parameters
+        ----------
+        series_id : int
+            The ID of the series in Sonarr.
+        series : bool
+            Whether complete series are handled as a whole.
+        ended_only : bool
+            Whether only ended series are handled as a whole.
+        seasons : bool
+            Whether the finished seasons of other series are handled.
+        """
+        entry = self._entries.get(series_id)
+        if entry is None or self._expired(entry) or (entry.doubtful and seasons):
+            fetch = True
+        elif not entry.missing:
+            # a complete series still has to be fetched to be verified and updated
+            fetch = series and (entry.ended or not ended_only)
+        else:
+            fetch = False
+
+        if fetch:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(series_id)
+        return fetch
+
+    def _expired(self, entry: _Entry) -> bool:
+        return time.monotonic() - entry.refreshed > self.max_age
+
+    def stats(self) -> dict[str, Any]:
+        """Return the index size and how often a series fetch was avoided."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "corrections": self.corrections,
+        }
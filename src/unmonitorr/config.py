@@ -21,7 +21,7 @@ os.makedirs(CONFIG_PATH, exist_ok=True)
 
 class Config:
 
-    def __init__(self) -> None:
+    def __init__(self) -> None:  # noqa: PLR0915
         # RADARR Configuration
         self.radarr_uri: str = ""
         self.radarr_api_key: str = ""
@@ -33,12 +33,83 @@ class Config:
         # sonarr-specific unmonitor settings
         self.handle_episodes: bool = True
         self.handle_series: bool = True
+        self.handle_seasons: bool = False
         self.handle_series_ended_only: bool = True
         self.exclude_series: bool = False
 
         # general settings
         self.remove_media: bool = False
 
+        # arr client connection pool settings
+        self.arr_pool_limit_per_host: int = 10
+        self.arr_dns_cache_ttl: int = 300
+        self.arr_keepalive_timeout: float = 30.0
+        self.arr_connect_timeout: float = 10.0
+        self.arr_read_timeout: float = 60.0
+        self.arr_total_timeout: float = 300.0
+
+        # arr request concurrency settings, a max of 0 leaves requests unlimited
+        self.arr_max_in_flight: int = 0
+        self.arr_adaptive_concurrency: bool = False
+        self.arr_min_in_flight: int = 1
+        self.arr_latency_target: float = 2.0
+
+        # arr request retry and circuit breaker settings, 0 retries or a threshold of 0
+        # disables them
+        self.arr_retries: int = 0
+        self.arr_retry_base_delay: float = 0.5
+        self.arr_retry_max_delay: float = 10.0
+        self.arr_breaker_threshold: int = 0
+        self.arr_breaker_reset_timeout: float = 30.0
+        self.arr_park_timeout: float = 300.0
+
+        # series/movie lookup cache settings, a ttl of 0 disables the cache
+        self.arr_cache_ttl: float = 0.0
+        self.arr_cache_negative_ttl: float = 60.0
+        self.arr_cache_size: int = 1024
+
+        # webhook queue settings
+        self.webhook_queue_enabled: bool = False
+        self.webhook_queue_size: int = 100
+        self.webhook_queue_workers: int = 2
+        self.webhook_retry_after: int = 5
+
+        # seconds each webhook may spend on arr requests before its remaining steps are
+        # deferred, 0 disables the deadline
+        self.webhook_deadline: float = 0.0
+
+        # webhook event filter settings, an empty list allows every event type
+        self.allowed_event_types: list[str] = []
+        self.skip_upgrades: bool = False
+
+        # duplicate webhook suppression settings, a window of 0 disables suppression
+        self.dedupe_window: float = 0.0
+        self.dedupe_size: int = 10000
+
+        # durable webhook journal settings
+        self.journal_enabled: bool = False
+        self.journal_max_attempts: int = 5
+        self.journal_retention: float = 86400.0
+        self.journal_compact_interval: float = 300.0
+
+        # series completeness index settings, a max age of 0 disables the index
+        self.series_index_max_age: float = 0.0
+        self.series_index_size: int = 50000
+
+        # sonarr episode batching settings, a window of 0 disables batching
+        self.episode_batch_window: float = 0.0
+        self.episode_batch_size: int = 250
+
+        # import history reconciliation settings, an interval of 0 disables the reconciler
+        self.reconcile_interval: float = 0.0
+        self.reconcile_page_size: int = 250
+        self.reconcile_concurrency: int = 4
+        self.reconcile_max_attempts: int = 5
+
+        # webhook tracing settings, the slowest traces are kept for /debug/traces
+        self.trace_keep: int = 20
+        self.trace_export_path: str = ""
+
         self.load()
 
     @property
@@ -59,7 +130,7 @@ class Config:
         except (FileNotFoundError, json.JSONDecodeError):
             self.save()
 
-    def from_dict(self, data: dict[str, Any]) -> None:
+    def from_dict(self, data: dict[str, Any]) -> None:  # noqa: PLR0915
         """Update the configuration from a dictionary."""
         self.radarr_uri = data.get("radarr_uri", self.radarr_uri)
         self.radarr_api_key = data.get("radarr_api_key", self.radarr_api_key)
@@ -67,11 +138,66 @@ class Config:
         self.sonarr_api_key = data.get("sonarr_api_key", self.sonarr_api_key)
         self.handle_episodes = data.get("handle_episodes", self.handle_episodes)
         self.handle_series = data.get("handle_series", self.handle_series)
+        self.handle_seasons = data.get("handle_seasons", self.handle_seasons)
         self.handle_series_ended_only = data.get(
             "handle_series_ended_only", self.handle_series_ended_only
         )
         self.exclude_series = data.get("exclude_series", self.exclude_series)
         self.remove_media = data.get("remove_media", self.remove_media)
+        self.arr_pool_limit_per_host = data.get(
+            "arr_pool_limit_per_host", self.arr_pool_limit_per_host
+        )
+        self.arr_dns_cache_ttl = data.get("arr_dns_cache_ttl", self.arr_dns_cache_ttl)
+        self.arr_keepalive_timeout = data.get("arr_keepalive_timeout", self.arr_keepalive_timeout)
+        self.arr_connect_timeout = data.get("arr_connect_timeout", self.arr_connect_timeout)
+        self.arr_read_timeout = data.get("arr_read_timeout", self.arr_read_timeout)
+        self.arr_total_timeout = data.get("arr_total_timeout", self.arr_total_timeout)
+        self.arr_max_in_flight = data.get("arr_max_in_flight", self.arr_max_in_flight)
+        self.arr_adaptive_concurrency = data.get(
+            "arr_adaptive_concurrency", self.arr_adaptive_concurrency
+        )
+        self.arr_min_in_flight = data.get("arr_min_in_flight", self.arr_min_in_flight)
+        self.arr_latency_target = data.get("arr_latency_target", self.arr_latency_target)
+        self.arr_retries = data.get("arr_retries", self.arr_retries)
+        self.arr_retry_base_delay = data.get("arr_retry_base_delay", self.arr_retry_base_delay)
+        self.arr_retry_max_delay = data.get("arr_retry_max_delay", self.arr_retry_max_delay)
+        self.arr_breaker_threshold = data.get("arr_breaker_threshold", self.arr_breaker_threshold)
+        self.arr_breaker_reset_timeout = data.get(
+            "arr_breaker_reset_timeout", self.arr_breaker_reset_timeout
+        )
+        self.arr_park_timeout = data.get("arr_park_timeout", self.arr_park_timeout)
+        self.arr_cache_ttl = data.get("arr_cache_ttl", self.arr_cache_ttl)
+        self.arr_cache_negative_ttl = data.get(
+            "arr_cache_negative_ttl", self.arr_cache_negative_ttl
+        )
+        self.arr_cache_size = data.get("arr_cache_size", self.arr_cache_size)
+        self.webhook_queue_enabled = data.get("webhook_queue_enabled", self.webhook_queue_enabled)
+        self.webhook_queue_size = data.get("webhook_queue_size", self.webhook_queue_size)
+        self.webhook_queue_workers = data.get("webhook_queue_workers", self.webhook_queue_workers)
+        self.webhook_retry_after = data.get("webhook_retry_after", self.webhook_retry_after)
+        self.webhook_deadline = data.get("webhook_deadline", self.webhook_deadline)
+        self.allowed_event_types = data.get("allowed_event_types", self.allowed_event_types)
+        self.skip_upgrades = data.get("skip_upgrades", self.skip_upgrades)
+        self.dedupe_window = data.get("dedupe_window", self.dedupe_window)
+        self.dedupe_size = data.get("dedupe_size", self.dedupe_size)
+        self.journal_enabled = data.get("journal_enabled", self.journal_enabled)
+        self.journal_max_attempts = data.get("journal_max_attempts", self.journal_max_attempts)
+        self.journal_retention = data.get("journal_retention", self.journal_retention)
+        self.journal_compact_interval = data.get(
+            "journal_compact_interval", self.journal_compact_interval
+        )
+        self.series_index_max_age = data.get("series_index_max_age", self.series_index_max_age)
+        self.series_index_size = data.get("series_index_size", self.series_index_size)
+        self.episode_batch_window = data.get("episode_batch_window", self.episode_batch_window)
+        self.episode_batch_size = data.get("episode_batch_size", self.episode_batch_size)
+        self.reconcile_interval = data.get("reconcile_interval", self.reconcile_interval)
+        self.reconcile_page_size = data.get("reconcile_page_size", self.reconcile_page_size)
+        self.reconcile_concurrency = data.get("reconcile_concurrency", self.reconcile_concurrency)
+        self.reconcile_max_attempts = data.get(
+            "reconcile_max_attempts", self.reconcile_max_attempts
+        )
+        self.trace_keep = data.get("trace_keep", self.trace_keep)
+        self.trace_export_path = data.get("trace_export_path", self.trace_export_path)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -81,9 +207,52 @@ class Config:
             "sonarr_api_key": self.sonarr_api_key,
             "handle_episodes": self.handle_episodes,
             "handle_series": self.handle_series,
+            "handle_seasons": self.handle_seasons,
             "handle_series_ended_only": self.handle_series_ended_only,
             "exclude_series": self.exclude_series,
             "remove_media": self.remove_media,
+            "arr_pool_limit_per_host": self.arr_pool_limit_per_host,
+            "arr_dns_cache_ttl": self.arr_dns_cache_ttl,
+            "arr_keepalive_timeout": self.arr_keepalive_timeout,
+            "arr_connect_timeout": self.arr_connect_timeout,
+            "arr_read_timeout": self.arr_read_timeout,
+            "arr_total_timeout": self.arr_total_timeout,
+            "arr_max_in_flight": self.arr_max_in_flight,
+            "arr_adaptive_concurrency": self.arr_adaptive_concurrency,
+            "arr_min_in_flight": self.arr_min_in_flight,
+            "arr_latency_target": self.arr_latency_target,
+            "arr_retries": self.arr_retries,
+            "arr_retry_base_delay": self.arr_retry_base_delay,
+            "arr_retry_max_delay": self.arr_retry_max_delay,
+            "arr_breaker_threshold": self.arr_breaker_threshold,
+            "arr_breaker_reset_timeout": self.arr_breaker_reset_timeout,
+            "arr_park_timeout": self.arr_park_timeout,
+            "arr_cache_ttl": self.arr_cache_ttl,
+            "arr_cache_negative_ttl": self.arr_cache_negative_ttl,
+            "arr_cache_size": self.arr_cache_size,
+            "webhook_queue_enabled": self.webhook_queue_enabled,
+            "webhook_queue_size": self.webhook_queue_size,
+            "webhook_queue_workers": self.webhook_queue_workers,
+            "webhook_retry_after": self.webhook_retry_after,
+            "webhook_deadline": self.webhook_deadline,
+            "allowed_event_types": self.allowed_event_types,
+            "skip_upgrades": self.skip_upgrades,
+            "dedupe_window": self.dedupe_window,
+            "dedupe_size": self.dedupe_size,
+            "journal_enabled": self.journal_enabled,
+            "journal_max_attempts": self.journal_max_attempts,
+            "journal_retention": self.journal_retention,
+            "journal_compact_interval": self.journal_compact_interval,
+            "series_index_max_age": self.series_index_max_age,
+            "series_index_size": self.series_index_size,
+            "episode_batch_window": self.episode_batch_window,
+            "episode_batch_size": self.episode_batch_size,
+            "reconcile_interval": self.reconcile_interval,
+            "reconcile_page_size": self.reconcile_page_size,
+            "reconcile_concurrency": self.reconcile_concurrency,
+            "reconcile_max_attempts": self.reconcile_max_attempts,
+            "trace_keep": self.trace_keep,
+            "trace_export_path": self.trace_export_path,
         }
 
 
@@ -100,3 +269,19 @@ class LogConfig:
     }
 
     LOG_LEVEL: int = LOG_LEVEL_MAP.get(_LOG_LEVEL, 20)
+
+    # Log output format: text, or json for one JSON object per line
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()
+
+    # Records waiting to be written by the background logging thread
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+    # What to do when the logging queue is full: drop_new, drop_old or block. block stalls
+    # request handling until the listener catches up.
+    LOG_DROP_POLICY: str = os.getenv("LOG_DROP_POLICY", "drop_new").lower()
+
+    # Log full webhook payloads and model dumps at debug level for 1 in N webhooks
+    LOG_PAYLOAD_SAMPLE_RATE: int = max(1, int(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "1")))
+
+    # Compress rotated log files with gzip
+    LOG_COMPRESS: bool = os.getenv("LOG_COMPRESS", "false").lower() == "true"
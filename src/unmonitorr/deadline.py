@@ -0,0 +1,57 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+__all__ = (
+    "DeadlineExceeded",
+    "deadline",
+    "expired",
+    "remaining",
+)
+
+
+_deadline: ContextVar[float | None] = ContextVar("unmonitorr_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised instead of starting an arr request once the webhook's deadline has passed."""
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """Give the work done in this context a time budget.
+
+    An enclosing deadline that ends sooner is kept, so a nested budget can only shorten
+    the time left.
+
+    Parameters
+    ----------
+    seconds : float | None
+        The budget in seconds. No deadline is set if None or not positive.
+    """
+    if seconds is None or seconds <= 0:
+        yield
+        return
+
+    ends = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(ends if current is None else min(current, ends))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Return the seconds left before the current deadline, or None if there is none."""
+    ends = _deadline.get()
+    if ends is None:
+        return None
+    return max(0.0, ends - time.monotonic())
+
+
+def expired() -> bool:
+    """Return True if the current deadline has passed."""
+    ends = _deadline.get()
+    return ends is not None and time.monotonic() >= ends
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from unmonitorr.types_ import RadarrWebhookPayload, SonarrWebhookPayload
+
+__all__ = (
+    "RecentlySeen",
+    "dedupe_key",
+)
+
+
+def dedupe_key(payload: RadarrWebhookPayload | SonarrWebhookPayload) -> Hashable:
+    """Return a key identifying the work a webhook payload asks for.
+
+    Radarr payloads are keyed by movie and event type, Sonarr payloads by the episodes to
+    unmonitor and event type.
+    """
+    if isinstance(payload, RadarrWebhookPayload):
+        return ("radarr", payload.instance_name, payload.event_type, payload.movie.id)
+
+    episode_ids = tuple(sorted(payload.episode_ids_to_unmonitor()))
+    return ("sonarr", payload.instance_name, payload.event_type, episode_ids)
+
+
+class RecentlySeen:
+    """A bounded index of keys for work that has recently been applied or is in progress.
+
+    Work is marked in progress with :meth:`begin` before it starts, so concurrent
+    duplicates can wait for its result, and is only remembered as applied by :meth:`end`
+    if it succeeded.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of keys kept before the oldest is dropped.
+    window : float
+        Seconds a key is remembered for after it is added.
+    """
+
+    __slots__ = (
+        "_in_flight",
+        "_keys",
+        "maxsize",
+        "suppressed",
+        "window",
+    )
+
+    def __init__(self, maxsize: int = 10000, window: float = 3600.0) -> None:
+        self.maxsize = maxsize
+        self.window = window
+        self._keys: OrderedDict[Hashable, float] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Future[bool]] = {}
+        self.suppressed: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def seen(self, key: Hashable) -> bool:
+        """Return True if `key` was added within the window."""
+        added = self._keys.get(key)
+        if added is None:
+            return False
+
+        if time.monotonic() - added > self.window:
+            del self._keys[key]
+            return False
+        return True
+
+    def add(self, key: Hashable) -> None:
+        """Remember `key` as applied."""
+        self._keys[key] = time.monotonic()
+        self._keys.move_to_end(key)
+
+        while len(self._keys) > self.maxsize:
+            self._keys.popitem(last=False)
+
+    def in_flight(self, key: Hashable) -> asyncio.Future[bool] | None:
+        """Return the future result of the work for `key` if it is in progress."""
+        return self._in_flight.get(key)
+
+    def begin(self, key: Hashable) -> None:
+        """Mark the work for `key` as in progress."""
+        self._in_flight[key] = asyncio.get_running_loop().create_future()
+
+    def end(self, key: Hashable, *, success: bool) -> None:
+        """Finish the work for `key`, remembering it as applied if it succeeded."""
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(success)
+        if success:
+            self.add(key)
+
+    def suppress(self, event_type: str) -> None:
+        """Count a payload of `event_type` that was skipped as a duplicate."""
+        self.suppressed[event_type] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return the index size, work in progress and suppressed payloads per event type."""
+        return {
+            "size": len(self._keys),
+            "maxsize": self.maxsize,
+            "in_flight": len(self._in_flight),
+            "suppressed": dict(self.suppressed),
+        }
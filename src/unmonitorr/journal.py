@@ -0,0 +1,235 @@
+import asyncio
+import sqlite3
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from unmonitorr import log
+
+__all__ = ("Journal",)
+
+logger = log.get_logger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, updated);
+"""
+
+INSERT_JOB = "INSERT INTO jobs (kind, payload, created, updated) VALUES (?, ?, ?, ?)"
+COMPLETE_JOB = "UPDATE jobs SET status = 'done', updated = ? WHERE id = ?"
+FAIL_JOB = """
+UPDATE jobs
+SET attempts = attempts + 1,
+    status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END,
+    updated = ?
+WHERE id = ?
+"""
+DELETE_JOB = "DELETE FROM jobs WHERE id = ?"
+SELECT_PENDING = "SELECT id, kind, payload FROM jobs WHERE status = 'pending' ORDER BY id"
+DELETE_FINISHED = "DELETE FROM jobs WHERE status != 'pending' AND updated < ?"
+
+
+class Journal:
+    """A durable SQLite journal of accepted webhook work.
+
+    Jobs are appended before a webhook is acknowledged and marked done once the arr
+    requests for it succeed, so pending jobs can be replayed after a restart. Writes
+    made while a commit is in progress are grouped into the next commit, and every
+    database call runs on a single background thread.
+
+    Parameters
+    ----------
+    path : str
+        Path to the SQLite database file.
+    max_attempts : int
+        Number of failed attempts after which a job is no longer replayed.
+    retention : float
+        Seconds finished jobs are kept before compaction removes them.
+    compact_interval : float
+        Seconds between compaction runs.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_attempts: int = 5,
+        retention: float = 86400.0,
+        compact_interval: float = 300.0,
+    ) -> None:
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retention = retention
+        self.compact_interval = compact_interval
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal")
+        self._conn: sqlite3.Connection | None = None
+        self._writes: list[tuple[str, tuple[Any, ...], asyncio.Future[int]]] = []
+        self._committing: asyncio.Future[list[int]] | None = None
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+        self.appended: int = 0
+        self.commits: int = 0
+        self.committed_writes: int = 0
+        self.compacted: int = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Return the open database connection."""
+        if self._conn is None:
+            raise RuntimeError("Journal is not open.")
+        return self._conn
+
+    def _run[T](self, fn: Callable[..., T], *args: Any) -> asyncio.Future[T]:  # noqa: ANN401
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def open(self) -> None:
+        """Open the database and start the commit and compaction tasks."""
+        self._conn = await self._run(self._connect)
+        self._tasks = [
+            asyncio.create_task(self._commit_loop(), name="journal-commit"),
+            asyncio.create_task(self._compact_loop(), name="journal-compact"),
+        ]
+        logger.info("Opened webhook journal: %s", self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    async def close(self) -> None:
+        """Commit outstanding writes, stop the background tasks and close the database."""
+        if self._conn is None:
+            return
+
+        outstanding: list[asyncio.Future[Any]] = [future for *_, future in self._writes]
+        if self._committing is not None:
+            outstanding.append(self._committing)
+        await asyncio.gather(*outstanding, return_exceptions=True)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        conn, self._conn = self._conn, None
+        await self._run(conn.close)
+        self._executor.shutdown(wait=True)
+        logger.info("Closed webhook journal.")
+
+    async def append(self, kind: str, payload: str) -> int:
+        """Durably record a job and return its ID.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of payload, either "radarr" or "sonarr".
+        payload : str
+            The JSON encoded webhook payload.
+        """
+        now = time.time()
+        job_id = await self._write(INSERT_JOB, (kind, payload, now, now))
+        self.appended += 1
+        return job_id
+
+    async def finish(self, job_id: int, *, success: bool) -> None:
+        """Mark a job done, or record a failed attempt so it is replayed later."""
+        if success:
+            await self._write(COMPLETE_JOB, (time.time(), job_id))
+        else:
+            await self._write(FAIL_JOB, (self.max_attempts, time.time(), job_id))
+
+    async def discard(self, job_id: int) -> None:
+        """Remove a job that was recorded but never accepted."""
+        await self._write(DELETE_JOB, (job_id,))
+
+    async def pending(self) -> list[tuple[int, str, str]]:
+        """Return the `(id, kind, payload)` of every job that has not finished."""
+        return await self._run(self._select_pending)
+
+    def _select_pending(self) -> list[tuple[int, str, str]]:
+        return self.conn.execute(SELECT_PENDING).fetchall()
+
+    async def _write(self, sql: str, params: tuple[Any, ...]) -> int:
+        if self._conn is None:
+            raise RuntimeError("Journal is not open.")
+
+        future: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        self._writes.append((sql, params, future))
+        self._wakeup.set()
+        return await future
+
+    async def _commit_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            writes, self._writes = self._writes, []
+            if not writes:
+                continue
+
+            self._committing = self._run(self._commit, [(sql, p) for sql, p, _ in writes])
+            try:
+                row_ids = await self._committing
+            except sqlite3.Error as e:
+                logger.exception("Failed to commit %s journal writes.", len(writes))
+                for *_, future in writes:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                self._committing = None
+
+            self.commits += 1
+            self.committed_writes += len(writes)
+            for (*_, future), row_id in zip(writes, row_ids, strict=True):
+                if not future.done():
+                    future.set_result(row_id)
+
+    def _commit(self, writes: list[tuple[str, tuple[Any, ...]]]) -> list[int]:
+        with self.conn:
+            return [self.conn.execute(sql, params).lastrowid or 0 for sql, params in writes]
+
+    async def _compact_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                removed = await self._run(self._compact, time.time() - self.retention)
+            except sqlite3.Error:
+                logger.exception("Failed to compact the webhook journal.")
+                continue
+
+            self.compacted += removed
+            if removed:
+                logger.debug("Compacted %s finished jobs from the webhook journal.", removed)
+
+    def _compact(self, before: float) -> int:
+        with self.conn:
+            removed = self.conn.execute(DELETE_FINISHED, (before,)).rowcount
+        self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        """Return append, group commit and compaction statistics."""
+        return {
+            "appended": self.appended,
+            "commits": self.commits,
+            "avg_writes_per_commit": (
+                self.committed_writes / self.commits if self.commits else 0.0
+            ),
+            "queued_writes": len(self._writes),
+            "compacted": self.compacted,
+        }
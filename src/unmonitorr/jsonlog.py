@@ -0,0 +1,91 @@
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from pydantic_core import to_json
+
+__all__ = (
+    "JsonFormatter",
+    "bind",
+    "install_log_record_factory",
+)
+
+
+_bound: ContextVar[dict[str, object] | None] = ContextVar("unmonitorr_log_fields", default=None)
+
+
+@contextmanager
+def bind(**fields: object) -> Iterator[None]:
+    """Attach fields to every record logged in this context.
+
+    Parameters
+    ----------
+    **fields : object
+        Values for any of the context fields, such as ``instance_name`` or ``series_id``.
+    """
+    current = _bound.get()
+    token = _bound.set({**current, **fields} if current else fields)
+    try:
+        yield
+    finally:
+        _bound.reset(token)
+
+
+def install_log_record_factory() -> None:
+    """Copy the bound context fields onto every log record."""
+    factory = logging.getLogRecordFactory()
+
+    def record_factory(*args: object, **kwargs: object) -> logging.LogRecord:
+        record = factory(*args, **kwargs)
+        if fields := _bound.get():
+            record.__dict__.update(fields)
+        return record
+
+    logging.setLogRecordFactory(record_factory)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects with a fixed key order.
+
+    Every line has the keys ``timestamp``, ``level``, ``module``, ``message``,
+    ``trace_id``, ``instance_name``, ``series_id``, ``movie_id`` and ``duration``, with
+    ``null`` for values that are not set. ``exception`` is appended when the record
+    carries one.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._second: int = -1
+        self._second_prefix: str = ""
+
+    def _timestamp(self, created: float) -> str:
+        # strftime is the costly part, so it is only done once per second
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._second_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._second_prefix}.{int((created - second) * 1000):03d}Z"
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = record.__dict__
+        # every entry has the same keys, in the same order, whether or not they are set
+        entry = {
+            "timestamp": self._timestamp(record.created),
+            "level": record.levelname,
+            "module": record.module,
+            "message": record.getMessage(),
+            "trace_id": fields.get("trace_id"),
+            "instance_name": fields.get("instance_name"),
+            "series_id": fields.get("series_id"),
+            "movie_id": fields.get("movie_id"),
+            "duration": fields.get("duration"),
+        }
+        if entry["trace_id"] == "-":
+            entry["trace_id"] = None
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return to_json(entry, fallback=str).decode()
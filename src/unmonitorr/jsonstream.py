@@ -0,0 +1,130 @@
+import codecs
+import json
+import re
+from typing import Any, Final
+
+__all__ = ("JsonArrayParser",)
+
+
+_WHITESPACE: Final = re.compile(r"[ \t\r\n]*")
+
+# what the parser expects next
+_START: Final[int] = 0
+_FIRST: Final[int] = 1
+_ELEMENT: Final[int] = 2
+_SEPARATOR: Final[int] = 3
+_DONE: Final[int] = 4
+
+
+class JsonArrayParser:
+    """Parses a JSON array arriving in chunks one element at a time.
+
+    Each element is decoded as soon as it is complete, so only the unfinished element
+    is buffered instead of the whole array and the object tree built from it.
+
+    Examples
+    --------
+    >>> parser = JsonArrayParser()
+    >>> parser.feed(b'[{"id": 1}, {"id"')
+    [{'id': 1}]
+    >>> parser.feed(b": 2}]")
+    [{'id': 2}]
+    >>> parser.close()
+    []
+    """
+
+    __slots__ = (
+        "_decoder",
+        "_json",
+        "_pos",
+        "_state",
+        "_text",
+        "count",
+    )
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._text: str = ""
+        self._pos: int = 0
+        self._state: int = _START
+        self.count: int = 0
+
+    @property
+    def done(self) -> bool:
+        """Return True once the end of the array has been parsed."""
+        return self._state == _DONE
+
+    def feed(self, data: bytes) -> list[Any]:
+        """Add the next chunk of the array, returning the elements it completed.
+
+        Raises
+        ------
+        ValueError
+            If the data is not a JSON array.
+        """
+        return self._parse(self._decoder.decode(data), final=False)
+
+    def close(self) -> list[Any]:
+        """Finish parsing, returning any element that ended with the data.
+
+        Raises
+        ------
+        ValueError
+            If the array is incomplete.
+        """
+        elements = self._parse(self._decoder.decode(b"", final=True), final=True)
+        if not self.done:
+            raise ValueError("The JSON array ended unexpectedly.")
+        return elements
+
+    def _parse(self, text: str, *, final: bool) -> list[Any]:
+        self._text = self._text[self._pos :] + text
+        self._pos = 0
+        elements: list[Any] = []
+
+        while True:
+            pos = _WHITESPACE.match(self._text, self._pos).end()  # type: ignore[union-attr]
+            if pos == len(self._text):
+                self._pos = pos
+                break
+
+            char = self._text[pos]
+            if self._state == _DONE:
+                raise ValueError("Unexpected data after the end of the JSON array.")
+
+            if self._state == _START:
+                if char != "[":
+                    raise ValueError("Expected a JSON array.")
+                self._state = _FIRST
+                self._pos = pos + 1
+            elif self._state == _SEPARATOR or (self._state == _FIRST and char == "]"):
+                if char not in ",]":
+                    msg = f"Expected ',' or ']' at {char!r}."
+                    raise ValueError(msg)
+                self._state = _ELEMENT if char == "," else _DONE
+                self._pos = pos + 1
+            elif not self._parse_element(pos, elements, final=final):
+                break
+
+        return elements
+
+    def _parse_element(self, pos: int, elements: list[Any], *, final: bool) -> bool:
+        """Decode the element at `pos`, returning False if more data is needed."""
+        try:
+            element, end = self._json.raw_decode(self._text, pos)
+        except json.JSONDecodeError as e:
+            if final:
+                msg = f"Invalid element in the JSON array: {e}"
+                raise ValueError(msg) from None
+            return False
+
+        # a number or literal at the end of the data may continue in the next chunk
+        if end == len(self._text) and not final:
+            return False
+
+        elements.append(element)
+        self.count += 1
+        self._state = _SEPARATOR
+        self._pos = end
+        return True
@@ -1,17 +1,117 @@
+import atexit
+import copy
+import gzip
 import logging
 import logging.handlers
+import os
+import queue
+import random
+import shutil
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
 
 import coloredlogs  # type: ignore
 
+from unmonitorr import jsonlog
 from unmonitorr.config import LogConfig
-
-__all__ = ("get_logger",)
+from unmonitorr.tracing import install_log_record_factory
+
+__all__ = (
+    "dropped_records",
+    "get_logger",
+    "payload_sampled",
+    "payload_sampling",
+    "sampled",
+)
 
 # setup logging format
 format_string: str = "%(asctime)s | %(module)s | %(levelname)s | %(message)s"
 formatter: logging.Formatter = logging.Formatter(format_string)
 
+# log records carry the ID of the webhook trace they were logged under
+install_log_record_factory()
+file_format_string: str = (
+    "%(asctime)s | %(module)s | %(levelname)s | trace=%(trace_id)s | %(message)s"
+)
+file_formatter: logging.Formatter = logging.Formatter(file_format_string)
+
+if LogConfig.LOG_FORMAT == "json":
+    jsonlog.install_log_record_factory()
+    formatter = file_formatter = jsonlog.JsonFormatter()
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """A queue handler that applies a drop policy when its bounded queue is full.
+
+    Parameters
+    ----------
+    queue : queue.Queue[logging.LogRecord]
+        The bounded queue shared with the listener.
+    policy : str
+        ``drop_new`` discards the incoming record, ``drop_old`` discards the oldest queued
+        record to make room, and ``block`` waits for room. Records are logged on the event
+        loop, so ``block`` stalls all request handling while the queue is full.
+
+    Raises
+    ------
+    ValueError
+        If `policy` is not one of the supported policies.
+    """
+
+    POLICIES: tuple[str, ...] = ("block", "drop_new", "drop_old")
+
+    _exception_formatter = logging.Formatter()
+
+    def __init__(self, queue: "queue.Queue[logging.LogRecord]", policy: str = "drop_new") -> None:
+        if policy not in self.POLICIES:
+            msg = f"Unknown drop policy {policy!r}, expected one of {', '.join(self.POLICIES)}"
+            raise ValueError(msg)
+        super().__init__(queue)
+        self.policy = policy
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # message args and tracebacks can refer to objects the event loop keeps changing,
+        # so they are rendered here, as logged, rather than later on the listener thread.
+        # The traceback is kept apart from the message for the JSON formatter.
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.policy != "drop_old":
+                return
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
 # set stdout logger to INFO
 logger: logging.Logger = logging.getLogger()
 logger.setLevel(LogConfig.LOG_LEVEL)
@@ -32,9 +132,12 @@ log_file.parent.mkdir(exist_ok=True)
 file_handler = logging.handlers.TimedRotatingFileHandler(
     log_file, "midnight", utc=True, backupCount=10, encoding="utf-8"
 )
+if LogConfig.LOG_COMPRESS:
+    file_handler.namer = _gzip_namer
+    file_handler.rotator = _gzip_rotator
 
 file_handler.setLevel(LogConfig.LOG_LEVEL)
-file_handler.setFormatter(formatter)
+file_handler.setFormatter(file_formatter)
 logger.addHandler(file_handler)
 
 coloredlogs.DEFAULT_LEVEL_STYLES = {
@@ -48,7 +151,90 @@ logging.getLogger("aiohttp").setLevel(logging.WARNING)
 
 
 # Apply coloredlogs to the stdout handler
-coloredlogs.install(level=LogConfig.LOG_LEVEL, logger=logger, stream=stdout_handler.stream)  # type: ignore
+if LogConfig.LOG_FORMAT != "json":
+    coloredlogs.install(level=LogConfig.LOG_LEVEL, logger=logger, stream=stdout_handler.stream)  # type: ignore
+
+# Move the configured handlers behind a bounded queue, so output formatting, file writes
+# and rollover happen on the listener's thread instead of the event loop.
+output_handlers = list(logger.handlers)
+for handler in output_handlers:
+    logger.removeHandler(handler)
+
+# an unknown policy falls back to the default, and is reported once the queue is set up
+drop_policy: str = LogConfig.LOG_DROP_POLICY
+if drop_policy not in DroppingQueueHandler.POLICIES:
+    drop_policy = "drop_new"
+
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(LogConfig.LOG_QUEUE_SIZE)
+queue_handler = DroppingQueueHandler(log_queue, drop_policy)
+logger.addHandler(queue_handler)
+
+listener = logging.handlers.QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+listener.start()
+# flushes queued records before logging's own shutdown closes the handlers
+atexit.register(listener.stop)
+
+if drop_policy != LogConfig.LOG_DROP_POLICY:
+    logging.getLogger(__name__).warning(
+        "Unknown LOG_DROP_POLICY %r, expected one of %s -- Using %s.",
+        LogConfig.LOG_DROP_POLICY,
+        ", ".join(DroppingQueueHandler.POLICIES),
+        drop_policy,
+    )
+
+
+NOT_SAMPLED = "<not sampled>"
+
+_payload_sampled: ContextVar[bool | None] = ContextVar("unmonitorr_payload_sampled", default=None)
+
+
+@contextmanager
+def payload_sampling() -> Iterator[bool]:
+    """Decide whether payloads handled in this context are logged in full.
+
+    On average 1 in ``LOG_PAYLOAD_SAMPLE_RATE`` webhooks is sampled. A decision already
+    made by an enclosing context is kept, so a webhook handled inline with its request
+    is sampled once.
+    """
+    decided = _payload_sampled.get()
+    if decided is not None:
+        yield decided
+        return
+
+    rate = LogConfig.LOG_PAYLOAD_SAMPLE_RATE
+    token = _payload_sampled.set(rate == 1 or random.random() < 1 / rate)
+    try:
+        yield bool(_payload_sampled.get())
+    finally:
+        _payload_sampled.reset(token)
+
+
+def payload_sampled() -> bool:
+    """Return True if full payloads should be logged for the current webhook."""
+    return _payload_sampled.get() is not False
+
+
+def sampled(func: Callable[..., object], *args: object) -> str:
+    """Return a payload or model dump for a debug log, if the webhook is sampled.
+
+    The value is rendered immediately, on the event loop, so it shows the object as it
+    was when logged. Nothing is rendered unless debug logging is enabled.
+
+    Parameters
+    ----------
+    func : Callable[..., object]
+        Called with `args` to produce the value to log.
+    *args : object
+        Arguments passed to `func`.
+    """
+    if not payload_sampled() or not logger.isEnabledFor(logging.DEBUG):
+        return NOT_SAMPLED
+    return str(func(*args))
+
+
+def dropped_records() -> int:
+    """Return the number of log records dropped because the logging queue was full."""
+    return queue_handler.dropped
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -0,0 +1,353 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from typing import Final
+
+__all__ = (
+    "ARR_CACHE_ENTRIES",
+    "ARR_CACHE_LOOKUPS",
+    "ARR_CIRCUIT_REJECTED",
+    "ARR_CIRCUIT_STATE",
+    "ARR_CONCURRENCY_LIMIT",
+    "ARR_CONNECTIONS",
+    "ARR_REQUEST_DURATION",
+    "ARR_REQUEST_ERRORS",
+    "ARR_REQUEST_RETRIES",
+    "ARR_REQUEST_TIMEOUTS",
+    "ARR_THROTTLED_WAIT",
+    "EVENT_TYPES",
+    "HTTP_REQUEST_DURATION",
+    "LOG_RECORDS_DROPPED",
+    "QUEUE_DEPTH",
+    "RECONCILE_IMPORTS",
+    "RECONCILE_LAG",
+    "REGISTRY",
+    "WEBHOOKS_RECEIVED",
+    "WEBHOOK_DEADLINES_EXCEEDED",
+    "WEBHOOK_PROCESSING_DURATION",
+    "WEBHOOK_QUEUE_WAIT",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "event_type_label",
+)
+
+
+DEFAULT_BUCKETS: Final[tuple[float, ...]] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# the event types Radarr and Sonarr send, used as label values so the number of series
+# stays bounded whatever a payload claims its event type is
+EVENT_TYPES: Final[frozenset[str]] = frozenset(
+    {
+        "ApplicationUpdate",
+        "Download",
+        "EpisodeFileDelete",
+        "Grab",
+        "Health",
+        "HealthRestored",
+        "ManualInteractionRequired",
+        "MovieAdded",
+        "MovieDelete",
+        "MovieFileDelete",
+        "Rename",
+        "SeriesAdd",
+        "SeriesDelete",
+        "Test",
+    }
+)
+
+
+def event_type_label(event_type: str) -> str:
+    """Return `event_type` if it is a known event type, otherwise "other"."""
+    return event_type if event_type in EVENT_TYPES else "other"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind: str = "untyped"
+
+    __slots__ = (
+        "help",
+        "labelnames",
+        "name",
+    )
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+    @abstractmethod
+    def render(self) -> Iterator[str]:
+        """Yield the lines of the metric in the Prometheus text exposition format."""
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, optionally split by labels."""
+
+    kind = "counter"
+
+    __slots__ = ("_values",)
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Increase the count for `labels` by `amount`."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the count for `labels`, for mirroring a count kept elsewhere."""
+        self._values[labels] = value
+
+    def value(self, *labels: str) -> float:
+        """Return the count for `labels`."""
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> Iterator[str]:
+        yield from self.header()
+        for labels, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """A value that can go up and down, optionally split by labels."""
+
+    kind = "gauge"
+
+    __slots__ = ()
+
+
+class Histogram(_Metric):
+    """Counts observations into cumulative buckets, optionally split by labels."""
+
+    kind = "histogram"
+
+    __slots__ = (
+        "_series",
+        "buckets",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record an observation of `value` for `labels`."""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+
+        counts, total = series
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def count(self, *labels: str) -> int:
+        """Return the number of observations for `labels`."""
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> Iterator[str]:
+        yield from self.header()
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield (
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total[0]!r}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Registry:
+    """A collection of metrics rendered together in the Prometheus text format.
+
+    Metrics are only updated from the event loop, so no locking is needed.
+    """
+
+    __slots__ = ("_metrics",)
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register[M: _Metric](self, metric: M) -> M:
+        """Add `metric` to the registry and return it."""
+        if metric.name in self._metrics:
+            msg = f"Metric already registered: {metric.name}"
+            raise ValueError(msg)
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        """Return every registered metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        lines.append("")
+        return "\n".join(lines)
+
+
+REGISTRY: Final[Registry] = Registry()
+
+WEBHOOKS_RECEIVED: Final[Counter] = REGISTRY.counter(
+    "unmonitorr_webhooks_received_total",
+    "Webhook requests received, by route, event type and whether they were accepted, "
+    "rejected by the event filters or invalid.",
+    ("route", "event_type", "result"),
+)
+HTTP_REQUEST_DURATION: Final[Histogram] = REGISTRY.histogram(
+    "unmonitorr_http_request_duration_seconds",
+    "Time taken to answer an HTTP request, by route and status code.",
+    ("route", "status"),
+)
+WEBHOOK_PROCESSING_DURATION: Final[Histogram] = REGISTRY.histogram(
+    "unmonitorr_webhook_processing_duration_seconds",
+    "Time taken to handle a webhook payload end to end, by kind and result.",
+    ("kind", "result"),
+)
+WEBHOOK_QUEUE_WAIT: Final[Histogram] = REGISTRY.histogram(
+    "unmonitorr_webhook_queue_wait_seconds",
+    "Time queued webhooks waited for a worker.",
+)
+ARR_REQUEST_DURATION: Final[Histogram] = REGISTRY.histogram(
+    "unmonitorr_arr_request_duration_seconds",
+    "Latency of requests to Radarr and Sonarr, by client, HTTP method and status code.",
+    ("client", "method", "status"),
+)
+ARR_REQUEST_ERRORS: Final[Counter] = REGISTRY.counter(
+    "unmonitorr_arr_request_errors_total",
+    "Failed requests to Radarr and Sonarr, by client, HTTP method and status code.",
+    ("client", "method", "status"),
+)
+
+QUEUE_DEPTH: Final[Gauge] = REGISTRY.gauge(
+    "unmonitorr_webhook_queue_depth",
+    "Webhooks accepted but not yet picked up by a worker.",
+)
+ARR_CONNECTIONS: Final[Gauge] = REGISTRY.gauge(
+    "unmonitorr_arr_connections",
+    "Pooled connections to Radarr and Sonarr, by client and state.",
+    ("client", "state"),
+)
+ARR_CACHE_ENTRIES: Final[Gauge] = REGISTRY.gauge(
+    "unmonitorr_arr_cache_entries",
+    "Entries held in the lookup cache, by client.",
+    ("client",),
+)
+ARR_CACHE_LOOKUPS: Final[Counter] = REGISTRY.counter(
+    "unmonitorr_arr_cache_lookups_total",
+    "Lookup cache reads, by client and result.",
+    ("client", "result"),
+)
+LOG_RECORDS_DROPPED: Final[Counter] = REGISTRY.counter(
+    "unmonitorr_log_records_dropped_total",
+    "Log records dropped because the logging queue was full.",
+)
+ARR_CONCURRENCY_LIMIT: Final[Gauge] = REGISTRY.gauge(
+    "unmonitorr_arr_concurrency_limit",
+    "Current limit on requests in flight to Radarr and Sonarr, by client.",
+    ("client",),
+)
+ARR_THROTTLED_WAIT: Final[Counter] = REGISTRY.counter(
+    "unmonitorr_arr_throttled_wait_seconds_total",
+    "Time requests to Radarr and Sonarr spent waiting for the concurrency limit, by client.",
+    ("client",),
+)
+ARR_REQUEST_RETRIES: Final[Counter] = REGISTRY.counter(
+    "unmonitorr_arr_request_retries_total",
+    "Requests to Radarr and Sonarr retried after a failure, by client and method.",
+    ("client", "method"),
+)
+ARR_CIRCUIT_STATE: Final[Gauge] = REGISTRY.gauge(
+    "unmonitorr_arr_circuit_state",
+    "Circuit breaker state toward Radarr and Sonarr, by client: 0 closed, 1 half-open, 2 open.",
+    ("client",),
+)
+ARR_CIRCUIT_REJECTED: Final[Counter] = REGISTRY.counter(
+    "unmonitorr_arr_circuit_rejected_total",
+    "Requests to Radarr and Sonarr failed fast by an open circuit breaker, by client.",
+    ("client",),
+)
+ARR_REQUEST_TIMEOUTS: Final[Counter] = REGISTRY.counter(
+    "unmonitorr_arr_request_timeouts_total",
+    "Requests to Radarr and Sonarr that timed out, by client and method.",
+    ("client", "method"),
+)
+WEBHOOK_DEADLINES_EXCEEDED: Final[Counter] = REGISTRY.counter(
+    "unmonitorr_webhook_deadlines_exceeded_total",
+    "Webhook handling cut short because the webhook's deadline passed, by skipped step.",
+    ("step",),
+)
+RECONCILE_IMPORTS: Final[Counter] = REGISTRY.counter(
+    "unmonitorr_reconcile_imports_total",
+    "Payloads rebuilt from Radarr and Sonarr import history and handled, by client and result.",
+    ("client", "result"),
+)
+RECONCILE_LAG: Final[Gauge] = REGISTRY.gauge(
+    "unmonitorr_reconcile_lag_seconds",
+    "Seconds since the last completed reconciliation pass, by client.",
+    ("client",),
+)
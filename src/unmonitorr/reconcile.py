@@ -0,0 +1,343 @@
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any, Final
+
+import aiohttp
+
+from unmonitorr import log
+from unmonitorr.arrs import CircuitOpenError, HTTPException, RadarrClient, SonarrClient
+from unmonitorr.config import Config
+from unmonitorr.metrics import RECONCILE_IMPORTS
+from unmonitorr.types_ import (
+    RadarrHistoryRecord,
+    RadarrWebhookPayload,
+    SonarrHistoryRecord,
+    SonarrWebhookPayload,
+    WebhookEpisode,
+    WebhookMovie,
+    WebhookSeries,
+)
+
+__all__ = ("Reconciler",)
+
+logger = log.get_logger(__name__)
+
+
+# payloads rebuilt from history are handled like the webhook sent after an import
+EVENT_TYPE: Final[str] = "Download"
+INSTANCE_NAME: Final[str] = "reconciler"
+
+type Payload = RadarrWebhookPayload | SonarrWebhookPayload
+type HistoryRecord = RadarrHistoryRecord | SonarrHistoryRecord
+
+# fetches a page of import history, and rebuilds payloads from records with the IDs of
+# the records each payload covers
+type HistoryReader = Callable[[int, int], Awaitable[list[Any]]]
+type PayloadBuilder = Callable[[list[Any]], list[tuple[Payload, list[int]]]]
+
+
+class Reconciler:
+    """Periodically handles imports that no webhook was received for.
+
+    Each pass reads the import history of Radarr and Sonarr, newest first, back to the
+    newest record seen by the previous pass. The new imports are rebuilt as webhook
+    payloads and handled like webhooks, so a pass costs requests in proportion to the
+    imports since the last one rather than to the size of the library.
+
+    The newest record seen in each arr, the high-water mark, is saved to `path` so a
+    restart resumes where the last pass stopped. The first pass only records the newest
+    import, and the library sweep covers anything imported before that.
+
+    Parameters
+    ----------
+    config : Config
+        The handling rules to apply.
+    radarr : RadarrClient
+        The client for Radarr.
+    sonarr : SonarrClient
+        The client for Sonarr.
+    handle : Callable[[Payload], Awaitable[bool]]
+        Coroutine function called with each rebuilt payload, returning whether it was
+        handled successfully.
+    path : str
+        Path to the JSON file the high-water marks are saved to.
+    interval : float
+        Seconds between passes.
+    page_size : int
+        Number of history records fetched by each request.
+    concurrency : int
+        Maximum number of payloads handled at once.
+    max_attempts : int
+        Failed attempts after which the records of a payload are no longer retried, and
+        the high-water mark moves past them.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        radarr: RadarrClient,
+        sonarr: SonarrClient,
+        handle: Callable[[Payload], Awaitable[bool]],
+        *,
+        path: str,
+        interval: float = 900.0,
+        page_size: int = 250,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+    ) -> None:
+        self.config = config
+        self.radarr = radarr
+        self.sonarr = sonarr
+        self.handle = handle
+        self.path = path
+        self.interval = interval
+        self.page_size = max(1, page_size)
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+
+        # the high-water mark, time of the last completed pass and failed attempts of the
+        # records retried next pass, by arr
+        self.state: dict[str, dict[str, Any]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+        self.runs: int = 0
+        self.handled: Counter[str] = Counter()
+        self.failed: Counter[str] = Counter()
+
+    def load(self) -> None:
+        """Load the saved high-water marks."""
+        try:
+            with open(self.path) as fp:
+                self.state = json.load(fp)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.state = {}
+
+    def save(self) -> None:
+        """Save the high-water marks, replacing the previous file in one step."""
+        with open(f"{self.path}.tmp", "w") as fp:
+            json.dump(self.state, fp, indent=4)
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def start(self) -> None:
+        """Load the saved high-water marks and start reconciling in the background."""
+        self.load()
+        self._task = asyncio.create_task(self._run_loop(), name="reconciler")
+        logger.info("Started reconciling imports every %ss.", self.interval)
+
+    async def stop(self) -> None:
+        """Stop reconciling, abandoning a pass in progress."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                # a pass that fails unexpectedly is tried again, rather than ending the loop
+                logger.exception("Unhandled error reconciling imports -- Retrying next pass.")
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self) -> None:
+        """Handle the imports recorded by each configured arr since the previous pass."""
+        if not self.radarr.disabled:
+            await self._reconcile("radarr", self.radarr.get_import_history, self._movie_payloads)
+        if not self.sonarr.disabled:
+            await self._reconcile("sonarr", self.sonarr.get_import_history, self._series_payloads)
+        self.runs += 1
+        self.save()
+
+    async def _reconcile(self, name: str, fetch: HistoryReader, build: PayloadBuilder) -> None:
+        state = self.state.get(name, {})
+        mark: int | None = state.get("mark")
+        # JSON object keys are strings, so the attempts are keyed by the record ID as one
+        attempts: dict[str, int] = state.get("attempts", {})
+        try:
+            records = await self._new_records(fetch, mark)
+        except (HTTPException, aiohttp.ClientError, TimeoutError, CircuitOpenError) as e:
+            logger.warning(
+                "Failed to read the %s import history -- Retrying next pass: %r", name, e
+            )
+            return
+
+        if mark is None:
+            mark = records[0].id if records else 0
+            logger.info("Reconciling %s imports after history record %s.", name, mark)
+        elif records:
+            mark = await self._handle_records(name, records, build, attempts)
+        else:
+            logger.debug("No new %s imports to reconcile.", name)
+
+        self.state[name] = {"mark": mark, "last_run": time.time(), "attempts": attempts}
+
+    async def _new_records(self, fetch: HistoryReader, mark: int | None) -> list[HistoryRecord]:
+        """Return the records newer than `mark`, or only the newest record if there is none."""
+        if mark is None:
+            return await fetch(1, 1)
+
+        records: list[HistoryRecord] = []
+        page = 1
+        while True:
+            fetched = await fetch(page, self.page_size)
+            new = [record for record in fetched if record.id > mark]
+            records.extend(new)
+            if not fetched or len(new) < len(fetched):
+                return records
+            page += 1
+
+    async def _handle_records(
+        self,
+        name: str,
+        records: list[HistoryRecord],
+        build: PayloadBuilder,
+        attempts: dict[str, int],
+    ) -> int:
+        """Handle the payloads rebuilt from `records`, returning the new high-water mark.
+
+        The mark stops short of the oldest record whose payload failed, so it is handled
+        again by the next pass, until it has failed `max_attempts` times. `attempts` is
+        updated with the failed attempts of the records that are retried.
+        """
+        payloads = build(records)
+        logger.info("Reconciling %s %s imports as %s payloads.", len(records), name, len(payloads))
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def handle(payload: Payload) -> bool:
+            async with semaphore:
+                return await self.handle(payload)
+
+        results = await asyncio.gather(
+            *(handle(payload) for payload, _ in payloads), return_exceptions=True
+        )
+
+        failed: list[int] = []
+        for (payload, ids), result in zip(payloads, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error("Failed to reconcile %r", payload, exc_info=result)
+            if result is not True:
+                failed.append(min(ids))
+        self.handled[name] += len(payloads) - len(failed)
+        self.failed[name] += len(failed)
+        RECONCILE_IMPORTS.inc(name, "success", amount=len(payloads) - len(failed))
+        RECONCILE_IMPORTS.inc(name, "failure", amount=len(failed))
+
+        retrying = self._count_attempts(name, failed, attempts)
+        if retrying:
+            logger.warning(
+                "Failed to reconcile %s %s payloads -- Retrying them next pass.",
+                len(retrying),
+                name,
+            )
+            return min(retrying) - 1
+        return max(record.id for record in records)
+
+    def _count_attempts(self, name: str, failed: list[int], attempts: dict[str, int]) -> list[int]:
+        """Count a failed attempt for each record in `failed`, returning those to retry.
+
+        Only the records retried next pass are kept in `attempts`.
+        """
+        previous = attempts.copy()
+        attempts.clear()
+        retrying: list[int] = []
+        for id in failed:
+            count = previous.get(str(id), 0) + 1
+            if count < self.max_attempts:
+                attempts[str(id)] = count
+                retrying.append(id)
+            else:
+                logger.error(
+                    "Failed to reconcile %s history record %s %s times -- Giving up.",
+                    name,
+                    id,
+                    count,
+                )
+        return retrying
+
+    def _movie_payloads(
+        self, records: list[RadarrHistoryRecord]
+    ) -> list[tuple[Payload, list[int]]]:
+        """Rebuild a download payload for each imported movie that still needs handling."""
+        movies: dict[int, WebhookMovie] = {}
+        record_ids: dict[int, list[int]] = {}
+        for record in records:
+            movie = record.movie
+            # deleted movies, and movies already unmonitored, need no handling
+            if movie is None or not (movie.monitored or self.config.remove_media):
+                continue
+            movies[movie.id] = WebhookMovie(
+                id=movie.id, title=movie.title, year=movie.year, folder_path=movie.path
+            )
+            record_ids.setdefault(movie.id, []).append(record.id)
+
+        return [
+            (
+                RadarrWebhookPayload(
+                    movie=movie,
+                    event_type=EVENT_TYPE,
+                    instance_name=INSTANCE_NAME,
+                    application_url=self.radarr.uri,
+                ),
+                record_ids[id],
+            )
+            for id, movie in movies.items()
+        ]
+
+    def _series_payloads(
+        self, records: list[SonarrHistoryRecord]
+    ) -> list[tuple[Payload, list[int]]]:
+        """Rebuild a download payload with the imported episodes of each series."""
+        series: dict[int, WebhookSeries] = {}
+        episodes: dict[int, dict[int, WebhookEpisode]] = {}
+        record_ids: dict[int, list[int]] = {}
+        for record in records:
+            # records of deleted series or episodes, and of episodes already unmonitored,
+            # need no handling
+            episode = record.episode
+            if (
+                record.series is None
+                or episode is None
+                or not (episode.monitored or self.config.remove_media)
+            ):
+                continue
+            series[record.series_id] = record.series
+            episodes.setdefault(record.series_id, {})[episode.id] = episode
+            record_ids.setdefault(record.series_id, []).append(record.id)
+
+        return [
+            (
+                SonarrWebhookPayload(
+                    series=s,
+                    episodes=list(episodes[id].values()),
+                    event_type=EVENT_TYPE,
+                    instance_name=INSTANCE_NAME,
+                    application_url=self.sonarr.uri,
+                ),
+                record_ids[id],
+            )
+            for id, s in series.items()
+        ]
+
+    def lag(self, name: str) -> float | None:
+        """Return the seconds since the last completed pass for an arr, if there was one."""
+        last_run = self.state.get(name, {}).get("last_run")
+        return None if last_run is None else max(0.0, time.time() - last_run)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the high-water mark, lag and handled payloads of each arr."""
+        stats: dict[str, Any] = {"interval": self.interval, "runs": self.runs}
+        for name in ("radarr", "sonarr"):
+            stats[name] = {
+                "mark": self.state.get(name, {}).get("mark"),
+                "lag": self.lag(name),
+                "handled": self.handled[name],
+                "failed": self.failed[name],
+            }
+        return stats
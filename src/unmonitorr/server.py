@@ -1,20 +1,150 @@
+import asyncio
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
 from typing import Any
 
+import aiohttp
 from aiohttp import web
 from jinja2 import Environment, FileSystemLoader
 from pydantic import ValidationError
 
-from unmonitorr import log
-from unmonitorr.arrs import HTTPException, RadarrClient, SonarrClient
-from unmonitorr.config import Config
-from unmonitorr.types_ import RadarrWebhookPayload, SonarrWebhookPayload
+from unmonitorr import deadline, log, tracing
+from unmonitorr.arrs import (
+    BaseArrClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    ConcurrencyLimiter,
+    HTTPException,
+    RadarrClient,
+    RetryPolicy,
+    SonarrClient,
+    TTLCache,
+)
+from unmonitorr.coalesce import EpisodeCoalescer
+from unmonitorr.completeness import CompletenessIndex
+from unmonitorr.config import CONFIG_PATH, Config
+from unmonitorr.dedupe import RecentlySeen, dedupe_key
+from unmonitorr.journal import Journal
+from unmonitorr.jsonlog import bind
+from unmonitorr.metrics import (
+    ARR_CACHE_ENTRIES,
+    ARR_CACHE_LOOKUPS,
+    ARR_CIRCUIT_REJECTED,
+    ARR_CIRCUIT_STATE,
+    ARR_CONCURRENCY_LIMIT,
+    ARR_CONNECTIONS,
+    ARR_THROTTLED_WAIT,
+    HTTP_REQUEST_DURATION,
+    LOG_RECORDS_DROPPED,
+    QUEUE_DEPTH,
+    RECONCILE_LAG,
+    REGISTRY,
+    WEBHOOK_DEADLINES_EXCEEDED,
+    WEBHOOK_PROCESSING_DURATION,
+    WEBHOOKS_RECEIVED,
+    event_type_label,
+)
+from unmonitorr.reconcile import Reconciler
+from unmonitorr.tracing import Tracer
+from unmonitorr.types_ import (
+    RadarrWebhookPayload,
+    SonarrAPISeries,
+    SonarrWebhookPayload,
+    WebhookEnvelope,
+    WebhookPayloadAdapter,
+    WebhookSeries,
+)
+from unmonitorr.worker import PayloadT, WebhookQueue
 
 logger = log.get_logger(__name__)
 
-__all__ = ("init_web_application",)
+__all__ = (
+    "create_arr_client",
+    "init_web_application",
+)
 
 
-PayloadT = RadarrWebhookPayload | SonarrWebhookPayload
+CIRCUIT_STATES: dict[str, int] = {
+    "closed": 0,
+    "half_open": 1,
+    "open": 2,
+}
+
+JOURNAL_MODELS: dict[str, type[PayloadT]] = {
+    "radarr": RadarrWebhookPayload,
+    "sonarr": SonarrWebhookPayload,
+}
+
+
+def _create_cache(config: Config) -> TTLCache | None:
+    if config.arr_cache_ttl <= 0:
+        return None
+    return TTLCache(
+        maxsize=config.arr_cache_size,
+        ttl=config.arr_cache_ttl,
+        negative_ttl=config.arr_cache_negative_ttl,
+    )
+
+
+def _create_limiter(config: Config) -> ConcurrencyLimiter | None:
+    if config.arr_max_in_flight <= 0:
+        return None
+    return ConcurrencyLimiter(
+        config.arr_max_in_flight,
+        adaptive=config.arr_adaptive_concurrency,
+        min_limit=config.arr_min_in_flight,
+        latency_target=config.arr_latency_target,
+    )
+
+
+def _create_retry(config: Config) -> RetryPolicy | None:
+    if config.arr_retries <= 0:
+        return None
+    return RetryPolicy(
+        config.arr_retries,
+        base_delay=config.arr_retry_base_delay,
+        max_delay=config.arr_retry_max_delay,
+    )
+
+
+def _create_breaker(config: Config) -> CircuitBreaker | None:
+    if config.arr_breaker_threshold <= 0:
+        return None
+    return CircuitBreaker(
+        config.arr_breaker_threshold,
+        reset_timeout=config.arr_breaker_reset_timeout,
+    )
+
+
+def create_arr_client[T: BaseArrClient](cls: type[T], uri: str, api_key: str, config: Config) -> T:
+    """Create a Radarr or Sonarr client with the connection settings from `config`.
+
+    Parameters
+    ----------
+    cls : type[T]
+        The client class to create.
+    uri : str
+        The base URI of the arr instance.
+    api_key : str
+        The API key for the arr instance.
+    config : Config
+        The configuration holding the pool, timeout, cache and resilience settings.
+    """
+    return cls(
+        uri,
+        api_key,
+        pool_limit_per_host=config.arr_pool_limit_per_host,
+        dns_cache_ttl=config.arr_dns_cache_ttl,
+        keepalive_timeout=config.arr_keepalive_timeout,
+        connect_timeout=config.arr_connect_timeout,
+        read_timeout=config.arr_read_timeout,
+        total_timeout=config.arr_total_timeout,
+        cache=_create_cache(config),
+        limiter=_create_limiter(config),
+        retry=_create_retry(config),
+        breaker=_create_breaker(config),
+    )
 
 
 class WebhookHandler:
@@ -28,19 +158,217 @@ class WebhookHandler:
 
     def __init__(self, config: Config) -> None:
         self.config = config
-        self.radarr_api = RadarrClient(
-            config.radarr_uri,
-            config.radarr_api_key,
+        self.radarr_api = create_arr_client(
+            RadarrClient, config.radarr_uri, config.radarr_api_key, config
         )
-        self.sonarr_api = SonarrClient(
-            config.sonarr_uri,
-            config.sonarr_api_key,
+        self.sonarr_api = create_arr_client(
+            SonarrClient, config.sonarr_uri, config.sonarr_api_key, config
+        )
+
+        self.queue: WebhookQueue | None = None
+        if config.webhook_queue_enabled:
+            self.queue = WebhookQueue(
+                self.dispatch,
+                maxsize=config.webhook_queue_size,
+                workers=config.webhook_queue_workers,
+            )
+
+        self.rejected_events: Counter[str] = Counter()
+
+        self.recently_seen: RecentlySeen | None = None
+        if config.dedupe_window > 0:
+            self.recently_seen = RecentlySeen(
+                maxsize=config.dedupe_size,
+                window=config.dedupe_window,
+            )
+
+        self.journal: Journal | None = None
+        self._replay_task: asyncio.Task[None] | None = None
+        if config.journal_enabled:
+            self.journal = Journal(
+                f"{CONFIG_PATH}/journal.db",
+                max_attempts=config.journal_max_attempts,
+                retention=config.journal_retention,
+                compact_interval=config.journal_compact_interval,
+            )
+
+        self.episode_coalescer: EpisodeCoalescer | None = None
+        # queued payloads waiting for their batch to be flushed
+        self._dispatched: set[asyncio.Task[bool]] = set()
+        if config.episode_batch_window > 0:
+            self.episode_coalescer = EpisodeCoalescer(
+                self.flush_series_batch,
+                window=config.episode_batch_window,
+                max_batch=config.episode_batch_size,
+            )
+
+        self.completeness: CompletenessIndex | None = None
+        if config.series_index_max_age > 0:
+            self.completeness = CompletenessIndex(
+                max_age=config.series_index_max_age,
+                maxsize=config.series_index_size,
+            )
+
+        self.reconciler: Reconciler | None = None
+        if config.reconcile_interval > 0:
+            self.reconciler = Reconciler(
+                config,
+                self.radarr_api,
+                self.sonarr_api,
+                self.process,
+                path=f"{CONFIG_PATH}/reconcile.json",
+                interval=config.reconcile_interval,
+                page_size=config.reconcile_page_size,
+                concurrency=config.reconcile_concurrency,
+                max_attempts=config.reconcile_max_attempts,
+            )
+
+        self.tracer = Tracer(
+            keep=config.trace_keep,
+            export_path=config.trace_export_path or None,
         )
         logger.debug("Initialized WebhookHandler")
 
+    async def start(self, _: web.Application) -> None:
+        """Open the arr client sessions and journal, and start queue workers on startup.
+
+        Unfinished jobs in the journal are replayed, and missed imports are reconciled, in
+        the background.
+        """
+        await self.radarr_api.start()
+        await self.sonarr_api.start()
+        if self.queue:
+            await self.queue.start()
+        if self.journal:
+            await self.journal.open()
+            self._replay_task = asyncio.create_task(self.replay_journal())
+        if self.reconciler:
+            self.reconciler.start()
+
+    async def close(self, _: web.Application) -> None:
+        """Drain the queue and close the journal and arr client sessions on cleanup."""
+        if self._replay_task:
+            self._replay_task.cancel()
+        if self.reconciler:
+            await self.reconciler.stop()
+        if self.queue:
+            await self.queue.stop()
+        if self.episode_coalescer:
+            await self.episode_coalescer.stop()
+        if self._dispatched:
+            await asyncio.gather(*self._dispatched, return_exceptions=True)
+        if self.journal:
+            await self.journal.close()
+        await self.radarr_api.close()
+        await self.sonarr_api.close()
+        self.tracer.close()
+
+    @staticmethod
+    def _client_stats(client: RadarrClient | SonarrClient) -> dict[str, Any]:
+        stats: dict[str, Any] = {
+            "pool": client.pool_stats(),
+            "singleflight": client.singleflight.stats(),
+        }
+        if client.cache is not None:
+            stats["cache"] = client.cache.stats()
+        if client.limiter is not None:
+            stats["limiter"] = client.limiter.stats()
+        if client.retry is not None:
+            stats["retry"] = client.retry.stats()
+        if client.breaker is not None:
+            stats["breaker"] = client.breaker.stats()
+        return stats
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of runtime statistics."""
+        stats: dict[str, Any] = {
+            "radarr": self._client_stats(self.radarr_api),
+            "sonarr": self._client_stats(self.sonarr_api),
+        }
+        if self.queue:
+            stats["queue"] = self.queue.stats()
+        if self.episode_coalescer:
+            stats["sonarr"]["coalescer"] = self.episode_coalescer.stats()
+        if self.completeness is not None:
+            stats["sonarr"]["completeness"] = self.completeness.stats()
+        if self.rejected_events:
+            stats["rejected_events"] = dict(self.rejected_events)
+        if self.recently_seen is not None:
+            stats["dedupe"] = self.recently_seen.stats()
+        if self.journal:
+            stats["journal"] = self.journal.stats()
+        if self.reconciler:
+            stats["reconciler"] = self.reconciler.stats()
+        if self.tracer.enabled:
+            stats["tracing"] = self.tracer.stats()
+        if dropped := log.dropped_records():
+            stats["log_records_dropped"] = dropped
+        return stats
+
+    async def stats_endpoint(self, _: web.Request) -> web.Response:
+        """Serve the runtime statistics as JSON."""
+        return web.json_response(self.stats())
+
+    def health(self) -> dict[str, Any]:
+        """Return whether each arr instance is configured and reachable by its circuit breaker.
+
+        The overall status is ``degraded`` while any circuit is not closed.
+        """
+        health: dict[str, Any] = {"status": "ok"}
+        for name, client in (("radarr", self.radarr_api), ("sonarr", self.sonarr_api)):
+            if client.disabled:
+                health[name] = {"state": "disabled"}
+                continue
+            health[name] = client.breaker.stats() if client.breaker else {"state": "closed"}
+            if health[name]["state"] != "closed":
+                health["status"] = "degraded"
+        return health
+
+    async def health_endpoint(self, _: web.Request) -> web.Response:
+        """Serve the health of the arr instances as JSON."""
+        return web.json_response(self.health())
+
+    async def traces_endpoint(self, _: web.Request) -> web.Response:
+        """Serve the slowest recorded webhook traces as JSON."""
+        return web.json_response([trace.to_dict() for trace in self.tracer.slowest()])
+
+    def update_metrics(self) -> None:
+        """Refresh the gauges that mirror state kept by the queue, caches and pools."""
+        for name, client in (("radarr", self.radarr_api), ("sonarr", self.sonarr_api)):
+            pool = client.pool_stats()
+            ARR_CONNECTIONS.set(pool["in_use"], name, "in_use")
+            ARR_CONNECTIONS.set(pool["idle"], name, "idle")
+            if client.cache is not None:
+                cache = client.cache.stats()
+                ARR_CACHE_ENTRIES.set(cache["size"], name)
+                ARR_CACHE_LOOKUPS.set(cache["hits"], name, "hit")
+                ARR_CACHE_LOOKUPS.set(cache["negative_hits"], name, "negative_hit")
+                ARR_CACHE_LOOKUPS.set(cache["misses"], name, "miss")
+            if client.breaker is not None:
+                ARR_CIRCUIT_STATE.set(CIRCUIT_STATES[client.breaker.state], name)
+                ARR_CIRCUIT_REJECTED.set(client.breaker.rejected, name)
+            if client.limiter is not None:
+                ARR_CONCURRENCY_LIMIT.set(client.limiter.limit, name)
+                ARR_THROTTLED_WAIT.set(client.limiter.throttled_wait, name)
+        if self.queue:
+            QUEUE_DEPTH.set(self.queue.depth)
+        if self.reconciler:
+            for name in ("radarr", "sonarr"):
+                if (lag := self.reconciler.lag(name)) is not None:
+                    RECONCILE_LAG.set(lag, name)
+        LOG_RECORDS_DROPPED.set(log.dropped_records())
+
+    async def metrics_endpoint(self, _: web.Request) -> web.Response:
+        """Serve metrics in the Prometheus text exposition format."""
+        self.update_metrics()
+        response = web.Response(text=REGISTRY.render())
+        response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+        return response
+
     async def generic_handler(
         self,
         request: web.Request,
+        model: type[PayloadT],
     ) -> web.Response:
         """Generic handler for webhook payloads.
 
@@ -48,165 +376,706 @@ class WebhookHandler:
         ----------
         request : web.Request
             The incoming HTTP request.
+        model : type[PayloadT]
+            The payload model expected on the request's route.
 
         Returns
         -------
         web.Response
             The HTTP response.
         """
-        payload = await request.json()
-        headers = request.headers.items()
-
-        logger.debug("Received request headers: %s", headers)
-        logger.debug("Received request payload: %s", payload)
-
-        if not (validated_model := self.validate_payload(payload)):
-            logger.warning(
-                "Incoming payload could not be validated. "
-                "Did it originate from Sonarr or Radarr?: headers=%s, payload=%s",
-                headers,
-                payload,
+        with (
+            self.tracer.trace(f"{request.method} {request.path}"),
+            log.payload_sampling() as sample,
+        ):
+            with tracing.span("decode"):
+                body = await request.read()
+
+            if sample:
+                logger.debug("Received request headers: %s", request.headers)
+                logger.debug("Received request payload: %s", body)
+
+            route = request.path.strip("/")
+            with tracing.span("filter"):
+                accepted = self.accept_event(body)
+            if not accepted:
+                WEBHOOKS_RECEIVED.inc(route, "other", "rejected")
+                return web.Response()
+
+            with tracing.span("validate"):
+                validated_model = self.validate_payload(body, model)
+            if not validated_model:
+                WEBHOOKS_RECEIVED.inc(route, "other", "invalid")
+                logger.warning(
+                    "Incoming payload could not be validated. "
+                    "Did it originate from Sonarr or Radarr?: headers=%s, payload=%s",
+                    request.headers,
+                    body,
+                )
+                return web.Response()
+
+            WEBHOOKS_RECEIVED.inc(route, event_type_label(validated_model.event_type), "accepted")
+            if "test" in validated_model.event_type.lower():
+                # this is a test payload from sonarr or radarr.
+                logger.info("Received valid test payload from %s", validated_model.instance_name)
+                return web.Response()
+
+            logger.info(
+                "Received '%s' event payload from %s",
+                validated_model.event_type,
+                validated_model.instance_name,
             )
-            return web.Response()
 
-        if "test" in validated_model.event_type.lower():
-            # this is a test payload from sonarr or radarr.
-            logger.info("Received valid test payload from %s", validated_model.instance_name)
+            if isinstance(validated_model, SonarrWebhookPayload):
+                # the event may have changed the series, so lookups and cached series from
+                # before it cannot be used to decide its handling
+                self.sonarr_api.mark_changed("series", validated_model.series.id)
+
+            journal_id: int | None = None
+            if self.journal:
+                kind = "radarr" if isinstance(validated_model, RadarrWebhookPayload) else "sonarr"
+                with tracing.span("journal"):
+                    journal_id = await self.journal.append(
+                        kind, validated_model.model_dump_json(by_alias=True)
+                    )
+
+            if self.queue:
+                with tracing.span("enqueue"):
+                    queued = self.queue.submit(validated_model, journal_id)
+                if not queued:
+                    if self.journal and journal_id is not None:
+                        await self.journal.discard(journal_id)
+                    logger.warning(
+                        "Webhook queue is full (%s payloads) -- Rejecting '%s' event from %s",
+                        self.queue.depth,
+                        validated_model.event_type,
+                        validated_model.instance_name,
+                    )
+                    return web.Response(
+                        status=503,
+                        headers={"Retry-After": str(self.config.webhook_retry_after)},
+                    )
+                logger.debug("Payload queued for processing: depth=%s", self.queue.depth)
+                return web.Response(status=202)
+
+            await self.process(validated_model, journal_id)
+
+            logger.debug("Finished processing request.")
             return web.Response()
 
-        logger.info(
-            "Received '%s' event payload from %s",
-            validated_model.event_type,
-            validated_model.instance_name,
-        )
+    async def dispatch(self, payload: PayloadT, journal_id: int | None = None) -> None:
+        """Process a payload taken from the queue.
 
-        if isinstance(validated_model, RadarrWebhookPayload):
-            await self.handle_movie(validated_model)
+        A Sonarr payload that is buffered for a batch finishes, including its journal job,
+        in the background once its batch is flushed, so the queue worker can move on to
+        the next payload instead of holding the batch open.
 
-        else:
-            await self.handle_series(validated_model)
+        Parameters
+        ----------
+        payload : PayloadT
+            A validated Radarr or Sonarr webhook payload.
+        journal_id : int | None
+            The payload's job in the journal, which is finished once handling completes.
+        """
+        if self.episode_coalescer is None or not isinstance(payload, SonarrWebhookPayload):
+            await self.process(payload, journal_id)
+            return
 
-        logger.debug("Finished processing request.")
-        return web.Response()
+        task = asyncio.create_task(self.process(payload, journal_id))
+        self._dispatched.add(task)
+        task.add_done_callback(self._dispatch_done)
 
-    def validate_payload(self, payload: dict[str, Any]) -> PayloadT | None:
-        """Validate the payload received from the webhook.
+    def _dispatch_done(self, task: asyncio.Task[bool]) -> None:
+        self._dispatched.discard(task)
+        if not task.cancelled() and (e := task.exception()) is not None:
+            logger.error("Unhandled error processing queued payload.", exc_info=e)
+
+    async def process(self, payload: PayloadT, journal_id: int | None = None) -> bool:
+        """Dispatch a validated payload to the movie or series handler.
 
         Parameters
         ----------
-        payload : dict[str, Any]
-            The JSON payload from the webhook.
+        payload : PayloadT
+            A validated Radarr or Sonarr webhook payload.
+        journal_id : int | None
+            The payload's job in the journal, which is finished once handling completes.
+
+        Returns
+        -------
+        bool
+            True if the payload was handled successfully, otherwise False.
+        """
+        kind = "radarr" if isinstance(payload, RadarrWebhookPayload) else "sonarr"
+        if isinstance(payload, RadarrWebhookPayload):
+            fields = {"movie_id": payload.movie.id}
+        else:
+            fields = {"series_id": payload.series.id}
+
+        with (
+            self.tracer.trace(f"process {kind}", event_type=payload.event_type),
+            log.payload_sampling(),
+            bind(instance_name=payload.instance_name, **fields),
+            deadline.deadline(self.config.webhook_deadline),
+        ):
+            return await self._process(payload, kind, journal_id)
+
+    async def _process(self, payload: PayloadT, kind: str, journal_id: int | None) -> bool:
+        started = time.perf_counter()
+        if self.recently_seen is None:
+            success = await self._handle(payload)
+            result = "success" if success else "failure"
+        else:
+            success, result = await self._handle_once(payload, self.recently_seen)
 
+        duration = time.perf_counter() - started
+        WEBHOOK_PROCESSING_DURATION.observe(duration, kind, result)
+        logger.debug(
+            "Finished handling '%s' event payload from %s: result=%s, duration=%.3fs",
+            payload.event_type,
+            payload.instance_name,
+            result,
+            duration,
+            extra={"duration": round(duration, 6)},
+        )
+
+        if self.journal and journal_id is not None:
+            await self.journal.finish(journal_id, success=success)
+        return success
+
+    async def _handle(self, payload: PayloadT) -> bool:
+        if isinstance(payload, RadarrWebhookPayload):
+            return await self.handle_parked(self.handle_movie, payload)
+        # counted here, as a parked payload is handled from the start again
+        self.record_imports(payload)
+        return await self.handle_parked(self.handle_series, payload)
+
+    async def _handle_once(
+        self, payload: PayloadT, recently_seen: RecentlySeen
+    ) -> tuple[bool, str]:
+        """Handle a payload unless the same work was recently applied or is in progress.
+
+        A duplicate of work in progress waits for, and shares, its result. Duplicates do
+        not refresh the window, so a key is remembered for the window after it was applied.
+        """
+        key = dedupe_key(payload)
+        in_flight = recently_seen.in_flight(key)
+        if in_flight is not None or recently_seen.seen(key):
+            logger.info(
+                "Skipping duplicate '%s' event payload from %s",
+                payload.event_type,
+                payload.instance_name,
+            )
+            recently_seen.suppress(payload.event_type)
+            success = True if in_flight is None else await asyncio.shield(in_flight)
+            return success, "duplicate"
+
+        recently_seen.begin(key)
+        success = False
+        try:
+            success = await self._handle(payload)
+        finally:
+            recently_seen.end(key, success=success)
+        return success, "success" if success else "failure"
+
+    async def handle_parked[T](self, handle: Callable[[T], Awaitable[bool]], payload: T) -> bool:
+        """Handle a payload, parking it while an arr instance's circuit breaker is open.
+
+        Handling is started again each time the unavailable instance may be retried, for
+        up to the configured park timeout or until the webhook's deadline. Handling is
+        idempotent, so steps completed before the circuit opened are safe to repeat.
+
+        Parameters
+        ----------
+        handle : Callable[[T], Awaitable[bool]]
+            The handler to call with `payload`.
+        payload : T
+            The webhook payload, or batch of payloads.
 
         Returns
         -------
-        PayloadType | None
-            A validated RadarrPayload, SonarrWebhookPayload, or None if not a valid payload.
+        bool
+            True if the payload was handled successfully, otherwise False.
         """
-        valid_models: list[type[PayloadT]] = [
-            RadarrWebhookPayload,
-            SonarrWebhookPayload,
-        ]
+        park_until = time.monotonic() + self.config.arr_park_timeout
+        while True:
+            try:
+                return await handle(payload)
+            except TimeoutError as e:
+                # also raised by a request cut short by the deadline, not only before one
+                if deadline.expired():
+                    logger.warning(
+                        "Webhook deadline exceeded -- Deferring the rest of the webhook."
+                    )
+                    WEBHOOK_DEADLINES_EXCEEDED.inc("request")
+                else:
+                    logger.warning("Request timed out handling webhook: %r", e)
+                return False
+            except CircuitOpenError as e:
+                remaining = park_until - time.monotonic()
+                if (left := deadline.remaining()) is not None:
+                    remaining = min(remaining, left)
+                if remaining <= 0:
+                    logger.warning("%s -- Giving up on parked webhook.", e)
+                    return False
+
+                logger.info("%s -- Parking webhook until it recovers.", e)
+                with tracing.span("parked", client=e.client):
+                    try:
+                        await asyncio.wait_for(e.breaker.wait(), remaining)
+                    except TimeoutError:
+                        logger.warning("%s -- Giving up on parked webhook.", e)
+                        return False
+
+    async def replay_journal(self) -> None:
+        """Process the jobs left unfinished in the journal by a previous run."""
+        if not self.journal:
+            return
 
-        for model in valid_models:
+        pending = await self.journal.pending()
+        if not pending:
+            return
+
+        logger.info("Replaying %s unfinished webhook jobs from the journal.", len(pending))
+        for journal_id, kind, data in pending:
             try:
-                return model.model_validate(payload)
-            except ValidationError:
+                payload = JOURNAL_MODELS[kind].model_validate_json(data)
+            except (KeyError, ValidationError):
+                logger.warning("Skipping unreadable journal job: id=%s, kind=%s", journal_id, kind)
+                await self.journal.finish(journal_id, success=False)
                 continue
 
-        return None
+            if self.queue:
+                await self.queue.put(payload, journal_id)
+            else:
+                await self.process(payload, journal_id)
+
+    def accept_event(self, body: bytes) -> bool:
+        """Check the event type of a webhook against the configured filters.
+
+        Only the shared envelope fields are parsed, so rejected events never reach full
+        payload validation or the arrs. Test events are always accepted.
+
+        Parameters
+        ----------
+        body : bytes
+            The raw JSON body of the webhook request.
+
+        Returns
+        -------
+        bool
+            True if the event should be handled, otherwise False.
+        """
+        allowed = self.config.allowed_event_types
+        if not allowed and not self.config.skip_upgrades:
+            return True
+
+        try:
+            envelope = WebhookEnvelope.model_validate_json(body)
+        except ValidationError:
+            # leave reporting unreadable payloads to full validation
+            return True
+
+        event_type = envelope.event_type
+        if "test" in event_type.lower():
+            return True
+
+        if allowed and event_type not in allowed:
+            logger.info(
+                "Ignoring '%s' event from %s: not an allowed event type.",
+                event_type,
+                envelope.instance_name,
+            )
+            self.rejected_events[event_type] += 1
+            return False
+
+        if self.config.skip_upgrades and envelope.is_upgrade:
+            logger.info("Ignoring upgrade '%s' event from %s.", event_type, envelope.instance_name)
+            self.rejected_events[f"{event_type} (upgrade)"] += 1
+            return False
+
+        return True
+
+    def validate_payload(self, body: bytes, model: type[PayloadT]) -> PayloadT | None:
+        """Validate the payload received from the webhook.
+
+        The raw body is validated against the model expected on its route. A payload
+        sent to the wrong route is identified by its contents instead.
+
+        Parameters
+        ----------
+        body : bytes
+            The raw JSON body of the webhook request.
+        model : type[PayloadT]
+            The payload model expected on the request's route.
 
-    async def handle_movie(self, payload: RadarrWebhookPayload) -> None:
+        Returns
+        -------
+        PayloadType | None
+            A validated RadarrPayload, SonarrWebhookPayload, or None if not a valid payload.
+        """
+        try:
+            return model.model_validate_json(body)
+        except ValidationError:
+            pass
+
+        try:
+            payload = WebhookPayloadAdapter.validate_json(body)
+        except ValidationError:
+            return None
+
+        logger.warning(
+            "Payload did not match %s but validated as %s. Check the webhook URL in %s.",
+            model.__name__,
+            payload.__class__.__name__,
+            payload.instance_name,
+        )
+        return payload
+
+    async def handle_movie(self, payload: RadarrWebhookPayload) -> bool:
         """Handle movie-specific logic for Radarr webhooks.
 
         Parameters
         ----------
         payload: RadarrWebhookPayload
             A movie payload from Radarr's webhook notifications.
+
+        Returns
+        -------
+        bool
+            True if the movie was handled successfully, or skipped because Radarr is not
+            configured, otherwise False.
         """
         if self.radarr_api.disabled:
-            logger.info("Radarr client is missing a valid configuration -- Cannot access API.")
-            return
+            # the payload is skipped rather than failed, so it is neither retried nor counted
+            # as a failure
+            logger.info("Radarr client is missing a valid configuration -- Skipping movie.")
+            return True
 
         movie = payload.movie
         logger.info("Handling movie: %s", movie)
-        logger.debug("Movie Details: %s", movie.model_dump())
+        logger.debug("Movie Details: %s", log.sampled(movie.model_dump))
 
         if self.config.remove_media:
             logger.info("Configured to delete movie. Proceeding with deletion.")
             logger.debug("Deleting movie from Radarr: %s", movie)
-            await self.radarr_api.delete_movie(movie.id)
-        else:
-            logger.info("Configured to unmonitor movie. Fetching movie details from Radarr")
-            api_movie = await self.radarr_api.get_movie_by_id(movie.id)
-
-            if not api_movie:
-                logger.warning("Unable to fetch movie from Radarr: %s", movie)
-                return
+            with tracing.span("mutate"):
+                return await self.radarr_api.delete_movie(movie.id)
 
-            logger.debug("Fetched movie from Radarr: %s", api_movie)
+        logger.info("Configured to unmonitor movie. Unmonitoring movie in Radarr: %s", movie)
+        with tracing.span("mutate"):
+            return await self.radarr_api.bulk_unmonitor_movies([movie.id])
 
-            api_movie.unmonitor()
-            logger.info("Unmonitoring movie in Radarr: %s", movie)
-            await self.radarr_api.put_updated_movie(api_movie)
-
-    async def handle_series(self, payload: SonarrWebhookPayload) -> None:
+    async def handle_series(self, payload: SonarrWebhookPayload) -> bool:
         """Handle series-specific logic for Sonarr webhooks.
 
         Parameters
         ----------
         payload : SonarrWebhookPayload
             The series payload from Sonarr's webhook notifications.
+
+        Returns
+        -------
+        bool
+            True if the episodes and series were handled successfully, or skipped because
+            Sonarr is not configured, otherwise False.
         """
         if self.sonarr_api.disabled:
-            logger.info("Sonarr client is missing a valid configuration -- Cannot access API.")
-            return
+            # the payload is skipped rather than failed, so it is neither retried nor counted
+            # as a failure
+            logger.info("Sonarr client is missing a valid configuration -- Skipping series.")
+            return True
+
+        if self.episode_coalescer:
+            logger.debug("Buffering payload for batched handling: %s", payload.series)
+            return await self.episode_coalescer.add(payload)
 
         series = payload.series
         logger.info("Handling series: %s", series)
 
+        success = True
+
         # Check if we are allowed to handle the series.
         if self.config.handle_episodes:
             logger.info("Unmonitoring episodes for series: %s", payload.episodes)
-            await self.sonarr_api.unmonitor_episodes(payload)
+            with tracing.span("mutate", episodes=len(payload.episodes)):
+                success = await self.sonarr_api.unmonitor_episodes(payload)
         else:
             logger.info("Episode handling is disabled. Skipping handling for individual episodes.")
 
-        # Check if we are allowed to handle series
-        if not self.config.handle_series:
+        # Check if we are allowed to handle series or their seasons
+        if not (self.config.handle_series or self.config.handle_seasons):
             logger.info(
                 "Series handling is disabled. Skipping further handling for series: %s", series
             )
-            return
+            return success
+
+        if self.deadline_exceeded("series", series):
+            return False
+
+        return await self.handle_series_status(series) and success
+
+    async def flush_series_batch(self, payloads: list[SonarrWebhookPayload]) -> bool:
+        """Handle a batch flushed by the episode coalescer.
+
+        The batch is traced, and given a deadline, of its own rather than those of the
+        payloads in it.
+
+        Parameters
+        ----------
+        payloads : list[SonarrWebhookPayload]
+            The buffered series payloads from Sonarr's webhook notifications.
+
+        Returns
+        -------
+        bool
+            True if the whole batch was handled successfully, otherwise False.
+        """
+        with (
+            self.tracer.trace("process sonarr batch", payloads=len(payloads)),
+            log.payload_sampling(),
+            deadline.deadline(self.config.webhook_deadline),
+        ):
+            return await self.handle_parked(self.handle_series_batch, payloads)
+
+    async def handle_series_batch(self, payloads: list[SonarrWebhookPayload]) -> bool:
+        """Handle a coalesced batch of Sonarr webhooks.
+
+        All episodes in the batch are unmonitored with a single request, and each series
+        in the batch is checked once.
+
+        Parameters
+        ----------
+        payloads : list[SonarrWebhookPayload]
+            The buffered series payloads from Sonarr's webhook notifications.
+
+        Returns
+        -------
+        bool
+            True if the whole batch was handled successfully, otherwise False.
+        """
+        series = {p.series.id: p.series for p in payloads}
+        logger.info("Handling batch of %s payloads for %s series.", len(payloads), len(series))
+
+        success = True
+
+        if self.config.handle_episodes:
+            episode_ids = list(
+                dict.fromkeys(i for p in payloads for i in p.episode_ids_to_unmonitor())
+            )
+            logger.info("Unmonitoring %s episodes for %s series.", len(episode_ids), len(series))
+            with tracing.span("mutate", episodes=len(episode_ids)):
+                success = await self.sonarr_api.unmonitor_episode_ids(episode_ids)
+        else:
+            logger.info("Episode handling is disabled. Skipping handling for individual episodes.")
+
+        if not (self.config.handle_series or self.config.handle_seasons):
+            logger.info("Series handling is disabled. Skipping further handling for series.")
+            return success
+
+        if self.deadline_exceeded("series", *series.values()):
+            return False
+
+        return await self.handle_series_status(*series.values()) and success
+
+    async def handle_series_status(self, *series: WebhookSeries) -> bool:
+        """Unmonitor or remove each series that is complete and allowed to be handled.
 
-        logger.info("Fetching series data from Sonarr for series ID: %s", series.id)
-        api_series = await self.sonarr_api.get_series_by_id(series.id)
+        Series that can be handled are updated together with a single bulk request. When
+        season handling is enabled, the finished seasons of the other series are
+        unmonitored instead.
 
-        if not api_series:
-            logger.warning("Series not found in Sonarr: %s", series)
+        Parameters
+        ----------
+        *series : WebhookSeries
+            The series from Sonarr's webhook notifications.
+
+        Returns
+        -------
+        bool
+            True if every series was fetched and, where needed, updated successfully.
+        """
+        success = True
+        ready: list[SonarrAPISeries] = []
+        partial: list[SonarrAPISeries] = []
+        for webhook_series, api_series in await self.fetch_series(*series):
+            if not api_series:
+                logger.warning("Series not found in Sonarr: %s", webhook_series)
+                success = False
+            elif self.config.handle_series and self.can_handle_series(api_series):
+                ready.append(api_series)
+            else:
+                partial.append(api_series)
+
+        if partial and self.config.handle_seasons:
+            success = await self.handle_seasons(*partial) and success
+
+        if not ready:
+            return success
+
+        if self.deadline_exceeded("mutate", *ready):
+            return False
+
+        with tracing.span("mutate", series=len(ready)):
+            if self.config.remove_media:
+                logger.info("Removing series from Sonarr: %s", ready)
+                updated = await self.sonarr_api.bulk_delete_series(
+                    [s.id for s in ready], exclude=self.config.exclude_series
+                )
+                if updated and self.completeness is not None:
+                    for s in ready:
+                        self.completeness.discard(s.id)
+            else:
+                updated = await self.sonarr_api.bulk_unmonitor_series(ready)
+        logger.info("Series handling complete: %s", ready)
+        return updated and success
+
+    async def fetch_series(
+        self, *series: WebhookSeries
+    ) -> list[tuple[WebhookSeries, SonarrAPISeries | None]]:
+        """Fetch the series whose handling cannot be decided from the completeness index.
+
+        Series the index knows are still missing episodes are skipped, and the index is
+        updated from every series fetched.
+
+        Parameters
+        ----------
+        *series : WebhookSeries
+            The series from Sonarr's webhook notifications.
+
+        Returns
+        -------
+        list[tuple[WebhookSeries, SonarrAPISeries | None]]
+            Each fetched series with its data from Sonarr, or None if it was not found.
+        """
+        index = self.completeness
+        if index is not None:
+            wanted: list[WebhookSeries] = []
+            skipped: list[WebhookSeries] = []
+            for s in series:
+                needs_fetch = index.needs_fetch(
+                    s.id,
+                    series=self.config.handle_series,
+                    ended_only=self.config.handle_series_ended_only,
+                    seasons=self.config.handle_seasons,
+                )
+                (wanted if needs_fetch else skipped).append(s)
+            if skipped:
+                logger.info("Skipping lookup of series that cannot be handled yet: %s", skipped)
+            series = tuple(wanted)
+
+        if not series:
+            return []
+
+        logger.info("Fetching series data from Sonarr for series: %s", series)
+        with tracing.span("lookup", series=len(series)):
+            fetched = await asyncio.gather(
+                *(self.sonarr_api.get_series_by_id(s.id) for s in series)
+            )
+
+        if index is not None:
+            for api_series in fetched:
+                if api_series is not None:
+                    index.update(
+                        api_series.id,
+                        {
+                            season.season_number: season.statistics.missing_count
+                            for season in api_series.seasons
+                        },
+                        ended=api_series.is_ended,
+                    )
+        return list(zip(series, fetched, strict=True))
+
+    def record_imports(self, *payloads: SonarrWebhookPayload) -> None:
+        """Count the episodes imported by download payloads in the completeness index."""
+        if self.completeness is None:
             return
+        for payload in payloads:
+            if payload.event_type == "Download":
+                self.completeness.record_imports(
+                    payload.series.id, (e.season_number for e in payload.episodes)
+                )
+
+    async def handle_seasons(self, *series: SonarrAPISeries) -> bool:
+        """Unmonitor the finished seasons of series that are not handled as a whole.
+
+        The series documents already fetched for the series check are reused, and all of
+        a series' finished seasons are unmonitored with a single update.
+
+        Parameters
+        ----------
+        *series : SonarrAPISeries
+            The series data from Sonarr.
+
+        Returns
+        -------
+        bool
+            True if every series with finished seasons was updated successfully.
+        """
+        finished = {
+            s.id: [
+                season.season_number
+                for season in s.seasons
+                if season.monitored and season.is_finished
+            ]
+            for s in series
+        }
+        updates = [s for s in series if finished[s.id]]
+        if not updates:
+            logger.info("No finished seasons to unmonitor for series: %s", series)
+            return True
+
+        if self.deadline_exceeded("seasons", *updates):
+            return False
+
+        with tracing.span("mutate", seasons=sum(len(finished[s.id]) for s in updates)):
+            results = await asyncio.gather(
+                *(self.sonarr_api.unmonitor_seasons(s, finished[s.id]) for s in updates)
+            )
+        return all(results)
+
+    def deadline_exceeded(self, step: str, *series: WebhookSeries | SonarrAPISeries) -> bool:
+        """Return True, and log the deferred step, if the webhook's deadline has passed.
+
+        The webhook is reported as failed, so a journaled webhook is replayed later.
+
+        Parameters
+        ----------
+        step : str
+            The step that would be skipped, used as the metric label.
+        *series : WebhookSeries | SonarrAPISeries
+            The series the step would have handled.
+        """
+        if not deadline.expired():
+            return False
+
+        logger.warning("Webhook deadline exceeded -- Deferring %s handling for: %s", step, series)
+        WEBHOOK_DEADLINES_EXCEEDED.inc(step)
+        return True
 
+    def can_handle_series(self, series: SonarrAPISeries) -> bool:
+        """Return True if a series is complete and allowed to be handled.
+
+        Parameters
+        ----------
+        series : SonarrAPISeries
+            The series data from Sonarr.
+        """
         # Figure out if the series can be handled based on status
         can_handle = True
         if self.config.handle_series_ended_only:
             logger.info("Checking if series has ended: %s", series)
-            if not api_series.is_ended:
+            if not series.is_ended:
                 logger.info("Series is ongoing and cannot be handled: %s", series)
                 can_handle = False
             else:
                 logger.info("Series has ended: %s", series)
 
-        if can_handle and api_series.is_complete:
+        if can_handle and series.is_complete:
             logger.info("Series is complete and ready to handle: %s", series)
-            if self.config.remove_media:
-                logger.info("Removing series from Sonarr: %s", api_series)
-                await self.sonarr_api.delete_series(series, exclude=self.config.exclude_series)
-            else:
-                api_series.unmonitor_series()
-                await self.sonarr_api.put_updated_series(api_series)
-            logger.info("Series handling complete: %s", api_series)
-        else:
-            logger.info("Series cannot be handled further: %s", api_series)
+            return True
+
+        logger.info("Series cannot be handled further: %s", series)
+        return False
 
     async def sonarr_endpoint(self, request: web.Request) -> web.Response:
         """Handle Sonarr webhook requests.
@@ -221,7 +1090,7 @@ class WebhookHandler:
         web.Response
             The HTTP response.
         """
-        return await self.generic_handler(request)
+        return await self.generic_handler(request, SonarrWebhookPayload)
 
     async def radarr_endpoint(self, request: web.Request) -> web.Response:
         """
@@ -237,7 +1106,7 @@ class WebhookHandler:
         web.Response
             The HTTP response.
         """
-        return await self.generic_handler(request)
+        return await self.generic_handler(request, RadarrWebhookPayload)
 
 
 class Configurator:
@@ -247,8 +1116,8 @@ class Configurator:
         self.config = config
         self.webhook_handler = webhook_handler
 
-    def update_radarr_client(self, radarr_uri: str, radarr_api_key: str) -> None:
-        self.webhook_handler.radarr_api.update_client_config(radarr_uri, radarr_api_key)
+    async def update_radarr_client(self, radarr_uri: str, radarr_api_key: str) -> None:
+        await self.webhook_handler.radarr_api.update_client_config(radarr_uri, radarr_api_key)
 
         logger.info("Radarr configuration updated.")
         logger.debug(
@@ -259,8 +1128,8 @@ class Configurator:
         if self.webhook_handler.radarr_api.disabled:
             logger.info("Radarr client missing required configuration -- API requests disabled.")
 
-    def update_sonarr_client(self, sonarr_uri: str, sonarr_api_key: str) -> None:
-        self.webhook_handler.sonarr_api.update_client_config(sonarr_uri, sonarr_api_key)
+    async def update_sonarr_client(self, sonarr_uri: str, sonarr_api_key: str) -> None:
+        await self.webhook_handler.sonarr_api.update_client_config(sonarr_uri, sonarr_api_key)
 
         logger.info("Sonarr configuration updated.")
         logger.debug(
@@ -290,6 +1159,7 @@ class Configurator:
             sonarr_api_key = str(data.get("sonarr_api_key", "")).strip()
             handle_episodes = data.get("handle_episodes") == "on"
             handle_series = data.get("handle_series") == "on"
+            handle_seasons = data.get("handle_seasons") == "on"
             exclude_series = data.get("exclude_series") == "on"
             handle_series_ended_only = data.get("handle_series_ended_only") == "on"
             remove_media = data.get("remove_media") == "on"
@@ -300,19 +1170,20 @@ class Configurator:
                 logger.info("Received new Radarr config - Updating client")
                 self.config.radarr_uri = radarr_uri
                 self.config.radarr_api_key = radarr_api_key
-                self.update_radarr_client(radarr_uri, radarr_api_key)
+                await self.update_radarr_client(radarr_uri, radarr_api_key)
                 is_updated = True
 
             if sonarr_uri != self.config.sonarr_uri or sonarr_api_key != self.config.sonarr_api_key:
                 logger.info("Received new Sonarr config -- Updating client.")
                 self.config.sonarr_uri = sonarr_uri
                 self.config.sonarr_api_key = sonarr_api_key
-                self.update_sonarr_client(sonarr_uri, sonarr_api_key)
+                await self.update_sonarr_client(sonarr_uri, sonarr_api_key)
                 is_updated = True
 
             if (
                 self.config.handle_episodes != handle_episodes
                 or self.config.handle_series != handle_series
+                or self.config.handle_seasons != handle_seasons
                 or self.config.exclude_series != exclude_series
                 or self.config.handle_series_ended_only != handle_series_ended_only
                 or self.config.remove_media != remove_media
@@ -320,6 +1191,7 @@ class Configurator:
                 logger.info("Updating handling rules.")
                 self.config.handle_episodes = handle_episodes
                 self.config.handle_series = handle_series
+                self.config.handle_seasons = handle_seasons
                 self.config.exclude_series = exclude_series
                 self.config.handle_series_ended_only = handle_series_ended_only
                 self.config.remove_media = remove_media
@@ -354,17 +1226,52 @@ class Configurator:
 
         logger.info("Pinging %s: url=%s", client, url)
 
+        if client == "Radarr":
+            arr_api: BaseArrClient = self.webhook_handler.radarr_api
+        else:
+            arr_api = self.webhook_handler.sonarr_api
+
         try:
-            response = await self.webhook_handler.radarr_api.request("GET", url, headers=headers)
+            # the tested instance may not be the configured one, and a wrong URI should
+            # fail at once, so the request is sent once, outside the configured instance's
+            # circuit breaker and limiter
+            response = await arr_api.request(
+                "GET", url, headers=headers, idempotent=False, circuit=False, limit=False
+            )
         except HTTPException as e:
             logger.info("Validation Response: status=%s, reason=%s", e.status, e.reason)
             return web.Response(status=e.status, text=e.reason)
+        except (aiohttp.ClientError, TimeoutError) as e:
+            logger.info("Could not connect to %s: %r", client, e)
+            return web.Response(status=502, text=f"Could not connect to {client}.")
 
         logger.info("%s validation success", client)
         logger.debug("Validation Response: %s", response)
         return web.json_response(response)
 
 
+@web.middleware
+async def metrics_middleware(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+) -> web.StreamResponse:
+    """Record how long each request takes to answer, by route and status code."""
+    # label by the matched route rather than the raw path to keep label sets bounded
+    resource = request.match_info.route.resource
+    route = resource.canonical if resource else "unmatched"
+    status = 500
+    started = time.perf_counter()
+    try:
+        response = await handler(request)
+        status = response.status
+    except web.HTTPException as e:
+        status = e.status
+        raise
+    finally:
+        HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, route, str(status))
+    return response
+
+
 def init_web_application(config: Config) -> web.Application:
     """Initialize the web application with configured routes.
 
@@ -376,7 +1283,9 @@ def init_web_application(config: Config) -> web.Application:
     logger.debug("Initializing web application.")
     handler = WebhookHandler(config)
     configurator = Configurator(config, handler)
-    app = web.Application()
+    app = web.Application(middlewares=[metrics_middleware])
+    app.on_startup.append(handler.start)
+    app.on_cleanup.append(handler.close)
     app.router.add_static("/static/", path="unmonitorr/static", name="static")
     app.add_routes(
         [
@@ -385,6 +1294,10 @@ def init_web_application(config: Config) -> web.Application:
             web.get("/setup", configurator.setup_page),
             web.post("/save-config", configurator.save_config),
             web.post("/test-arr", configurator.ping_arr_server),
+            web.get("/stats", handler.stats_endpoint),
+            web.get("/health", handler.health_endpoint),
+            web.get("/metrics", handler.metrics_endpoint),
+            web.get("/debug/traces", handler.traces_endpoint),
         ],
     )
 
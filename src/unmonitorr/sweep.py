@@ -0,0 +1,245 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import aiohttp
+
+from unmonitorr import log
+from unmonitorr.arrs import CircuitOpenError, HTTPException, RadarrClient, SonarrClient
+from unmonitorr.config import Config
+from unmonitorr.types_ import RadarrAPIMovie, SonarrAPISeries
+
+__all__ = (
+    "LibrarySweep",
+    "SweepResult",
+)
+
+logger = log.get_logger(__name__)
+
+
+class SweepResult:
+    """The outcome of sweeping one library.
+
+    Parameters
+    ----------
+    library : str
+        Either "movies" or "series".
+    action : str
+        Either "unmonitor" or "remove".
+    dry_run : bool
+        Whether matching items were only reported.
+    """
+
+    __slots__ = (
+        "action",
+        "dry_run",
+        "duration",
+        "failed",
+        "handled",
+        "library",
+        "matched",
+        "scanned",
+    )
+
+    def __init__(self, library: str, action: str, *, dry_run: bool) -> None:
+        self.library = library
+        self.action = action
+        self.dry_run = dry_run
+
+        self.scanned: int = 0
+        self.matched: list[str] = []
+        self.handled: int = 0
+        self.failed: int = 0
+        self.duration: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the result as a JSON-serializable report."""
+        return {
+            "library": self.library,
+            "action": self.action,
+            "dry_run": self.dry_run,
+            "scanned": self.scanned,
+            "matched": len(self.matched),
+            "handled": self.handled,
+            "failed": self.failed,
+            "duration": round(self.duration, 3),
+            "items": self.matched,
+        }
+
+
+class LibrarySweep:
+    """Applies the webhook handling rules to every movie and series already in the arrs.
+
+    Each library is read with a single list request, parsed as it arrives so that only
+    the matching items are kept. These are then unmonitored, or removed when configured,
+    through the bulk editor in batches, with a bounded number of batches in flight. A
+    batch that fails is counted as failed without stopping the others.
+
+    Parameters
+    ----------
+    config : Config
+        The handling rules to apply.
+    radarr : RadarrClient
+        The client for Radarr.
+    sonarr : SonarrClient
+        The client for Sonarr.
+    batch_size : int
+        Number of items updated by each bulk request.
+    concurrency : int
+        Maximum number of bulk requests in flight to each arr.
+    dry_run : bool
+        Only report the matching items, without changing anything.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        radarr: RadarrClient,
+        sonarr: SonarrClient,
+        *,
+        batch_size: int = 250,
+        concurrency: int = 4,
+        dry_run: bool = False,
+    ) -> None:
+        self.config = config
+        self.radarr = radarr
+        self.sonarr = sonarr
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.dry_run = dry_run
+
+    @property
+    def action(self) -> str:
+        return "remove" if self.config.remove_media else "unmonitor"
+
+    def matches_movie(self, movie: RadarrAPIMovie) -> bool:
+        """Return True if a Radarr download webhook would have handled the movie.
+
+        Movies that are already unmonitored are left alone unless they are to be removed.
+        """
+        return movie.has_file and (movie.monitored or self.config.remove_media)
+
+    def matches_series(self, series: SonarrAPISeries) -> bool:
+        """Return True if the series is complete, ended if required, and may be handled.
+
+        Series that are already unmonitored are left alone unless they are to be removed.
+        """
+        return (
+            series.is_complete
+            and (series.is_ended or not self.config.handle_series_ended_only)
+            and (series.monitored or self.config.remove_media)
+        )
+
+    async def sweep_movies(self) -> SweepResult:
+        """Unmonitor or remove every downloaded movie in Radarr."""
+        result = SweepResult("movies", self.action, dry_run=self.dry_run)
+        started = time.perf_counter()
+
+        ids: list[int] = []
+        async for movie in self.radarr.iter_all_movies():
+            result.scanned += 1
+            if self.matches_movie(movie):
+                ids.append(movie.id)
+                result.matched.append(f"{movie.title} ({movie.year})")
+        logger.info("Found %s of %s movies in Radarr to %s.", len(ids), result.scanned, self.action)
+
+        if not self.dry_run and ids:
+            if self.config.remove_media:
+                apply = self.radarr.bulk_delete_movies
+            else:
+                apply = self.radarr.bulk_unmonitor_movies
+            await self._apply(result, ids, apply)
+
+        result.duration = time.perf_counter() - started
+        return result
+
+    async def sweep_series(self) -> SweepResult:
+        """Unmonitor or remove every series in Sonarr that is complete and may be handled."""
+        result = SweepResult("series", self.action, dry_run=self.dry_run)
+        started = time.perf_counter()
+
+        # only the IDs are kept, so memory does not grow with the size of the documents
+        ids: list[int] = []
+        async for series in self.sonarr.iter_all_series():
+            result.scanned += 1
+            if self.matches_series(series):
+                ids.append(series.id)
+                result.matched.append(f"{series.title} ({series.year})")
+        logger.info("Found %s of %s series in Sonarr to %s.", len(ids), result.scanned, self.action)
+
+        if not self.dry_run and ids:
+            if self.config.remove_media:
+                apply = self._delete_series
+            else:
+                apply = self.sonarr.bulk_unmonitor_series_ids
+            await self._apply(result, ids, apply)
+
+        result.duration = time.perf_counter() - started
+        return result
+
+    async def _delete_series(self, ids: list[int]) -> bool:
+        return await self.sonarr.bulk_delete_series(ids, exclude=self.config.exclude_series)
+
+    async def _apply(
+        self,
+        result: SweepResult,
+        ids: list[int],
+        apply: Callable[[list[int]], Awaitable[bool]],
+    ) -> None:
+        batches = [
+            ids[start : start + self.batch_size] for start in range(0, len(ids), self.batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(batch: list[int]) -> None:
+            async with semaphore:
+                try:
+                    applied = await apply(batch)
+                except (HTTPException, aiohttp.ClientError, TimeoutError, CircuitOpenError) as e:
+                    logger.warning(
+                        "Failed to sweep a batch of %s %s: %r", len(batch), result.library, e
+                    )
+                    applied = False
+                if applied:
+                    result.handled += len(batch)
+                else:
+                    result.failed += len(batch)
+            logger.info(
+                "Swept %s/%s %s (%s failed).",
+                result.handled + result.failed,
+                len(ids),
+                result.library,
+                result.failed,
+            )
+
+        await asyncio.gather(*(run(batch) for batch in batches))
+
+    async def run(self, *, movies: bool = True, series: bool = True) -> list[SweepResult]:
+        """Sweep the configured libraries.
+
+        A library is skipped if its client is not configured, and series are skipped if
+        series handling is disabled.
+
+        Parameters
+        ----------
+        movies : bool
+            Sweep the Radarr library.
+        series : bool
+            Sweep the Sonarr library.
+        """
+        results: list[SweepResult] = []
+        if movies:
+            if self.radarr.disabled:
+                logger.info("Radarr client is missing a valid configuration -- Skipping movies.")
+            else:
+                results.append(await self.sweep_movies())
+
+        if series:
+            if self.sonarr.disabled:
+                logger.info("Sonarr client is missing a valid configuration -- Skipping series.")
+            elif not self.config.handle_series:
+                logger.info("Series handling is disabled -- Skipping series.")
+            else:
+                results.append(await self.sweep_series())
+        return results
@@ -0,0 +1,285 @@
+import heapq
+import itertools
+import json
+import logging
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import IO, Any
+
+__all__ = (
+    "Span",
+    "Trace",
+    "Tracer",
+    "current_trace_id",
+    "install_log_record_factory",
+    "span",
+)
+
+
+_span_ids = itertools.count(1)
+_current: ContextVar[tuple["Trace", "Span"] | None] = ContextVar("unmonitorr_trace", default=None)
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "attributes",
+        "end",
+        "name",
+        "parent_id",
+        "span_id",
+        "start",
+    )
+
+    def __init__(self, name: str, parent_id: int | None, attributes: dict[str, object]) -> None:
+        self.name = name
+        self.span_id = next(_span_ids)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end: float | None = None
+
+    @property
+    def duration(self) -> float:
+        """Return the span's duration in seconds, or the time elapsed so far if still open."""
+        return (self.end or time.perf_counter()) - self.start
+
+
+class Trace:
+    """The spans recorded while handling a single webhook."""
+
+    __slots__ = (
+        "finished",
+        "name",
+        "spans",
+        "started_at",
+        "trace_id",
+    )
+
+    def __init__(self, name: str) -> None:
+        self.trace_id = os.urandom(8).hex()
+        self.name = name
+        self.started_at = time.time()
+        self.spans: list[Span] = []
+        self.finished = False
+
+    @property
+    def root(self) -> Span:
+        return self.spans[0]
+
+    @property
+    def duration(self) -> float:
+        return self.root.duration
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the trace with span offsets and durations in milliseconds."""
+        start = self.root.start
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "spans": [
+                {
+                    "name": s.name,
+                    "span_id": s.span_id,
+                    "parent_id": s.parent_id,
+                    "offset_ms": round((s.start - start) * 1000, 3),
+                    "duration_ms": round(s.duration * 1000, 3),
+                    "attributes": s.attributes,
+                }
+                for s in self.spans
+            ],
+        }
+
+    def to_trace_events(self) -> list[dict[str, Any]]:
+        """Return the spans as Chrome Trace Event Format complete events."""
+        pid = os.getpid()
+        # tid groups a trace's spans onto a single row in trace viewers
+        tid = int(self.trace_id[:8], 16)
+        start = self.root.start
+        return [
+            {
+                "name": s.name,
+                "cat": "unmonitorr",
+                "ph": "X",
+                "ts": round((self.started_at + s.start - start) * 1_000_000),
+                "dur": round(s.duration * 1_000_000),
+                "pid": pid,
+                "tid": tid,
+                "args": {"trace_id": self.trace_id, **s.attributes},
+            }
+            for s in self.spans
+        ]
+
+
+@contextmanager
+def span(name: str, **attributes: object) -> Iterator[Span | None]:
+    """Time a child span of the current trace.
+
+    Does nothing when called outside of a trace, or after the trace has finished.
+
+    Parameters
+    ----------
+    name : str
+        The span name.
+    **attributes : object
+        Extra details recorded with the span.
+    """
+    current = _current.get()
+    if current is None or current[0].finished:
+        yield None
+        return
+
+    trace, parent = current
+    child = Span(name, parent.span_id, attributes)
+    trace.spans.append(child)
+    token = _current.set((trace, child))
+    try:
+        yield child
+    finally:
+        child.end = time.perf_counter()
+        _current.reset(token)
+
+
+def current_trace_id() -> str | None:
+    """Return the ID of the trace being recorded in the current context."""
+    current = _current.get()
+    return current[0].trace_id if current else None
+
+
+def install_log_record_factory() -> None:
+    """Attach the current trace ID to every log record as ``trace_id``."""
+    factory = logging.getLogRecordFactory()
+
+    def record_factory(*args: object, **kwargs: object) -> logging.LogRecord:
+        record = factory(*args, **kwargs)
+        record.trace_id = current_trace_id() or "-"
+        return record
+
+    logging.setLogRecordFactory(record_factory)
+
+
+class Tracer:
+    """Records a trace per webhook and keeps the slowest ones for inspection.
+
+    Parameters
+    ----------
+    keep : int
+        Number of slowest traces to keep. 0 keeps none.
+    export_path : str | None
+        Optional file that every finished trace is appended to, in the Chrome Trace Event
+        Format. It can be opened with Perfetto or ``chrome://tracing``. Traces are written
+        on a background thread, in the order they finished.
+    """
+
+    __slots__ = (
+        "_export",
+        "_seq",
+        "_slowest",
+        "_writer",
+        "export_path",
+        "keep",
+        "traced",
+    )
+
+    def __init__(self, *, keep: int = 20, export_path: str | None = None) -> None:
+        self.keep = keep
+        self.export_path = export_path
+        self._slowest: list[tuple[float, int, Trace]] = []
+        self._seq = itertools.count()
+        self._export: IO[str] | None = None
+        self._writer: ThreadPoolExecutor | None = None
+        self.traced: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.keep > 0 or bool(self.export_path)
+
+    @contextmanager
+    def trace(self, name: str, **attributes: object) -> Iterator[Span | None]:
+        """Record a new trace, or a child span if a trace is already being recorded.
+
+        Parameters
+        ----------
+        name : str
+            The name of the trace's root span.
+        **attributes : object
+            Extra details recorded with the root span.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        current = _current.get()
+        if current is not None and not current[0].finished:
+            with span(name, **attributes) as child:
+                yield child
+            return
+
+        trace = Trace(name)
+        root = Span(name, None, attributes)
+        trace.spans.append(root)
+        token = _current.set((trace, root))
+        try:
+            yield root
+        finally:
+            root.end = time.perf_counter()
+            trace.finished = True
+            _current.reset(token)
+            self._finish(trace)
+
+    def _finish(self, trace: Trace) -> None:
+        self.traced += 1
+        if self.keep > 0:
+            item = (trace.duration, next(self._seq), trace)
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, item)
+            else:
+                heapq.heappushpop(self._slowest, item)
+        if self.export_path:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trace-export")
+            # the events are taken on the event loop, and only encoded and written off it
+            self._writer.submit(self._write, trace.to_trace_events())
+
+    def _write(self, events: list[dict[str, Any]]) -> None:
+        if self._export is None:
+            path = Path(self.export_path)
+            is_new = not path.exists() or path.stat().st_size == 0
+            self._export = path.open("a", encoding="utf-8")
+            if is_new:
+                # the closing bracket is optional in the JSON array format, so the file
+                # stays valid while traces are appended
+                self._export.write("[\n")
+        for event in events:
+            self._export.write(json.dumps(event, default=str) + ",\n")
+        self._export.flush()
+
+    def slowest(self) -> list[Trace]:
+        """Return the kept traces, slowest first."""
+        return [trace for _, _, trace in sorted(self._slowest, reverse=True)]
+
+    def close(self) -> None:
+        """Wait for queued traces to be written, then close the export file, if open."""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._export is not None:
+            self._export.close()
+            self._export = None
+
+    def stats(self) -> dict[str, Any]:
+        """Return tracing statistics."""
+        slowest = max(self._slowest)[0] if self._slowest else 0.0
+        return {
+            "traced": self.traced,
+            "kept": len(self._slowest),
+            "slowest_ms": round(slowest * 1000, 3),
+        }
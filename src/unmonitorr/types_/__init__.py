@@ -1,3 +1,4 @@
+from .history import *
 from .radarr import *
 from .sonarr import *
 from .webhook import *
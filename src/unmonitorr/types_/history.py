@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from .base import SharedBaseModel
+from .radarr import RadarrAPIMovie
+from .webhook import WebhookEpisode, WebhookSeries
+
+__all__ = (
+    "RadarrHistoryRecord",
+    "SonarrHistoryRecord",
+)
+
+
+class RadarrHistoryRecord(SharedBaseModel):
+    id: int
+    movie_id: int
+    event_type: str
+    date: datetime
+    movie: RadarrAPIMovie | None = None
+
+    def __repr__(self) -> str:
+        return f"<RadarrHistory, {self.__str__()}>"
+
+    def __str__(self) -> str:
+        return f"id={self.id}, movie_id={self.movie_id}, event_type={self.event_type}"
+
+
+class HistoryEpisode(WebhookEpisode):
+    monitored: bool
+
+
+class SonarrHistoryRecord(SharedBaseModel):
+    id: int
+    series_id: int
+    episode_id: int
+    event_type: str
+    date: datetime
+    series: WebhookSeries | None = None
+    episode: HistoryEpisode | None = None
+
+    def __repr__(self) -> str:
+        return f"<SonarrHistory, {self.__str__()}>"
+
+    def __str__(self) -> str:
+        return (
+            f"id={self.id}, series_id={self.series_id}, episode_id={self.episode_id}, "
+            f"event_type={self.event_type}"
+        )
@@ -11,6 +11,7 @@ class RadarrAPIMovie(SharedBaseModel):
     path: str
     monitored: bool
     id: int
+    has_file: bool = False
 
     def unmonitor(self) -> None:
         """Unmonitor the movie by setting monitored to False."""
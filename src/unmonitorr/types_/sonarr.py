@@ -5,6 +5,7 @@ __all__ = ("SonarrAPISeries",)
 
 class SeasonStatistics(SharedBaseModel):
     episode_count: int
+    episode_file_count: int
     total_episode_count: int
     size_on_disk: int
     percent_of_episodes: float
@@ -14,6 +15,11 @@ class SeasonStatistics(SharedBaseModel):
         """Return True if the series has 100% of available episodes."""
         return self.percent_of_episodes == 100  # noqa: PLR2004
 
+    @property
+    def missing_count(self) -> int:
+        """Return the number of available episodes that have not been downloaded."""
+        return max(0, self.episode_count - self.episode_file_count)
+
 
 class Season(SharedBaseModel):
     season_number: int
@@ -25,6 +31,12 @@ class Season(SharedBaseModel):
         """Return True if the season has 100% of available episodes."""
         return self.statistics.percent_of_episodes == 100  # noqa: PLR2004
 
+    @property
+    def is_finished(self) -> bool:
+        """Return True if every episode in the season has aired and is available."""
+        statistics = self.statistics
+        return self.is_complete and statistics.episode_count == statistics.total_episode_count
+
     def unmonitor(self) -> None:
         """Unmonitor the season"""
         self.monitored = False
@@ -1,14 +1,31 @@
+from typing import Annotated, Any
+
+from pydantic import ConfigDict, Discriminator, Tag, TypeAdapter
+
 from .base import SharedBaseModel
 
 __all__ = (
     "RadarrWebhookPayload",
     "SonarrWebhookPayload",
+    "WebhookEnvelope",
     "WebhookEpisode",
     "WebhookMovie",
+    "WebhookPayload",
+    "WebhookPayloadAdapter",
     "WebhookSeries",
 )
 
 
+class WebhookEnvelope(SharedBaseModel):
+    """The fields shared by every Radarr and Sonarr payload, used to filter events cheaply."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    event_type: str
+    is_upgrade: bool = False
+    instance_name: str = ""
+
+
 class WebhookMovie(SharedBaseModel):
     id: int
     title: str
@@ -69,3 +86,30 @@ class SonarrWebhookPayload(SharedBaseModel):
     def episode_ids_to_unmonitor(self) -> list[int]:
         """List the episode IDs to send to the unmonitor endpoint."""
         return [e.id for e in self.episodes]
+
+
+def _payload_kind(value: Any) -> str | None:  # noqa: ANN401
+    """Tell Radarr and Sonarr payloads apart by their top-level keys."""
+    if isinstance(value, dict):
+        if "movie" in value:
+            return "radarr"
+        if "series" in value:
+            return "sonarr"
+        return None
+
+    if isinstance(value, RadarrWebhookPayload):
+        return "radarr"
+    if isinstance(value, SonarrWebhookPayload):
+        return "sonarr"
+    return None
+
+
+WebhookPayload = Annotated[
+    Annotated[RadarrWebhookPayload, Tag("radarr")] | Annotated[SonarrWebhookPayload, Tag("sonarr")],
+    Discriminator(_payload_kind),
+]
+
+# validates a payload of unknown origin with a single pass
+WebhookPayloadAdapter: TypeAdapter[RadarrWebhookPayload | SonarrWebhookPayload] = TypeAdapter(
+    WebhookPayload
+)
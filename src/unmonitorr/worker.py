@@ -0,0 +1,154 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from unmonitorr import log
+from unmonitorr.metrics import WEBHOOK_QUEUE_WAIT
+from unmonitorr.types_ import RadarrWebhookPayload, SonarrWebhookPayload
+
+__all__ = ("WebhookQueue",)
+
+logger = log.get_logger(__name__)
+
+
+PayloadT = RadarrWebhookPayload | SonarrWebhookPayload
+
+
+class Job:
+    """A webhook payload waiting to be processed."""
+
+    __slots__ = ("enqueued_at", "journal_id", "payload")
+
+    def __init__(self, payload: PayloadT, journal_id: int | None = None) -> None:
+        self.payload = payload
+        self.journal_id = journal_id
+        self.enqueued_at = time.monotonic()
+
+
+class WebhookQueue:
+    """A bounded in-process queue of webhook payloads drained by a pool of workers.
+
+    Parameters
+    ----------
+    process : Callable[[PayloadT, int | None], Awaitable[Any]]
+        Coroutine function called by a worker with each queued payload and its journal ID.
+    maxsize : int
+        Maximum number of payloads waiting in the queue.
+    workers : int
+        Number of worker tasks draining the queue.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[PayloadT, int | None], Awaitable[Any]],
+        *,
+        maxsize: int = 100,
+        workers: int = 2,
+    ) -> None:
+        self.process = process
+        self.workers = workers
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=maxsize)
+        self._tasks: list[asyncio.Task[None]] = []
+
+        self.enqueued: int = 0
+        self.dequeued: int = 0
+        self.rejected: int = 0
+        self.processed: int = 0
+        self.failed: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+        self.last_wait: float = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of payloads waiting in the queue."""
+        return self._queue.qsize()
+
+    def submit(self, payload: PayloadT, journal_id: int | None = None) -> bool:
+        """Queue a payload for processing.
+
+        Returns
+        -------
+        bool
+            True if the payload was queued, False if the queue is full.
+        """
+        try:
+            self._queue.put_nowait(Job(payload, journal_id))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+
+        self.enqueued += 1
+        return True
+
+    async def put(self, payload: PayloadT, journal_id: int | None = None) -> None:
+        """Queue a payload for processing, waiting for space if the queue is full."""
+        await self._queue.put(Job(payload, journal_id))
+        self.enqueued += 1
+
+    async def start(self) -> None:
+        """Start the worker tasks."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"webhook-worker-{n}")
+            for n in range(self.workers)
+        ]
+        logger.info("Started %s webhook queue workers.", self.workers)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Wait up to `timeout` seconds for queued payloads to finish, then stop the workers."""
+        if not self._tasks:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except TimeoutError:
+            logger.warning(
+                "Webhook queue did not drain before shutdown: %s payloads dropped.", self.depth
+            )
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Stopped webhook queue workers.")
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+
+            wait = time.monotonic() - job.enqueued_at
+            self.dequeued += 1
+            self.last_wait = wait
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            WEBHOOK_QUEUE_WAIT.observe(wait)
+
+            try:
+                await self.process(job.payload, job.journal_id)
+            except Exception:
+                self.failed += 1
+                logger.exception("Unhandled error processing queued payload: %s", job.payload)
+            else:
+                self.processed += 1
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth, throughput and wait time statistics."""
+        return {
+            "depth": self.depth,
+            "maxsize": self._queue.maxsize,
+            "workers": self.workers,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "processed": self.processed,
+            "failed": self.failed,
+            "wait_seconds": {
+                "last": self.last_wait,
+                "avg": self.total_wait / self.dequeued if self.dequeued else 0.0,
+                "max": self.max_wait,
+            },
+        }
@@ -0,0 +1,40 @@
+"""Webhook payloads shared by the tests."""
+
+from typing import Any
+
+from unmonitorr.types_ import RadarrWebhookPayload, SonarrWebhookPayload
+
+
+def make_movie_payload(movie_id: int = 1) -> RadarrWebhookPayload:
+    return RadarrWebhookPayload.model_validate(
+        {
+            "movie": {"id": movie_id, "title": "Movie", "year": 2000, "folderPath": "/movies/m"},
+            "eventType": "Download",
+            "instanceName": "Radarr",
+            "applicationUrl": "",
+        }
+    )
+
+
+def make_series_payload(
+    *episode_ids: int, series_id: int = 1, season_number: int = 1
+) -> SonarrWebhookPayload:
+    episodes: list[dict[str, Any]] = [
+        {
+            "id": id,
+            "episodeNumber": id,
+            "seasonNumber": season_number,
+            "title": "Episode",
+            "seriesId": series_id,
+        }
+        for id in episode_ids
+    ]
+    return SonarrWebhookPayload.model_validate(
+        {
+            "series": {"id": series_id, "title": "Series", "path": "/tv/series", "year": 2000},
+            "episodes": episodes,
+            "eventType": "Download",
+            "instanceName": "Sonarr",
+            "applicationUrl": "",
+        }
+    )
@@ -1,7 +1,12 @@
 from typing import Any
 import unittest
 
-from src.unmonitorr.types_ import SonarrAPISeries, RadarrAPIMovie
+from src.unmonitorr.types_ import (
+    SonarrAPISeries,
+    RadarrAPIMovie,
+    RadarrHistoryRecord,
+    SonarrHistoryRecord,
+)
 
 
 class TestAPIModels(unittest.TestCase):
@@ -203,6 +208,7 @@ class TestAPIModels(unittest.TestCase):
         self.assertEqual(movie.id, 2936)
         self.assertEqual(movie.title, "Bill Burr: I'm Sorry You Feel That Way")
         self.assertEqual(movie.monitored, True)
+        self.assertEqual(movie.has_file, True)
 
     def test_valid_sonarr_api_series(self) -> None:
         series = SonarrAPISeries.model_validate(self.sonarr_api_payload)
@@ -217,6 +223,52 @@ class TestAPIModels(unittest.TestCase):
 
         self.assertEqual(series.monitored, False)
 
+    def test_valid_radarr_history_record(self) -> None:
+        record = RadarrHistoryRecord.model_validate(
+            {
+                "movieId": 2936,
+                "sourceTitle": "Bill.Burr.Im.Sorry.You.Feel.That.Way.2014.1080p.WEB-DL",
+                "date": "2021-03-22T14:59:42Z",
+                "eventType": "downloadFolderImported",
+                "movie": self.radarr_api_payload,
+                "id": 10412,
+            }
+        )
+
+        self.assertEqual(record.id, 10412)
+        self.assertEqual(record.movie_id, 2936)
+        self.assertIsNotNone(record.movie)
+        self.assertEqual(record.movie.path, self.radarr_api_payload["path"])
+
+    def test_valid_sonarr_history_record(self) -> None:
+        record = SonarrHistoryRecord.model_validate(
+            {
+                "episodeId": 51233,
+                "seriesId": 874,
+                "sourceTitle": "Agatha.All.Along.S01E09.1080p.WEB.h264",
+                "date": "2024-10-31T02:13:20Z",
+                "eventType": "downloadFolderImported",
+                "episode": {
+                    "seriesId": 874,
+                    "episodeFileId": 61944,
+                    "seasonNumber": 1,
+                    "episodeNumber": 9,
+                    "title": "Follow Me My Friend / To Glory at the End",
+                    "monitored": True,
+                    "id": 51233,
+                },
+                "series": self.sonarr_api_payload,
+                "id": 88310,
+            }
+        )
+
+        self.assertEqual(record.id, 88310)
+        self.assertEqual(record.series_id, 874)
+        self.assertIsNotNone(record.series)
+        self.assertEqual(record.series.title, "Agatha All Along")
+        self.assertIsNotNone(record.episode)
+        self.assertEqual(record.episode.episode_number, 9)
+
     def test_radarr_api_model_dump(self) -> None:
         """Validate the the dumped radarr model matches the original."""
         movie = RadarrAPIMovie.model_validate(self.radarr_api_payload)
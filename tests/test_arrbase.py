@@ -0,0 +1,234 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from unmonitorr.arrs import (
+    BaseArrClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    HTTPException,
+    RetryPolicy,
+    SonarrClient,
+)
+
+
+class TestSessionReplacement(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+        async def handler(request: web.Request) -> web.Response:
+            if request.match_info["name"] == "slow":
+                self.started.set()
+                await self.release.wait()
+            return web.json_response({"name": request.match_info["name"]})
+
+        app = web.Application()
+        app.router.add_get("/api/v3/{name}", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.uri = str(self.server.make_url("")).rstrip("/")
+        self.client = BaseArrClient(self.uri, "key")
+        await self.client.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.close()
+
+    async def test_request_in_flight_finishes_on_the_replaced_session(self) -> None:
+        slow = asyncio.create_task(
+            self.client.request("GET", f"{self.client.base_url}/slow", self.client.headers)
+        )
+        await self.started.wait()
+        replaced = self.client.session
+
+        await self.client.update_client_config(self.uri, "new-key")
+
+        self.assertIsNot(self.client.session, replaced)
+        self.assertFalse(replaced.closed)
+        fast = await self.client.request("GET", f"{self.client.base_url}/fast", {})
+        self.assertEqual(fast, {"name": "fast"})
+
+        self.release.set()
+        self.assertEqual(await slow, {"name": "slow"})
+        await asyncio.gather(*self.client._closing)
+        self.assertTrue(replaced.closed)
+
+    async def test_idle_session_is_closed_when_replaced(self) -> None:
+        replaced = self.client.session
+
+        await self.client.update_client_config(self.uri, "new-key")
+        await asyncio.gather(*self.client._closing)
+
+        self.assertTrue(replaced.closed)
+        self.assertFalse(self.client.session.closed)
+
+
+class TestRequestRetries(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        # the statuses answered in turn, then 200
+        self.statuses: list[int] = []
+        self.requests: list[str] = []
+
+        async def handler(request: web.Request) -> web.Response:
+            self.requests.append(request.method)
+            status = self.statuses.pop(0) if self.statuses else 200
+            return web.json_response({"status": status}, status=status)
+
+        app = web.Application()
+        app.router.add_route("*", "/api/v3/resource", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.breaker = CircuitBreaker(failure_threshold=5, reset_timeout=60.0)
+        self.client = BaseArrClient(
+            str(self.server.make_url("")).rstrip("/"),
+            "key",
+            retry=RetryPolicy(retries=2, base_delay=0.001),
+            breaker=self.breaker,
+        )
+        self.url = f"{self.client.base_url}/resource"
+        await self.client.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.close()
+
+    async def test_get_is_retried_after_a_server_error(self) -> None:
+        self.statuses = [503, 502]
+
+        self.assertEqual(await self.client.request("GET", self.url, {}), {"status": 200})
+        self.assertEqual(self.requests, ["GET"] * 3)
+        self.assertEqual(self.client.retry.retried, 2)
+        self.assertEqual(self.breaker.state, "closed")
+
+    async def test_retries_are_limited(self) -> None:
+        self.statuses = [503, 503, 503]
+
+        with self.assertRaises(HTTPException) as raised:
+            await self.client.request("GET", self.url, {})
+        self.assertEqual(raised.exception.status, 503)
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_client_errors_are_not_retried(self) -> None:
+        self.statuses = [404]
+
+        with self.assertRaises(HTTPException):
+            await self.client.request("GET", self.url, {})
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.breaker.stats()["consecutive_failures"], 0)
+
+    async def test_only_idempotent_updates_are_retried(self) -> None:
+        self.statuses = [503]
+        with self.assertRaises(HTTPException):
+            await self.client.request("POST", self.url, {}, json={})
+        self.assertEqual(self.requests, ["POST"])
+
+        self.statuses = [503]
+        await self.client.request("PUT", self.url, {}, json={}, idempotent=True)
+        self.assertEqual(self.requests, ["POST", "PUT", "PUT"])
+
+    async def test_open_circuit_fails_fast(self) -> None:
+        self.statuses = [503] * 5
+
+        with self.assertRaises(HTTPException):
+            await self.client.request("GET", self.url, {})
+        with self.assertRaises(CircuitOpenError):
+            await self.client.request("GET", self.url, {})
+        with self.assertRaises(CircuitOpenError):
+            await self.client.request("GET", self.url, {})
+        self.assertEqual(len(self.requests), 5)
+
+
+class TestEditorFallback(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        # the status the editor answers with, for requests with and without IDs
+        self.editor_status = 405
+        self.probe_status = 405
+        self.requests: list[tuple[str, str]] = []
+
+        async def editor(request: web.Request) -> web.Response:
+            body = await request.json()
+            self.requests.append((request.method, f"editor {body['seriesIds']}"))
+            status = self.editor_status if body["seriesIds"] else self.probe_status
+            return web.json_response({}, status=status)
+
+        async def series(request: web.Request) -> web.Response:
+            self.requests.append((request.method, request.match_info["id"]))
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_delete("/api/v3/series/editor", editor)
+        app.router.add_delete("/api/v3/series/{id}", series)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.uri = str(self.server.make_url("")).rstrip("/")
+        self.client = SonarrClient(self.uri, "key")
+        await self.client.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.close()
+
+    async def test_unsupported_editor_falls_back_to_single_deletes(self) -> None:
+        self.assertTrue(await self.client.bulk_delete_series([1, 2]))
+
+        self.assertFalse(self.client.editor_supported)
+        self.assertEqual(
+            self.requests,
+            [
+                ("DELETE", "editor [1, 2]"),
+                ("DELETE", "editor []"),
+                ("DELETE", "1"),
+                ("DELETE", "2"),
+            ],
+        )
+
+        self.requests.clear()
+        self.assertTrue(await self.client.bulk_delete_series([3]))
+        self.assertEqual(self.requests, [("DELETE", "3")])
+
+    async def test_stale_id_falls_back_without_disabling_the_editor(self) -> None:
+        self.editor_status, self.probe_status = 404, 200
+
+        self.assertTrue(await self.client.bulk_delete_series([1]))
+        self.assertTrue(await self.client.bulk_delete_series([2]))
+
+        self.assertTrue(self.client.editor_supported)
+        # the editor is only probed once
+        self.assertEqual(
+            self.requests,
+            [
+                ("DELETE", "editor [1]"),
+                ("DELETE", "editor []"),
+                ("DELETE", "1"),
+                ("DELETE", "editor [2]"),
+                ("DELETE", "2"),
+            ],
+        )
+
+    async def test_other_errors_do_not_fall_back(self) -> None:
+        self.editor_status = 500
+
+        self.assertFalse(await self.client.bulk_delete_series([1]))
+        self.assertTrue(self.client.editor_supported)
+        self.assertEqual(self.requests, [("DELETE", "editor [1]")])
+
+    async def test_changed_config_enables_the_editor_again(self) -> None:
+        await self.client.bulk_delete_series([1])
+        self.assertFalse(self.client.editor_supported)
+
+        await self.client.update_client_config(self.uri, "new-key")
+
+        self.editor_status = 200
+        self.requests.clear()
+        self.assertTrue(await self.client.bulk_delete_series([2]))
+        self.assertEqual(self.requests, [("DELETE", "editor [2]")])
+
+
+if __name__ == "__main__":
+    unittest.main()
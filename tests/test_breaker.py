@@ -0,0 +1,85 @@
+import asyncio
+import time
+import unittest
+
+from unmonitorr.arrs import CircuitBreaker
+
+RESET_TIMEOUT = 0.05
+
+
+class TestCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=RESET_TIMEOUT)
+
+    def open_circuit(self) -> None:
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.record_failure())
+
+    def test_circuit_opens_after_consecutive_failures(self) -> None:
+        self.assertFalse(self.breaker.record_failure())
+        self.breaker.record_success()
+        self.assertFalse(self.breaker.record_failure())
+        self.assertTrue(self.breaker.record_failure())
+
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.stats()["rejected"], 1)
+        self.assertEqual(self.breaker.opened, 1)
+
+    def test_half_open_circuit_lets_a_single_probe_through(self) -> None:
+        self.open_circuit()
+        time.sleep(RESET_TIMEOUT)
+
+        self.assertEqual(self.breaker.state, "half_open")
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+    def test_successful_probe_closes_the_circuit(self) -> None:
+        self.open_circuit()
+        time.sleep(RESET_TIMEOUT)
+        self.breaker.allow()
+
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, "closed")
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_probe_opens_the_circuit_again(self) -> None:
+        self.open_circuit()
+        time.sleep(RESET_TIMEOUT)
+        self.breaker.allow()
+
+        self.assertTrue(self.breaker.record_failure())
+
+        self.assertEqual(self.breaker.state, "open")
+        self.assertEqual(self.breaker.opened, 1)
+
+    def test_probe_that_never_reports_back_is_replaced(self) -> None:
+        self.open_circuit()
+        time.sleep(RESET_TIMEOUT)
+        self.assertTrue(self.breaker.allow())
+
+        time.sleep(RESET_TIMEOUT)
+
+        self.assertTrue(self.breaker.allow())
+
+    async def test_wait_returns_once_the_circuit_closes(self) -> None:
+        self.open_circuit()
+        waiting = asyncio.create_task(self.breaker.wait())
+        await asyncio.sleep(0)
+        self.assertFalse(waiting.done())
+
+        self.breaker.record_success()
+
+        await asyncio.wait_for(waiting, 1.0)
+
+    async def test_wait_returns_when_a_probe_may_be_sent(self) -> None:
+        self.open_circuit()
+
+        await asyncio.wait_for(self.breaker.wait(), 1.0)
+
+        self.assertEqual(self.breaker.state, "half_open")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import contextvars
+import unittest
+
+from unmonitorr import deadline
+from unmonitorr.coalesce import EpisodeCoalescer
+from unmonitorr.types_ import SonarrWebhookPayload
+
+from payloads import make_series_payload
+
+
+class TestEpisodeCoalescer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.batches: list[list[SonarrWebhookPayload]] = []
+        self.results: list[bool] = []
+
+    async def flush(self, batch: list[SonarrWebhookPayload]) -> bool:
+        self.batches.append(batch)
+        return self.results.pop(0) if self.results else True
+
+    async def test_payloads_within_the_window_are_flushed_together(self) -> None:
+        coalescer = EpisodeCoalescer(self.flush, window=0.05)
+
+        results = await asyncio.gather(
+            coalescer.add(make_series_payload(1)),
+            coalescer.add(make_series_payload(2)),
+            coalescer.add(make_series_payload(3, 4, series_id=2)),
+        )
+
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual([p.series.id for p in self.batches[0]], [1, 1, 2])
+        self.assertEqual(coalescer.stats()["episodes"], 4)
+
+    async def test_full_batch_is_flushed_without_waiting_for_the_window(self) -> None:
+        coalescer = EpisodeCoalescer(self.flush, window=60.0, max_batch=3)
+
+        result = await asyncio.wait_for(
+            asyncio.gather(
+                coalescer.add(make_series_payload(1)),
+                coalescer.add(make_series_payload(2, 3)),
+            ),
+            timeout=1.0,
+        )
+
+        self.assertEqual(result, [True, True])
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(coalescer.stats()["pending"], 0)
+
+    async def test_each_waiter_gets_the_result_of_its_own_batch(self) -> None:
+        coalescer = EpisodeCoalescer(self.flush, window=60.0, max_batch=2)
+        self.results = [False, True]
+
+        first = await coalescer.add(make_series_payload(1, 2))
+        second = await coalescer.add(make_series_payload(3, 4, series_id=2))
+
+        self.assertFalse(first)
+        self.assertTrue(second)
+        self.assertEqual(len(self.batches), 2)
+
+    async def test_failed_flush_is_reported_to_waiters(self) -> None:
+        async def flush(_: list[SonarrWebhookPayload]) -> bool:
+            raise RuntimeError("boom")
+
+        coalescer = EpisodeCoalescer(flush, window=0.01)
+
+        with self.assertLogs("unmonitorr.coalesce", "ERROR"):
+            self.assertFalse(await coalescer.add(make_series_payload(1)))
+
+    async def test_submit_does_not_wait_for_the_batch(self) -> None:
+        coalescer = EpisodeCoalescer(self.flush, window=0.05)
+
+        futures = [coalescer.submit(make_series_payload(id)) for id in (1, 2, 3)]
+        self.assertEqual(self.batches, [])
+
+        self.assertEqual(await asyncio.gather(*futures), [True, True, True])
+        self.assertEqual(len(self.batches), 1)
+
+    async def test_batch_is_flushed_in_its_own_context(self) -> None:
+        var: contextvars.ContextVar[str] = contextvars.ContextVar("var", default="unset")
+        seen: list[tuple[str, float | None]] = []
+
+        async def flush(_: list[SonarrWebhookPayload]) -> bool:
+            seen.append((var.get(), deadline.remaining()))
+            return True
+
+        coalescer = EpisodeCoalescer(flush, window=0.01, max_batch=2)
+        var.set("payload")
+        with deadline.deadline(60.0):
+            # one batch flushed by its window, the other by max_batch
+            await coalescer.add(make_series_payload(1))
+            await coalescer.add(make_series_payload(2, 3))
+
+        self.assertEqual(seen, [("unset", None), ("unset", None)])
+
+    async def test_stop_flushes_buffered_payloads(self) -> None:
+        coalescer = EpisodeCoalescer(self.flush, window=60.0)
+        waiting = asyncio.create_task(coalescer.add(make_series_payload(1)))
+        await asyncio.sleep(0)
+
+        await coalescer.stop()
+
+        self.assertTrue(await waiting)
+        self.assertEqual(len(self.batches), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import time
+import unittest
+
+from src.unmonitorr.completeness import CompletenessIndex
+
+SERIES_ONLY = {"series": True, "ended_only": False, "seasons": False}
+
+
+class TestCompletenessIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = CompletenessIndex(max_age=3600.0, maxsize=3)
+
+    def test_unknown_series_is_fetched(self) -> None:
+        self.assertTrue(self.index.needs_fetch(1, **SERIES_ONLY))
+        self.index.record_imports(1, [1])
+        self.assertEqual(len(self.index), 0)
+
+    def test_series_missing_episodes_is_not_fetched_until_counted_down(self) -> None:
+        self.index.update(1, {1: 0, 2: 2}, ended=True)
+        self.assertFalse(self.index.needs_fetch(1, **SERIES_ONLY))
+
+        self.index.record_imports(1, [2])
+        self.assertFalse(self.index.needs_fetch(1, **SERIES_ONLY))
+
+        # imports for complete or unknown seasons are ignored
+        self.index.record_imports(1, [1, 5])
+        self.assertFalse(self.index.needs_fetch(1, **SERIES_ONLY))
+
+        self.index.record_imports(1, [2])
+        self.assertTrue(self.index.needs_fetch(1, **SERIES_ONLY))
+        self.assertEqual(self.index.stats()["hits"], 3)
+
+    def test_complete_series_is_only_fetched_if_it_can_be_handled(self) -> None:
+        self.index.update(1, {1: 0}, ended=False)
+        self.assertFalse(self.index.needs_fetch(1, series=True, ended_only=True, seasons=False))
+        self.assertFalse(self.index.needs_fetch(1, series=False, ended_only=False, seasons=False))
+        self.assertTrue(self.index.needs_fetch(1, series=True, ended_only=False, seasons=False))
+
+    def test_completed_season_is_fetched_for_season_handling(self) -> None:
+        self.index.update(1, {1: 1, 2: 4}, ended=False)
+        self.index.record_imports(1, [1])
+        self.assertFalse(self.index.needs_fetch(1, series=True, ended_only=True, seasons=False))
+        self.assertTrue(self.index.needs_fetch(1, series=True, ended_only=True, seasons=True))
+
+    def test_wrong_count_is_corrected_by_the_next_fetch(self) -> None:
+        self.index.update(1, {1: 1}, ended=True)
+        self.index.record_imports(1, [1])
+        self.assertTrue(self.index.needs_fetch(1, **SERIES_ONLY))
+
+        self.index.update(1, {1: 1}, ended=True)
+        self.assertFalse(self.index.needs_fetch(1, **SERIES_ONLY))
+        self.assertEqual(self.index.stats()["corrections"], 1)
+
+    def test_expired_entry_is_fetched(self) -> None:
+        index = CompletenessIndex(max_age=0.01)
+        index.update(1, {1: 3}, ended=True)
+        time.sleep(0.02)
+        self.assertTrue(index.needs_fetch(1, **SERIES_ONLY))
+
+    def test_least_recently_used_series_is_dropped(self) -> None:
+        for series_id in (1, 2, 3):
+            self.index.update(series_id, {1: 1}, ended=True)
+        self.index.needs_fetch(1, **SERIES_ONLY)
+        self.index.update(4, {1: 1}, ended=True)
+        self.index.discard(3)
+
+        self.assertEqual(len(self.index), 2)
+        self.assertFalse(self.index.needs_fetch(1, **SERIES_ONLY))
+        self.assertTrue(self.index.needs_fetch(2, **SERIES_ONLY))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import time
+import unittest
+
+from src.unmonitorr.deadline import deadline, expired, remaining
+
+
+class TestDeadline(unittest.TestCase):
+    def test_no_deadline_outside_a_context(self) -> None:
+        self.assertIsNone(remaining())
+        self.assertFalse(expired())
+
+    def test_disabled_budget_sets_no_deadline(self) -> None:
+        with deadline(0):
+            self.assertIsNone(remaining())
+
+    def test_remaining_counts_down_and_expires(self) -> None:
+        with deadline(0.05):
+            left = remaining()
+            self.assertIsNotNone(left)
+            self.assertLessEqual(left, 0.05)
+            self.assertFalse(expired())
+
+            time.sleep(0.06)
+            self.assertTrue(expired())
+            self.assertEqual(remaining(), 0.0)
+
+        self.assertIsNone(remaining())
+
+    def test_nested_deadline_cannot_extend_the_budget(self) -> None:
+        with deadline(0.05), deadline(60):
+            self.assertLessEqual(remaining(), 0.05)
+
+        with deadline(60), deadline(0.05):
+            self.assertLessEqual(remaining(), 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
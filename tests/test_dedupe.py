@@ -0,0 +1,115 @@
+import asyncio
+import unittest
+
+from unmonitorr.config import Config
+from unmonitorr.dedupe import RecentlySeen, dedupe_key
+from unmonitorr.server import WebhookHandler
+from unmonitorr.types_ import RadarrWebhookPayload
+
+from payloads import make_movie_payload, make_series_payload
+
+
+class TestDedupeKey(unittest.TestCase):
+    def test_sonarr_key_ignores_episode_order(self) -> None:
+        self.assertEqual(
+            dedupe_key(make_series_payload(1, 2)), dedupe_key(make_series_payload(2, 1))
+        )
+        self.assertNotEqual(
+            dedupe_key(make_series_payload(1)), dedupe_key(make_series_payload(1, 2))
+        )
+
+    def test_radarr_key_is_the_movie(self) -> None:
+        self.assertEqual(dedupe_key(make_movie_payload(1)), dedupe_key(make_movie_payload(1)))
+        self.assertNotEqual(dedupe_key(make_movie_payload(1)), dedupe_key(make_movie_payload(2)))
+
+
+class TestRecentlySeen(unittest.IsolatedAsyncioTestCase):
+    async def test_keys_expire_after_the_window(self) -> None:
+        recently_seen = RecentlySeen(window=0.01)
+        recently_seen.add("key")
+        self.assertTrue(recently_seen.seen("key"))
+
+        await asyncio.sleep(0.02)
+
+        self.assertFalse(recently_seen.seen("key"))
+        self.assertEqual(len(recently_seen), 0)
+
+    async def test_oldest_key_is_dropped(self) -> None:
+        recently_seen = RecentlySeen(maxsize=2)
+        for key in ("a", "b", "c"):
+            recently_seen.add(key)
+
+        self.assertEqual([recently_seen.seen(key) for key in "abc"], [False, True, True])
+
+    async def test_only_successful_work_is_remembered(self) -> None:
+        recently_seen = RecentlySeen()
+        recently_seen.begin("failed")
+        recently_seen.begin("applied")
+        waiting = recently_seen.in_flight("applied")
+
+        recently_seen.end("failed", success=False)
+        recently_seen.end("applied", success=True)
+
+        self.assertTrue(await waiting)
+        self.assertIsNone(recently_seen.in_flight("applied"))
+        self.assertFalse(recently_seen.seen("failed"))
+        self.assertTrue(recently_seen.seen("applied"))
+
+
+class TestDuplicateHandling(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        config = Config()
+        config.dedupe_window = 3600.0
+        self.handler = WebhookHandler(config)
+        self.handled: list[RadarrWebhookPayload] = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.result = True
+
+        async def handle_movie(payload: RadarrWebhookPayload) -> bool:
+            self.handled.append(payload)
+            await self.release.wait()
+            return self.result
+
+        self.handler.handle_movie = handle_movie
+
+    async def test_concurrent_duplicates_share_one_handling(self) -> None:
+        self.release.clear()
+        first = asyncio.create_task(self.handler.process(make_movie_payload()))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(self.handler.process(make_movie_payload()))
+        await asyncio.sleep(0)
+
+        self.release.set()
+
+        self.assertEqual(await asyncio.gather(first, second), [True, True])
+        self.assertEqual(len(self.handled), 1)
+
+    async def test_duplicate_of_failed_work_fails(self) -> None:
+        self.release.clear()
+        self.result = False
+        first = asyncio.create_task(self.handler.process(make_movie_payload()))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(self.handler.process(make_movie_payload()))
+        await asyncio.sleep(0)
+
+        self.release.set()
+
+        self.assertEqual(await asyncio.gather(first, second), [False, False])
+        self.assertFalse(self.handler.recently_seen.seen(dedupe_key(make_movie_payload())))
+
+    async def test_duplicates_do_not_refresh_the_window(self) -> None:
+        recently_seen = self.handler.recently_seen
+        self.assertTrue(await self.handler.process(make_movie_payload()))
+        key = dedupe_key(make_movie_payload())
+        applied = recently_seen._keys[key]
+
+        self.assertTrue(await self.handler.process(make_movie_payload()))
+
+        self.assertEqual(recently_seen._keys[key], applied)
+        self.assertEqual(len(self.handled), 1)
+        self.assertEqual(recently_seen.stats()["suppressed"], {"Download": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
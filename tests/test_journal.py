@@ -0,0 +1,81 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from unmonitorr.journal import Journal
+
+
+class TestJournal(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "journal.db")
+        self.journal = await self.open_journal()
+
+    async def asyncTearDown(self) -> None:
+        await self.journal.close()
+        self.directory.cleanup()
+
+    async def open_journal(self, **kwargs: float) -> Journal:
+        journal = Journal(self.path, max_attempts=2, **kwargs)
+        await journal.open()
+        return journal
+
+    async def test_concurrent_writes_are_grouped_into_one_commit(self) -> None:
+        ids = await asyncio.gather(*(self.journal.append("sonarr", f"{i}") for i in range(20)))
+
+        self.assertEqual(len(set(ids)), 20)
+        stats = self.journal.stats()
+        self.assertEqual(stats["appended"], 20)
+        self.assertLess(stats["commits"], 20)
+        self.assertEqual(stats["queued_writes"], 0)
+
+    async def test_unfinished_jobs_are_replayed_after_a_restart(self) -> None:
+        done = await self.journal.append("radarr", '{"done": true}')
+        pending = await self.journal.append("sonarr", '{"done": false}')
+        discarded = await self.journal.append("sonarr", "{}")
+        await self.journal.finish(done, success=True)
+        await self.journal.discard(discarded)
+        await self.journal.close()
+
+        self.journal = await self.open_journal()
+
+        self.assertEqual(await self.journal.pending(), [(pending, "sonarr", '{"done": false}')])
+
+    async def test_job_is_not_replayed_after_max_attempts(self) -> None:
+        job_id = await self.journal.append("radarr", "{}")
+
+        await self.journal.finish(job_id, success=False)
+        self.assertEqual([id for id, *_ in await self.journal.pending()], [job_id])
+
+        await self.journal.finish(job_id, success=False)
+        self.assertEqual(await self.journal.pending(), [])
+
+    async def test_compaction_removes_only_finished_jobs(self) -> None:
+        await self.journal.close()
+        self.journal = await self.open_journal(retention=0.0, compact_interval=0.01)
+
+        finished = await self.journal.append("radarr", "{}")
+        failed = await self.journal.append("radarr", "{}")
+        pending = await self.journal.append("sonarr", "{}")
+        await self.journal.finish(finished, success=True)
+        for _ in range(2):
+            await self.journal.finish(failed, success=False)
+
+        for _ in range(100):
+            if self.journal.compacted == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(self.journal.compacted, 2)
+        self.assertEqual([id for id, *_ in await self.journal.pending()], [pending])
+
+    async def test_writes_fail_once_closed(self) -> None:
+        await self.journal.close()
+
+        with self.assertRaises(RuntimeError):
+            await self.journal.append("radarr", "{}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import logging
+import sys
+import unittest
+
+from src.unmonitorr.jsonlog import JsonFormatter
+
+
+class TestJsonFormatter(unittest.TestCase):
+    def make_record(self, **fields: object) -> logging.LogRecord:
+        record = logging.LogRecord(
+            "unmonitorr.server", logging.INFO, "/app/unmonitorr/server.py", 1, "Got %s", (1,), None
+        )
+        record.__dict__.update(fields)
+        return record
+
+    def test_fields_are_written_in_a_fixed_order(self) -> None:
+        record = self.make_record(trace_id="abc", series_id=874, duration=0.25)
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        self.assertEqual(
+            list(entry),
+            [
+                "timestamp",
+                "level",
+                "module",
+                "message",
+                "trace_id",
+                "instance_name",
+                "series_id",
+                "movie_id",
+                "duration",
+            ],
+        )
+        self.assertEqual(entry["message"], "Got 1")
+        self.assertEqual(entry["module"], "server")
+        self.assertEqual(entry["series_id"], 874)
+        self.assertIsNone(entry["movie_id"])
+        self.assertTrue(entry["timestamp"].endswith("Z"))
+
+    def test_exceptions_are_appended(self) -> None:
+        try:
+            raise ValueError("boom")  # noqa: TRY301
+        except ValueError:
+            record = self.make_record(trace_id="-")
+            record.exc_info = sys.exc_info()
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        self.assertIsNone(entry["trace_id"])
+        self.assertIn("ValueError: boom", entry["exception"])
+
+
+if __name__ == "__main__":
+    unittest.main()
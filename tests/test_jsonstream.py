@@ -0,0 +1,49 @@
+import json
+import unittest
+
+from src.unmonitorr.jsonstream import JsonArrayParser
+
+ELEMENTS = [
+    {"id": 1, "title": 'Say "Hello" \\ [Goodbye]', "seasons": [{"seasonNumber": 1}]},
+    {"id": 2, "title": "Amélie, {or} Not", "tags": []},
+    12345,
+    "plain",
+    None,
+]
+
+
+def parse_in_chunks(data: bytes, size: int) -> list:
+    parser = JsonArrayParser()
+    elements = []
+    for start in range(0, len(data), size):
+        elements += parser.feed(data[start : start + size])
+    return elements + parser.close()
+
+
+class TestJsonArrayParser(unittest.TestCase):
+    def test_elements_are_returned_once_complete(self) -> None:
+        parser = JsonArrayParser()
+        self.assertEqual(parser.feed(b'[{"id": 1}, {"id": 2'), [{"id": 1}])
+        self.assertEqual(parser.feed(b"}, 3"), [{"id": 2}])
+        self.assertEqual(parser.feed(b"4]"), [34])
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.close(), [])
+        self.assertEqual(parser.count, 3)
+
+    def test_any_chunking_matches_json_loads(self) -> None:
+        data = json.dumps(ELEMENTS, ensure_ascii=False, indent=2).encode()
+        for size in (1, 2, 3, 7, 64, len(data)):
+            with self.subTest(size=size):
+                self.assertEqual(parse_in_chunks(data, size), ELEMENTS)
+
+    def test_empty_array(self) -> None:
+        self.assertEqual(parse_in_chunks(b" [ ]\n", 1), [])
+
+    def test_invalid_arrays_raise(self) -> None:
+        for data in (b'{"id": 1}', b"[1 2]", b"[1,]", b"[1] 2", b"[1,", b""):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                parse_in_chunks(data, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
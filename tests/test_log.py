@@ -0,0 +1,90 @@
+import json
+import logging
+import queue
+import unittest
+
+from unmonitorr import log
+from unmonitorr.jsonlog import JsonFormatter
+from unmonitorr.log import DroppingQueueHandler
+
+
+class TestDroppingQueueHandler(unittest.TestCase):
+    def make_logger(self, size: int = 10, policy: str = "drop_new") -> logging.Logger:
+        self.queue: queue.Queue[logging.LogRecord] = queue.Queue(size)
+        self.handler = DroppingQueueHandler(self.queue, policy)
+        logger = logging.Logger("test")
+        logger.addHandler(self.handler)
+        return logger
+
+    def test_message_is_rendered_when_logged(self) -> None:
+        logger = self.make_logger()
+        series = {"monitored": True}
+
+        logger.info("Unmonitoring series: %s", series)
+        series["monitored"] = False
+
+        record = self.queue.get_nowait()
+        self.assertEqual(record.getMessage(), "Unmonitoring series: {'monitored': True}")
+        self.assertIsNone(record.args)
+
+    def test_traceback_is_rendered_when_logged(self) -> None:
+        logger = self.make_logger()
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed")
+
+        record = self.queue.get_nowait()
+        self.assertIsNone(record.exc_info)
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry["message"], "Failed")
+        self.assertIn("ValueError: boom", entry["exception"])
+
+    def test_full_queue_drops_new_records(self) -> None:
+        logger = self.make_logger(size=1)
+        logger.info("first")
+        logger.info("second")
+
+        self.assertEqual(self.handler.dropped, 1)
+        self.assertEqual(self.queue.get_nowait().getMessage(), "first")
+
+    def test_full_queue_drops_old_records(self) -> None:
+        logger = self.make_logger(size=1, policy="drop_old")
+        logger.info("first")
+        logger.info("second")
+
+        self.assertEqual(self.handler.dropped, 1)
+        self.assertEqual(self.queue.get_nowait().getMessage(), "second")
+
+    def test_unknown_policy_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self.make_logger(policy="drop_newest")
+
+
+class TestSampled(unittest.TestCase):
+    def setUp(self) -> None:
+        root = logging.getLogger()
+        self.addCleanup(root.setLevel, root.level)
+        root.setLevel(logging.DEBUG)
+
+    def test_value_is_rendered_when_called(self) -> None:
+        series = {"monitored": True}
+
+        with log.payload_sampling():
+            value = log.sampled(str, series)
+        series["monitored"] = False
+
+        self.assertEqual(value, "{'monitored': True}")
+
+    def test_nothing_is_rendered_without_debug_logging(self) -> None:
+        logging.getLogger().setLevel(logging.INFO)
+
+        def fail() -> str:
+            raise AssertionError("rendered")
+
+        with log.payload_sampling():
+            self.assertEqual(log.sampled(fail), log.NOT_SAMPLED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from src.unmonitorr.metrics import Registry, event_type_label
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = Registry()
+
+    def test_counter_renders_labelled_samples(self) -> None:
+        counter = self.registry.counter("test_total", "Test counter.", ("route",))
+        counter.inc("radarr")
+        counter.inc("radarr")
+        counter.inc('so"narr')
+
+        rendered = self.registry.render()
+
+        self.assertIn("# TYPE test_total counter", rendered)
+        self.assertIn('test_total{route="radarr"} 2', rendered)
+        self.assertIn('test_total{route="so\\"narr"} 1', rendered)
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        histogram = self.registry.histogram("test_seconds", "Test histogram.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value)
+
+        rendered = self.registry.render()
+
+        self.assertIn('test_seconds_bucket{le="0.1"} 1', rendered)
+        self.assertIn('test_seconds_bucket{le="1"} 3', rendered)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 4', rendered)
+        self.assertIn("test_seconds_count 4", rendered)
+        self.assertEqual(histogram.count(), 4)
+
+    def test_duplicate_names_are_rejected(self) -> None:
+        self.registry.gauge("test_depth", "Test gauge.")
+        with self.assertRaises(ValueError):
+            self.registry.gauge("test_depth", "Test gauge.")
+
+    def test_unknown_event_types_share_a_label(self) -> None:
+        self.assertEqual(event_type_label("Download"), "Download")
+        self.assertEqual(event_type_label("Download\n# TYPE fake counter"), "other")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from typing import Any
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from unmonitorr.arrs import RadarrClient, TTLCache
+
+MOVIE: dict[str, Any] = {
+    "id": 7,
+    "title": "Movie",
+    "sizeOnDisk": 1,
+    "status": "released",
+    "year": 2000,
+    "path": "/movies/movie",
+    "monitored": True,
+    "hasFile": True,
+}
+
+
+class FakeRadarr:
+    def __init__(self) -> None:
+        self.puts: list[dict[str, Any]] = []
+        # the status PUT requests are answered with
+        self.put_status = 200
+
+        self.app = web.Application()
+        self.app.router.add_route("*", "/api/v3/movie/{id}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if request.method == "PUT":
+            self.puts.append(await request.json())
+            return web.json_response({}, status=self.put_status)
+        return web.json_response(MOVIE)
+
+
+class TestBulkUnmonitorMovies(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.radarr = FakeRadarr()
+        self.server = TestServer(self.radarr.app)
+        await self.server.start_server()
+
+        uri = str(self.server.make_url("")).rstrip("/")
+        self.client = RadarrClient(uri, "key", cache=TTLCache(ttl=60.0))
+        self.client.editor_supported = False
+        await self.client.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.close()
+
+    async def test_failed_update_leaves_the_cached_movie_monitored(self) -> None:
+        self.radarr.put_status = 500
+        movie = await self.client.get_movie_by_id(7)
+
+        self.assertFalse(await self.client.bulk_unmonitor_movies([7]))
+
+        self.assertFalse(self.radarr.puts[0]["monitored"])
+        self.assertTrue(movie.monitored)
+        self.assertTrue((await self.client.get_movie_by_id(7)).monitored)
+
+    async def test_updated_copy_is_cached(self) -> None:
+        movie = await self.client.get_movie_by_id(7)
+
+        self.assertTrue(await self.client.bulk_unmonitor_movies([7]))
+
+        self.assertTrue(movie.monitored)
+        self.assertFalse((await self.client.get_movie_by_id(7)).monitored)
+
+
+if __name__ == "__main__":
+    unittest.main()
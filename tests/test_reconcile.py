@@ -0,0 +1,173 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from typing import Any
+
+from unmonitorr.config import Config
+from unmonitorr.reconcile import Reconciler
+from unmonitorr.types_ import SonarrHistoryRecord
+
+
+def make_record(id_: int, *, series_id: int = 1, monitored: bool = True) -> SonarrHistoryRecord:
+    return SonarrHistoryRecord.model_validate(
+        {
+            "id": id_,
+            "seriesId": series_id,
+            "episodeId": id_,
+            "eventType": "downloadFolderImported",
+            "date": "2024-01-01T00:00:00Z",
+            "series": {"id": series_id, "title": "Series", "path": "/tv/series", "year": 2000},
+            "episode": {
+                "id": id_,
+                "episodeNumber": id_,
+                "seasonNumber": 1,
+                "title": "Episode",
+                "seriesId": series_id,
+                "monitored": monitored,
+            },
+        }
+    )
+
+
+class FakeHistory:
+    """Serves records newest first, a page at a time."""
+
+    def __init__(self, ids: list[int]) -> None:
+        self.records = [make_record(id_) for id_ in sorted(ids, reverse=True)]
+        self.pages: list[int] = []
+
+    async def __call__(self, page: int, page_size: int) -> list[SonarrHistoryRecord]:
+        self.pages.append(page)
+        start = (page - 1) * page_size
+        return self.records[start : start + page_size]
+
+
+class TestReconciler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.config = Config()
+        self.results: dict[int, Any] = {}
+        self.handled: list[int] = []
+
+        async def handle(payload: Any) -> bool:
+            self.handled.append(payload.series.id)
+            result = self.results.get(payload.series.id, True)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        sonarr = SimpleNamespace(uri="http://sonarr", disabled=False)
+        self.reconciler = Reconciler(
+            self.config,
+            None,  # type: ignore[arg-type]
+            sonarr,  # type: ignore[arg-type]
+            handle,
+            path="",
+            page_size=3,
+            max_attempts=2,
+        )
+
+    def build(self, records: list[Any]) -> list[tuple[Any, list[int]]]:
+        # one payload per record, for the series with the record's ID
+        return [(SimpleNamespace(series=SimpleNamespace(id=r.id)), [r.id]) for r in records]
+
+    async def test_first_pass_only_reads_the_newest_record(self) -> None:
+        fetch = FakeHistory([1, 2, 3, 4])
+        records = await self.reconciler._new_records(fetch, None)
+        self.assertEqual([r.id for r in records], [4])
+        self.assertEqual(fetch.pages, [1])
+
+    async def test_records_are_paged_back_to_the_mark(self) -> None:
+        fetch = FakeHistory(list(range(1, 9)))
+        records = await self.reconciler._new_records(fetch, 2)
+        self.assertEqual([r.id for r in records], [8, 7, 6, 5, 4, 3])
+        self.assertEqual(fetch.pages, [1, 2, 3])
+
+        fetch = FakeHistory(list(range(1, 7)))
+        records = await self.reconciler._new_records(fetch, 0)
+        self.assertEqual(len(records), 6)
+        self.assertEqual(fetch.pages, [1, 2, 3])
+
+    async def test_mark_moves_to_the_newest_record(self) -> None:
+        records = [make_record(id_) for id_ in (7, 5, 6)]
+        attempts: dict[str, int] = {"5": 1}
+        mark = await self.reconciler._handle_records("sonarr", records, self.build, attempts)
+        self.assertEqual(mark, 7)
+        self.assertEqual(attempts, {})
+
+    async def test_mark_stops_short_of_failed_records(self) -> None:
+        records = [make_record(id_) for id_ in (7, 6, 5)]
+        self.results = {6: False, 7: ConnectionError()}
+        attempts: dict[str, int] = {}
+        mark = await self.reconciler._handle_records("sonarr", records, self.build, attempts)
+        self.assertEqual(mark, 5)
+        self.assertEqual(attempts, {"6": 1, "7": 1})
+        self.assertEqual(self.reconciler.failed["sonarr"], 2)
+
+    async def test_mark_moves_past_records_that_failed_too_often(self) -> None:
+        records = [make_record(id_) for id_ in (7, 6, 5)]
+        self.results = {6: False, 7: False}
+        attempts: dict[str, int] = {"6": 1}
+        mark = await self.reconciler._handle_records("sonarr", records, self.build, attempts)
+        self.assertEqual(mark, 6)
+        self.assertEqual(attempts, {"7": 1})
+
+        self.results = {7: False}
+        mark = await self.reconciler._handle_records("sonarr", records[:1], self.build, attempts)
+        self.assertEqual(mark, 7)
+        self.assertEqual(attempts, {})
+
+    async def test_attempts_are_saved_between_passes(self) -> None:
+        fetch = FakeHistory([1, 2, 3])
+        build = self.reconciler._series_payloads
+        self.reconciler.state = {"sonarr": {"mark": 1}}
+        self.results = {1: False}
+
+        await self.reconciler._reconcile("sonarr", fetch, build)
+        self.assertEqual(self.reconciler.state["sonarr"]["mark"], 1)
+        self.assertEqual(self.reconciler.state["sonarr"]["attempts"], {"2": 1})
+
+        await self.reconciler._reconcile("sonarr", fetch, build)
+        self.assertEqual(self.reconciler.state["sonarr"]["mark"], 3)
+        self.assertEqual(self.reconciler.state["sonarr"]["attempts"], {})
+
+    async def test_loop_continues_after_a_failed_pass(self) -> None:
+        self.reconciler.interval = 0.0
+        passes = 0
+        second_pass = asyncio.Event()
+
+        async def run_once() -> None:
+            nonlocal passes
+            passes += 1
+            if passes == 1:
+                raise OSError("disk full")
+            second_pass.set()
+            await asyncio.sleep(3600)
+
+        self.reconciler.run_once = run_once  # type: ignore[method-assign]
+        with self.assertLogs("unmonitorr.reconcile", "ERROR"):
+            task = asyncio.create_task(self.reconciler._run_loop())
+            await asyncio.wait_for(second_pass.wait(), timeout=1.0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        self.assertEqual(passes, 2)
+
+    def test_unmonitored_episodes_are_skipped(self) -> None:
+        records = [
+            make_record(3, series_id=1),
+            make_record(2, series_id=1, monitored=False),
+            make_record(1, series_id=2, monitored=False),
+        ]
+        payloads = self.reconciler._series_payloads(records)
+        self.assertEqual(len(payloads), 1)
+        payload, ids = payloads[0]
+        self.assertEqual([e.id for e in payload.episodes], [3])
+        self.assertEqual(ids, [3])
+
+        self.config.remove_media = True
+        payloads = self.reconciler._series_payloads(records)
+        self.assertEqual([ids for _, ids in payloads], [[3, 2], [1]])
+
+
+if __name__ == "__main__":
+    unittest.main()
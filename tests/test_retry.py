@@ -0,0 +1,31 @@
+import unittest
+
+from unmonitorr.arrs import RetryPolicy
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_only_failures_of_an_unwell_instance_are_retried(self) -> None:
+        self.assertTrue(RetryPolicy.should_retry(None))
+        self.assertTrue(RetryPolicy.should_retry(429))
+        self.assertTrue(RetryPolicy.should_retry(503))
+        self.assertFalse(RetryPolicy.should_retry(400))
+        self.assertFalse(RetryPolicy.should_retry(404))
+
+    def test_backoff_doubles_up_to_max_delay(self) -> None:
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+
+        for attempt, bound in ((1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (10, 5.0)):
+            for _ in range(50):
+                self.assertLessEqual(policy.backoff(attempt), bound)
+
+    def test_retry_after_is_honoured_up_to_max_delay(self) -> None:
+        policy = RetryPolicy(base_delay=0.01, max_delay=5.0)
+
+        self.assertEqual(policy.backoff(1, "3"), 3.0)
+        self.assertEqual(policy.backoff(1, "120"), 5.0)
+        # dates are not parsed, so the backoff is used instead
+        self.assertLessEqual(policy.backoff(1, "Wed, 21 Oct 2015 07:28:00 GMT"), 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from unmonitorr import deadline
+from unmonitorr.arrs import CircuitBreaker, CircuitOpenError
+from unmonitorr.config import Config
+from unmonitorr.metrics import ARR_REQUEST_ERRORS
+from unmonitorr.server import Configurator, WebhookHandler
+from unmonitorr.types_ import SonarrWebhookPayload
+
+from payloads import make_series_payload
+
+
+class TestParkedHandling(unittest.IsolatedAsyncioTestCase):
+    async def test_parked_payload_counts_its_imports_once(self) -> None:
+        config = Config()
+        config.series_index_max_age = 3600.0
+        config.arr_park_timeout = 5.0
+        handler = WebhookHandler(config)
+        handler.completeness.update(1, {1: 3}, ended=True)
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        calls = 0
+
+        async def handle_series(_: SonarrWebhookPayload) -> bool:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                breaker.record_failure()
+                raise CircuitOpenError("sonarr", breaker)
+            return True
+
+        handler.handle_series = handle_series
+
+        self.assertTrue(await handler.process(make_series_payload(1)))
+
+        self.assertEqual(calls, 2)
+        self.assertEqual(handler.completeness._entries[1].missing, {1: 2})
+
+
+class TestQueuedBatches(unittest.IsolatedAsyncioTestCase):
+    async def test_queue_workers_do_not_wait_for_batches(self) -> None:
+        config = Config()
+        config.sonarr_uri, config.sonarr_api_key = "http://sonarr", "key"
+        config.webhook_queue_enabled = True
+        config.webhook_queue_workers = 1
+        config.episode_batch_window = 0.05
+        config.webhook_deadline = 30.0
+        handler = WebhookHandler(config)
+
+        batches: list[tuple[int, float | None]] = []
+
+        async def handle_series_batch(payloads: list[SonarrWebhookPayload]) -> bool:
+            batches.append((len(payloads), deadline.remaining()))
+            return True
+
+        handler.handle_series_batch = handle_series_batch
+        assert handler.queue is not None
+        await handler.queue.start()
+        try:
+            for id in range(1, 6):
+                self.assertTrue(handler.queue.submit(make_series_payload(id)))
+            await asyncio.wait_for(handler.queue._queue.join(), timeout=0.04)
+            await asyncio.gather(*handler._dispatched)
+        finally:
+            await handler.queue.stop()
+
+        [(size, remaining)] = batches
+        self.assertEqual(size, 5)
+        self.assertIsNotNone(remaining)
+        self.assertGreater(remaining, 29.0)
+        self.assertEqual(handler.queue.stats()["processed"], 5)
+
+    async def test_payloads_for_an_unconfigured_arr_are_not_failures(self) -> None:
+        config = Config()
+        config.webhook_queue_enabled = True
+        handler = WebhookHandler(config)
+
+        assert handler.queue is not None
+        await handler.queue.start()
+        try:
+            self.assertTrue(handler.queue.submit(make_series_payload(1)))
+            await asyncio.wait_for(handler.queue._queue.join(), timeout=1.0)
+        finally:
+            await handler.queue.stop()
+
+        self.assertEqual(handler.queue.stats()["processed"], 1)
+        self.assertEqual(handler.queue.stats()["failed"], 0)
+
+
+class TestConnectionTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.requests = 0
+
+        async def handle(_: web.Request) -> web.Response:
+            self.requests += 1
+            return web.Response(status=503, text="Unavailable")
+
+        app = web.Application()
+        app.router.add_get("/api", handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        config = Config()
+        config.arr_retries = 3
+        config.arr_retry_base_delay = 0.01
+        config.arr_max_in_flight = 1
+        self.handler = WebhookHandler(config)
+        self.configurator = Configurator(config, self.handler)
+
+    async def asyncTearDown(self) -> None:
+        await self.handler.radarr_api.close()
+        await self.handler.sonarr_api.close()
+        await self.server.close()
+
+    async def test_arr_is_pinged_once_through_its_own_client(self) -> None:
+        # a request waiting for the limiter would time out with the only slot taken
+        assert self.handler.sonarr_api.limiter is not None
+        await self.handler.sonarr_api.limiter.acquire()
+        errors = ARR_REQUEST_ERRORS.value("sonarr", "GET", "503")
+
+        data = {
+            "uri": str(self.server.make_url("")).rstrip("/"),
+            "api_key": "key",
+            "client": "Sonarr",
+        }
+        request = SimpleNamespace(json=lambda: asyncio.sleep(0, data))
+        response = await asyncio.wait_for(
+            self.configurator.ping_arr_server(request),  # type: ignore[arg-type]
+            timeout=1.0,
+        )
+
+        self.assertEqual(response.status, 503)
+        self.assertEqual(self.requests, 1)
+        self.assertEqual(self.handler.sonarr_api.limiter.in_flight, 1)
+        self.assertEqual(ARR_REQUEST_ERRORS.value("sonarr", "GET", "503"), errors + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+import asyncio
+import copy
+import unittest
+from typing import Any
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from unmonitorr.arrs import SonarrClient, TTLCache
+from unmonitorr.config import Config
+from unmonitorr.server import WebhookHandler
+from unmonitorr.types_ import SonarrAPISeries, WebhookSeries
+
+from payloads import make_series_payload
+
+
+def make_season(number: int, *, episodes: int, downloaded: int, aired: int) -> dict[str, Any]:
+    return {
+        "seasonNumber": number,
+        "monitored": True,
+        "statistics": {
+            "episodeCount": aired,
+            "episodeFileCount": downloaded,
+            "totalEpisodeCount": episodes,
+            "sizeOnDisk": 1,
+            "percentOfEpisodes": 100 * downloaded / aired if aired else 0.0,
+        },
+    }
+
+
+SERIES: dict[str, Any] = {
+    "id": 5,
+    "title": "Series",
+    "status": "continuing",
+    "ended": False,
+    "year": 2000,
+    "path": "/tv/series",
+    "monitored": True,
+    "monitorNewItems": "all",
+    "seasons": [
+        make_season(1, episodes=10, downloaded=10, aired=10),
+        make_season(2, episodes=10, downloaded=9, aired=10),
+        make_season(3, episodes=8, downloaded=8, aired=8),
+        make_season(4, episodes=10, downloaded=3, aired=3),
+    ],
+    "statistics": {
+        "seasonCount": 4,
+        "episodeCount": 31,
+        "totalEpisodeCount": 38,
+        "sizeOnDisk": 4,
+        "percentOfEpisodes": 96.8,
+    },
+    "tags": [1],
+}
+
+
+class FakeSonarr:
+    def __init__(self) -> None:
+        self.series = copy.deepcopy(SERIES)
+        self.requests: list[tuple[str, str]] = []
+        self.puts: list[dict[str, Any]] = []
+        # the status PUT requests are answered with, and seconds GET requests take
+        self.put_status = 200
+        self.delay = 0.0
+
+        self.app = web.Application()
+        self.app.router.add_route("*", "/api/v3/series/{id}", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append((request.method, request.match_info["id"]))
+        if request.method == "PUT":
+            self.puts.append(await request.json())
+            return web.json_response({}, status=self.put_status)
+        series = copy.deepcopy(self.series)
+        await asyncio.sleep(self.delay)
+        return web.json_response(series)
+
+
+class TestSeason(unittest.TestCase):
+    def test_season_is_finished_once_every_episode_aired_and_downloaded(self) -> None:
+        series = SonarrAPISeries.model_validate(SERIES)
+        finished = [season.is_finished for season in series.seasons]
+        complete = [season.is_complete for season in series.seasons]
+
+        # the airing fourth season has every aired episode, but is not finished
+        self.assertEqual(complete, [True, False, True, True])
+        self.assertEqual(finished, [True, False, True, False])
+
+    def test_missing_count_is_counted_from_episode_files(self) -> None:
+        series = SonarrAPISeries.model_validate(SERIES)
+        missing = [season.statistics.missing_count for season in series.seasons]
+        self.assertEqual(missing, [0, 1, 0, 0])
+
+
+class SonarrTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.sonarr = FakeSonarr()
+        self.server = TestServer(self.sonarr.app)
+        await self.server.start_server()
+
+        uri = str(self.server.make_url("")).rstrip("/")
+        self.client = SonarrClient(uri, "key", cache=TTLCache(ttl=60.0))
+        await self.client.start()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.close()
+
+
+class TestSeriesLookup(SonarrTestCase):
+    async def test_changed_series_is_looked_up_again(self) -> None:
+        cached = await self.client.get_series_by_id(5)
+        self.assertIs(await self.client.get_series_by_id(5), cached)
+
+        self.sonarr.series["seasons"][1] = make_season(2, episodes=10, downloaded=10, aired=10)
+        self.client.mark_changed("series", 5)
+        changed = await self.client.get_series_by_id(5)
+
+        self.assertEqual(self.sonarr.requests, [("GET", "5"), ("GET", "5")])
+        self.assertTrue(changed.seasons[1].is_complete)
+        self.assertIs(await self.client.get_series_by_id(5), changed)
+
+    async def test_lookup_started_before_a_change_is_not_cached(self) -> None:
+        self.sonarr.delay = 0.05
+        stale = asyncio.create_task(self.client.get_series_by_id(5))
+        await asyncio.sleep(0.01)
+
+        self.sonarr.series["seasons"][1] = make_season(2, episodes=10, downloaded=10, aired=10)
+        self.client.mark_changed("series", 5)
+        await stale
+        changed = await self.client.get_series_by_id(5)
+
+        self.assertEqual(len(self.sonarr.requests), 2)
+        self.assertTrue(changed.seasons[1].is_complete)
+        self.assertIs(await self.client.get_series_by_id(5), changed)
+
+    async def test_lookup_does_not_join_a_request_started_before_a_change(self) -> None:
+        self.sonarr.delay = 0.05
+        stale = asyncio.create_task(self.client.get_series_by_id(5))
+        await asyncio.sleep(0.01)
+        self.client.mark_changed("series", 5)
+
+        await asyncio.gather(
+            stale, self.client.get_series_by_id(5), self.client.get_series_by_id(5)
+        )
+
+        self.assertEqual(len(self.sonarr.requests), 2)
+        self.assertEqual(self.client.singleflight.stats()["coalesced"], 1)
+
+    async def test_concurrent_handlers_share_one_lookup(self) -> None:
+        config = Config()
+        config.handle_episodes = False
+        handler = WebhookHandler(config)
+        handler.sonarr_api = self.client
+        self.sonarr.delay = 0.05
+
+        payloads = [make_series_payload(i, series_id=5, season_number=2) for i in (1, 2, 3)]
+        for _ in payloads:
+            self.client.mark_changed("series", 5)
+
+        await asyncio.gather(*(handler.handle_series(payload) for payload in payloads))
+
+        self.assertEqual(self.sonarr.requests, [("GET", "5")])
+        self.assertEqual(self.client.singleflight.stats()["coalesced"], 2)
+
+    async def test_series_are_verified_against_sonarr(self) -> None:
+        handler = WebhookHandler(Config())
+        handler.sonarr_api = self.client
+        await self.client.get_series_by_id(5)
+
+        self.sonarr.series["seasons"][1] = make_season(2, episodes=10, downloaded=10, aired=10)
+        self.client.mark_changed("series", 5)
+        webhook_series = WebhookSeries(id=5, title="Series", path="/tv/series", year=2000)
+        [(_, fetched)] = await handler.fetch_series(webhook_series)
+
+        self.assertEqual(self.sonarr.requests, [("GET", "5"), ("GET", "5")])
+        self.assertIsNotNone(fetched)
+        self.assertTrue(fetched.seasons[1].is_complete)
+
+
+class TestBulkUnmonitorSeries(SonarrTestCase):
+    async def test_failed_update_leaves_the_cached_series_monitored(self) -> None:
+        self.client.editor_supported = False
+        self.sonarr.put_status = 500
+        series = await self.client.get_series_by_id(5)
+
+        self.assertFalse(await self.client.bulk_unmonitor_series([series]))
+
+        self.assertFalse(self.sonarr.puts[0]["monitored"])
+        self.assertTrue(series.monitored)
+        self.assertTrue((await self.client.get_series_by_id(5)).monitored)
+
+    async def test_updated_copy_is_cached(self) -> None:
+        self.client.editor_supported = False
+        series = await self.client.get_series_by_id(5)
+
+        self.assertTrue(await self.client.bulk_unmonitor_series([series]))
+
+        self.assertTrue(series.monitored)
+        self.assertFalse((await self.client.get_series_by_id(5)).monitored)
+        self.assertEqual(self.sonarr.puts[0]["tags"], [1])
+
+    async def test_series_ids_are_unmonitored_without_filling_the_cache(self) -> None:
+        self.client.editor_supported = False
+
+        self.assertTrue(await self.client.bulk_unmonitor_series_ids([5]))
+
+        self.assertEqual(self.sonarr.requests, [("GET", "5"), ("PUT", "5")])
+        self.assertFalse(self.sonarr.puts[0]["monitored"])
+        self.assertEqual(self.sonarr.puts[0]["tags"], [1])
+        self.assertEqual(len(self.client.cache), 0)
+
+
+class TestSeasonHandling(SonarrTestCase):
+    async def test_finished_seasons_are_unmonitored_with_one_update(self) -> None:
+        handler = WebhookHandler(Config())
+        handler.sonarr_api = self.client
+        series = await self.client.get_series_by_id(5)
+
+        self.assertTrue(await handler.handle_seasons(series))
+
+        self.assertEqual(self.sonarr.requests, [("GET", "5"), ("PUT", "5")])
+        monitored = [season["monitored"] for season in self.sonarr.puts[0]["seasons"]]
+        self.assertEqual(monitored, [False, True, False, True])
+        self.assertTrue(self.sonarr.puts[0]["monitored"])
+        self.assertTrue(all(season.monitored for season in series.seasons))
+
+    async def test_series_without_finished_seasons_is_not_updated(self) -> None:
+        handler = WebhookHandler(Config())
+        handler.sonarr_api = self.client
+        self.sonarr.series["seasons"] = [make_season(1, episodes=10, downloaded=3, aired=3)]
+        series = await self.client.get_series_by_id(5)
+
+        self.assertTrue(await handler.handle_seasons(series))
+        self.assertEqual(self.sonarr.puts, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import unittest
+from collections.abc import AsyncIterator
+from typing import Any
+
+import aiohttp
+
+from unmonitorr.config import Config
+from unmonitorr.sweep import LibrarySweep
+from unmonitorr.types_ import RadarrAPIMovie, SonarrAPISeries
+
+
+def make_movie(id_: int, *, has_file: bool = True, monitored: bool = True) -> RadarrAPIMovie:
+    return RadarrAPIMovie.model_validate(
+        {
+            "id": id_,
+            "title": f"Movie {id_}",
+            "sizeOnDisk": 1,
+            "status": "released",
+            "year": 2000,
+            "path": f"/movies/{id_}",
+            "monitored": monitored,
+            "hasFile": has_file,
+        }
+    )
+
+
+def make_series(
+    id_: int, *, percent: float = 100.0, ended: bool = True, monitored: bool = True
+) -> SonarrAPISeries:
+    return SonarrAPISeries.model_validate(
+        {
+            "id": id_,
+            "title": f"Series {id_}",
+            "status": "ended" if ended else "continuing",
+            "ended": ended,
+            "seasons": [],
+            "year": 2000,
+            "path": f"/tv/{id_}",
+            "monitored": monitored,
+            "monitorNewItems": "all",
+            "statistics": {
+                "seasonCount": 1,
+                "episodeCount": 10,
+                "totalEpisodeCount": 10,
+                "sizeOnDisk": 1,
+                "percentOfEpisodes": percent,
+            },
+        }
+    )
+
+
+class FakeRadarr:
+    disabled = False
+
+    def __init__(self, movies: list[RadarrAPIMovie]) -> None:
+        self.movies = movies
+        self.batches: list[list[int]] = []
+        # the exception raised, or the result returned, for each batch in turn
+        self.outcomes: list[Any] = []
+
+    async def iter_all_movies(self) -> AsyncIterator[RadarrAPIMovie]:
+        for movie in self.movies:
+            yield movie
+
+    async def bulk_unmonitor_movies(self, ids: list[int]) -> bool:
+        self.batches.append(ids)
+        outcome = self.outcomes.pop(0) if self.outcomes else True
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    bulk_delete_movies = bulk_unmonitor_movies
+
+
+class FakeSonarr:
+    disabled = False
+
+    def __init__(self, series: list[SonarrAPISeries]) -> None:
+        self.series = series
+        self.unmonitored: list[list[int]] = []
+        self.deleted: list[list[int]] = []
+
+    async def iter_all_series(self) -> AsyncIterator[SonarrAPISeries]:
+        for series in self.series:
+            yield series
+
+    async def bulk_unmonitor_series_ids(self, ids: list[int]) -> bool:
+        self.unmonitored.append(ids)
+        return True
+
+    async def bulk_delete_series(self, ids: list[int], *, exclude: bool) -> bool:
+        self.deleted.append(ids)
+        return True
+
+
+class TestLibrarySweep(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.config = Config()
+        self.radarr = FakeRadarr(
+            [
+                make_movie(1),
+                make_movie(2, has_file=False),
+                make_movie(3, monitored=False),
+                *(make_movie(id_) for id_ in range(4, 9)),
+            ]
+        )
+        self.sonarr = FakeSonarr(
+            [
+                make_series(1),
+                make_series(2, percent=90.0),
+                make_series(3, ended=False),
+                make_series(4, monitored=False),
+            ]
+        )
+
+    def make_sweep(self, **kwargs: Any) -> LibrarySweep:
+        return LibrarySweep(self.config, self.radarr, self.sonarr, **kwargs)  # type: ignore[arg-type]
+
+    async def test_downloaded_monitored_movies_are_unmonitored_in_batches(self) -> None:
+        result = await self.make_sweep(batch_size=2).sweep_movies()
+
+        self.assertEqual(result.scanned, 8)
+        self.assertEqual(len(result.matched), 6)
+        self.assertEqual(sorted(map(len, self.radarr.batches)), [2, 2, 2])
+        self.assertEqual(sorted(sum(self.radarr.batches, [])), [1, 4, 5, 6, 7, 8])
+        self.assertEqual((result.handled, result.failed), (6, 0))
+
+    async def test_unmonitored_movies_match_when_removing(self) -> None:
+        self.config.remove_media = True
+        result = await self.make_sweep().sweep_movies()
+        self.assertEqual(result.action, "remove")
+        self.assertEqual(sorted(self.radarr.batches[0]), [1, 3, 4, 5, 6, 7, 8])
+
+    async def test_failed_batch_does_not_stop_the_others(self) -> None:
+        self.radarr.outcomes = [aiohttp.ClientConnectionError(), False, TimeoutError()]
+        result = await self.make_sweep(batch_size=1, concurrency=1).sweep_movies()
+
+        self.assertEqual(len(self.radarr.batches), 6)
+        self.assertEqual((result.handled, result.failed), (3, 3))
+
+    async def test_dry_run_changes_nothing(self) -> None:
+        result = await self.make_sweep(dry_run=True).sweep_movies()
+        self.assertEqual(len(result.matched), 6)
+        self.assertEqual(self.radarr.batches, [])
+        self.assertEqual(result.handled, 0)
+
+    async def test_complete_series_are_matched(self) -> None:
+        self.config.handle_series_ended_only = False
+        await self.make_sweep().sweep_series()
+        self.assertEqual(self.sonarr.unmonitored, [[1, 3]])
+
+        self.sonarr.unmonitored.clear()
+        self.config.handle_series_ended_only = True
+        await self.make_sweep().sweep_series()
+        self.assertEqual(self.sonarr.unmonitored, [[1]])
+
+    async def test_series_are_deleted_when_removing(self) -> None:
+        self.config.handle_series_ended_only = True
+        self.config.remove_media = True
+        await self.make_sweep().sweep_series()
+        self.assertEqual(self.sonarr.deleted, [[1, 4]])
+        self.assertEqual(self.sonarr.unmonitored, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
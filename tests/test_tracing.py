@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from src.unmonitorr.tracing import Tracer, current_trace_id, span
+
+
+class TestTracing(unittest.TestCase):
+    def test_spans_nest_under_the_current_trace(self) -> None:
+        tracer = Tracer(keep=5)
+        with tracer.trace("POST /sonarr"):
+            trace_id = current_trace_id()
+            with span("lookup"), span("sonarr GET", url="/api/v3/series/1"):
+                pass
+
+        self.assertIsNotNone(trace_id)
+        self.assertIsNone(current_trace_id())
+
+        (trace,) = tracer.slowest()
+        root, lookup, request = trace.spans
+        self.assertEqual(trace.trace_id, trace_id)
+        self.assertEqual(lookup.parent_id, root.span_id)
+        self.assertEqual(request.parent_id, lookup.span_id)
+        self.assertEqual(request.attributes, {"url": "/api/v3/series/1"})
+
+    def test_span_outside_a_trace_is_ignored(self) -> None:
+        with span("orphan") as orphan:
+            self.assertIsNone(orphan)
+
+    def test_only_the_slowest_traces_are_kept(self) -> None:
+        tracer = Tracer(keep=2)
+        for name in ("a", "b", "c"):
+            with tracer.trace(name):
+                pass
+
+        slowest = tracer.slowest()
+        self.assertEqual(len(slowest), 2)
+        self.assertGreaterEqual(slowest[0].duration, slowest[1].duration)
+        self.assertEqual(tracer.traced, 3)
+
+    def test_traces_are_exported_off_the_calling_thread(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "traces.json")
+            tracer = Tracer(keep=0, export_path=path)
+            for name in ("a", "b"):
+                with tracer.trace(name), span("lookup"):
+                    pass
+            threads = [thread.name for thread in threading.enumerate()]
+            self.assertTrue(any(name.startswith("trace-export") for name in threads))
+
+            tracer.close()
+
+            with open(path, encoding="utf-8") as fp:
+                events = json.loads(fp.read().rstrip(",\n") + "]")
+        self.assertEqual([event["name"] for event in events], ["a", "lookup", "b", "lookup"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,13 @@
 from typing import Any
+import json
 import unittest
+
+from pydantic import ValidationError
+
 from src.unmonitorr.types_ import (
     RadarrWebhookPayload,
     SonarrWebhookPayload,
+    WebhookPayloadAdapter,
 )
 
 
@@ -74,6 +79,40 @@ class TestTestPayloads(unittest.TestCase):
         self.assertEqual(sonarr_test_payload.series.id, 1)
         self.assertEqual(sonarr_test_payload.episodes[0].id, 123)
 
+    def test_payload_adapter_identifies_payload_type(self) -> None:
+        radarr_payload: dict[str, Any] = {
+            "movie": {"id": 1, "title": "Test Title", "year": 1970, "folderPath": "C:\\testpath"},
+            "eventType": "Download",
+            "instanceName": "Radarr",
+            "applicationUrl": "",
+        }
+        sonarr_payload: dict[str, Any] = {
+            "series": {"id": 1, "title": "Test Title", "path": "C:\\testpath", "year": 0},
+            "episodes": [
+                {
+                    "id": 123,
+                    "episodeNumber": 1,
+                    "seasonNumber": 1,
+                    "title": "Test title",
+                    "seriesId": 1,
+                }
+            ],
+            "eventType": "Download",
+            "instanceName": "Sonarr",
+            "applicationUrl": "",
+        }
+
+        radarr_model = WebhookPayloadAdapter.validate_json(json.dumps(radarr_payload))
+        sonarr_model = WebhookPayloadAdapter.validate_json(json.dumps(sonarr_payload))
+
+        self.assertIsInstance(radarr_model, RadarrWebhookPayload)
+        self.assertIsInstance(sonarr_model, SonarrWebhookPayload)
+        self.assertEqual(sonarr_model.episode_ids_to_unmonitor(), [123])
+
+    def test_payload_adapter_rejects_unknown_payload(self) -> None:
+        with self.assertRaises(ValidationError):
+            WebhookPayloadAdapter.validate_json(b'{"eventType": "Test"}')
+
 
 if __name__ == "__main__":
     unittest.main()